@@ -0,0 +1,71 @@
+"""Measures the memory used per beam, in bytes, as traced by :mod:`tracemalloc`.
+
+Scenarios:
+
+* ``new``: beams created from end points.
+* ``attributes``: the same with a category and a Rhino GUID, as created by the Grasshopper components.
+* ``loaded``: the latter after a binary round trip, the attributes are de-serialized from JSON.
+
+Usage::
+
+    python scripts/benchmarks/beam_memory.py --count 100000
+
+"""
+
+import argparse
+import gc
+import tracemalloc
+import uuid
+
+from compas.geometry import Point
+
+from compas_timber.elements import Beam
+from compas_timber.model import TimberModel
+
+CATEGORIES = ("stud", "plate", "header", "sill", "king")
+
+
+def create_beams(count, attributes=False):
+    beams = []
+    for index in range(count):
+        beam = Beam.from_endpoints(Point(index, 0, 0), Point(index, 2.5, 0), width=0.06, height=0.12)
+        if attributes:
+            beam.attributes["category"] = CATEGORIES[index % len(CATEGORIES)]
+            beam.attributes["rhino_guid"] = str(uuid.uuid4())
+        beams.append(beam)
+    return beams
+
+
+def model_bytes(count):
+    model = TimberModel()
+    for beam in create_beams(count, attributes=True):
+        model.add_beam(beam)
+    return model.to_bytes()
+
+
+def measure(create, count):
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = create()  # noqa: F841, kept alive until measured
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / float(count)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the memory used per beam.")
+    parser.add_argument("-n", "--count", type=int, default=20000, help="Number of beams. Defaults to 20000.")
+    args = parser.parse_args(argv)
+
+    print("new         {:8.0f} bytes/beam".format(measure(lambda: create_beams(args.count), args.count)))
+    print("attributes  {:8.0f} bytes/beam".format(measure(lambda: create_beams(args.count, True), args.count)))
+    data = model_bytes(args.count)
+    # the loaded model also holds the element tree and graph of compas_model
+    load = lambda: TimberModel.from_bytes(data)  # noqa: E731
+    print("loaded      {:8.0f} bytes/beam, with the model".format(measure(load, args.count)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compares the size and the time to save and load a timber model as JSON and in the binary format.
+
+The model consists of studs, each third of which is joined to a plate by a T-Butt joint.
+Times are the best of five runs, in seconds.
+
+Usage::
+
+    python scripts/benchmarks/model_formats.py --count 2000
+
+"""
+
+import argparse
+import timeit
+
+from compas.data import json_dumps
+from compas.data import json_loads
+from compas.geometry import Point
+
+from compas_timber.connections import TButtJoint
+from compas_timber.elements import Beam
+from compas_timber.model import TimberModel
+
+
+def create_model(count):
+    model = TimberModel()
+    studs = []
+    for index in range(count):
+        stud = Beam.from_endpoints(
+            Point(index * 0.7, 0, 0), Point(index * 0.7 + 0.3, 2.5, 0.1), width=0.06, height=0.12
+        )
+        stud.attributes["category"] = "stud"
+        model.add_beam(stud)
+        studs.append(stud)
+    for index in range(0, count, 3):
+        plate = Beam.from_endpoints(Point(index * 0.7, 1, 0), Point(index * 0.7 + 1.5, 1, 0), width=0.06, height=0.12)
+        model.add_beam(plate)
+        TButtJoint.create(model, studs[index], plate)
+    return model
+
+
+def best(function):
+    return min(timeit.repeat(function, number=1, repeat=5))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the JSON and binary model formats.")
+    parser.add_argument("-n", "--count", type=int, default=1500, help="Number of studs. Defaults to 1500.")
+    args = parser.parse_args(argv)
+
+    model = create_model(args.count)
+    text = json_dumps(model)
+    data = model.to_bytes()
+
+    print("        {:>12} {:>8} {:>8}".format("bytes", "save", "load"))
+    print(
+        "json    {:12d} {:8.3f} {:8.3f}".format(
+            len(text), best(lambda: json_dumps(model)), best(lambda: json_loads(text))
+        )
+    )
+    print(
+        "binary  {:12d} {:8.3f} {:8.3f}".format(
+            len(data), best(model.to_bytes), best(lambda: TimberModel.from_bytes(data))
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
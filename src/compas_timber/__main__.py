@@ -0,0 +1,41 @@
+"""Command line interface of compas_timber.
+
+Creates a timber model and its BTLx document from a centerline JSON and a rules JSON::
+
+    python -m compas_timber data/lines.json rules.json --output out --cache-dir .cache
+
+"""
+
+import argparse
+import os
+import sys
+
+from compas_timber.pipeline import Pipeline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="compas_timber", description="Create a timber model and BTLx from centerlines and joint rules."
+    )
+    parser.add_argument("centerlines", help="JSON file with a list of centerlines.")
+    parser.add_argument("rules", help="JSON file with the joint rules and settings.")
+    parser.add_argument("-o", "--output", default=".", help="Output directory. Defaults to the current directory.")
+    parser.add_argument("-n", "--name", help="Name of the output files. Defaults to the name of the centerlines file.")
+    parser.add_argument("--cache-dir", help="Directory in which to cache the results of each stage.")
+    args = parser.parse_args(argv)
+
+    name = args.name or os.path.splitext(os.path.basename(args.centerlines))[0]
+    if not os.path.isdir(args.output):
+        os.makedirs(args.output)
+
+    result = Pipeline(cache_dir=args.cache_dir).run(args.centerlines, args.rules)
+    result.write(os.path.join(args.output, name + ".json"), os.path.join(args.output, name + ".btlx"))
+
+    for message in result.conflicts + result.errors:
+        print(message, file=sys.stderr)
+    print("Computed stages: {}".format(", ".join(result.computed) or "none"))
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+from .batch import format_summary
+from .batch import output_names
+from .batch import process_model
+from .batch import run
+
+__all__ = [
+    "run",
+    "process_model",
+    "format_summary",
+    "output_names",
+]
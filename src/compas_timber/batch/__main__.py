@@ -0,0 +1,46 @@
+"""Command line interface of the batch driver.
+
+Creates the model JSON and BTLx of many centerline files in parallel::
+
+    python -m compas_timber.batch variants/*.json --rules rules.json --output out --workers 8
+
+"""
+
+import argparse
+import sys
+
+from compas_timber.batch import format_summary
+from compas_timber.batch import run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="compas_timber.batch", description="Create timber models and BTLx in parallel."
+    )
+    parser.add_argument("centerlines", nargs="+", help="JSON files with a list of centerlines.")
+    parser.add_argument("-r", "--rules", required=True, help="JSON file with the joint rules and settings.")
+    parser.add_argument("-o", "--output", default=".", help="Output directory. Defaults to the current directory.")
+    parser.add_argument("-w", "--workers", type=int, help="Number of worker processes. Defaults to the number of CPUs.")
+    parser.add_argument("--cache-dir", help="Directory in which to cache the results of each stage.")
+    args = parser.parse_args(argv)
+
+    def on_progress(summary, done, total):
+        print("[{}/{}] {}".format(done, total, format_summary(summary)))
+        sys.stdout.flush()
+
+    summaries = run(args.centerlines, args.rules, args.output, args.workers, args.cache_dir, on_progress)
+
+    failed = [summary for summary in summaries if summary["error"]]
+    joint_errors = sum(len(summary["joint_errors"]) for summary in summaries)
+    feature_errors = sum(len(summary["feature_errors"]) for summary in summaries)
+    seconds = sum(summary["seconds"] for summary in summaries)
+    print(
+        "{} model(s), {} failed, {} joint error(s), {} feature error(s), {:.2f}s total".format(
+            len(summaries), len(failed), joint_errors, feature_errors, seconds
+        )
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
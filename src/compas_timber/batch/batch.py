@@ -0,0 +1,168 @@
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+from compas_timber.pipeline import Pipeline
+
+
+def process_model(path, rules, output_dir, cache_dir=None, name=None):
+    """Creates the model JSON and BTLx of a single centerline file and writes them to `output_dir`.
+
+    This is the unit of work distributed by :func:`run`. Any exception is caught and reported in the summary.
+
+    Parameters
+    ----------
+    path : str
+        The path of the centerline JSON file.
+    rules : str | dict
+        The rules JSON, see :meth:`~compas_timber.pipeline.Pipeline.run`.
+    output_dir : str
+        The directory to which the outputs are written.
+    cache_dir : str, optional
+        A directory in which to cache the results of each stage of the pipeline.
+    name : str, optional
+        The name of the outputs, without extension. Defaults to the name of the centerline file.
+
+    Returns
+    -------
+    dict
+        The summary of the run with the keys "path", "model", "btlx", "seconds", "joint_errors", "feature_errors"
+        and "error".
+
+    """
+    start = time.time()
+    name = name or os.path.splitext(os.path.basename(path))[0]
+    summary = {
+        "path": path,
+        "model": os.path.join(output_dir, name + ".json"),
+        "btlx": os.path.join(output_dir, name + ".btlx"),
+        "seconds": 0.0,
+        "joint_errors": [],
+        "feature_errors": [],
+        "error": None,
+    }
+    written = []
+    try:
+        result = Pipeline(cache_dir=cache_dir).run(path, rules)
+        summary["joint_errors"] = result.errors
+        summary["feature_errors"] = result.feature_errors
+        result.write(model_path=summary["model"])
+        written.append(summary["model"])
+        result.write(btlx_path=summary["btlx"])
+    except Exception as ex:
+        for output in written:
+            os.remove(output)  # do not leave the outputs of a failed model behind
+        summary["model"] = summary["btlx"] = None
+        summary["error"] = "{}: {}".format(type(ex).__name__, ex)
+    summary["seconds"] = time.time() - start
+    return summary
+
+
+def output_names(paths):
+    """Returns the names of the outputs of the given centerline files, which are unique in one output directory.
+
+    The name of each output is the name of its centerline file, followed by a running number for files which
+    share their name, e.g. "walls_1" and "walls_2" for "a/walls.json" and "b/walls.json".
+
+    Parameters
+    ----------
+    paths : list(str)
+        The paths of the centerline JSON files.
+
+    Returns
+    -------
+    list(str)
+        The names of the outputs, without extension, in the order of `paths`.
+
+    """
+    names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    counts = Counter(names)
+    seen = Counter()
+    unique = []
+    for name in names:
+        if counts[name] > 1:
+            seen[name] += 1
+            name = "{}_{}".format(name, seen[name])
+        unique.append(name)
+    return unique
+
+
+def run(paths, rules, output_dir, workers=None, cache_dir=None, on_progress=None):
+    """Creates the model JSON and BTLx of many centerline files, distributing whole models across a process pool.
+
+    Each output is written to a temporary file which then replaces the output, so that no output is ever
+    partially written, and the outputs of a failing model are removed. The outputs are named by :func:`output_names`.
+    Errors do not stop the batch, they are reported in the summary of the respective model.
+
+    Parameters
+    ----------
+    paths : list(str)
+        The paths of the centerline JSON files.
+    rules : str | dict
+        The rules JSON shared by all models, see :meth:`~compas_timber.pipeline.Pipeline.run`.
+    output_dir : str
+        The directory to which the outputs are written.
+    workers : int, optional
+        The number of worker processes. Defaults to the number of CPUs. With 1, the models are processed in this process.
+    cache_dir : str, optional
+        A directory in which to cache the results of each stage of the pipeline, shared by all workers.
+    on_progress : callable, optional
+        Called with the summary of each model (see :func:`process_model`), the number of finished models and the
+        total number of models, as soon as the model is finished.
+
+    Returns
+    -------
+    list(dict)
+        The summaries of the models, in the order of `paths`.
+
+    """
+    if not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+    workers = workers or os.cpu_count() or 1
+    names = output_names(paths)
+    summaries = {}
+
+    def report(index, summary):
+        summaries[index] = summary
+        if on_progress:
+            on_progress(summary, len(summaries), len(paths))
+
+    if workers == 1:
+        for index, path in enumerate(paths):
+            report(index, process_model(path, rules, output_dir, cache_dir, names[index]))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(process_model, path, rules, output_dir, cache_dir, names[index]): index
+                for index, path in enumerate(paths)
+            }
+            for future in as_completed(futures):
+                report(futures[future], future.result())
+
+    return [summaries[index] for index in range(len(paths))]
+
+
+def format_summary(summary):
+    """Returns a single line describing the given model summary.
+
+    Parameters
+    ----------
+    summary : dict
+        The summary of a model, see :func:`process_model`.
+
+    Returns
+    -------
+    str
+
+    """
+    if summary["error"]:
+        status = "FAILED ({})".format(summary["error"])
+    elif summary["joint_errors"] or summary["feature_errors"]:
+        status = "done with {} joint error(s) and {} feature error(s)".format(
+            len(summary["joint_errors"]), len(summary["feature_errors"])
+        )
+    else:
+        status = "done"
+    return "{} {} in {:.2f}s".format(summary["path"], status, summary["seconds"])
@@ -8,6 +8,7 @@ from .l_miter import LMiterJoint
 from .lap_joint import LapJoint
 from .null_joint import NullJoint
 from .solver import ConnectionSolver
+from .solver import JointNode
 from .solver import JointTopology
 from .solver import find_neighboring_beams
 from .t_butt import TButtJoint
@@ -29,6 +30,7 @@ __all__ = [
     "NullJoint",
     "FrenchRidgeLapJoint",
     "JointTopology",
+    "JointNode",
     "ConnectionSolver",
     "find_neighboring_beams",
 ]
@@ -14,6 +14,8 @@ from compas.geometry import intersection_plane_plane
 from compas.geometry import intersection_plane_plane_plane
 from compas.geometry import subtract_vectors
 
+from compas_timber.elements import LapFeature
+
 from .joint import Joint
 
 
@@ -87,20 +89,13 @@ class ButtJoint(Joint):
     def side_surfaces_cross(self):
         assert self.main_beam and self.cross_beam
 
-        face_dict = Joint._beam_side_incidence(self.main_beam, self.cross_beam, ignore_ends=True)
-        face_indices = face_dict.keys()
-        angles = face_dict.values()
-        angles, face_indices = zip(*sorted(zip(angles, face_indices)))
-
+        _, face_indices = self.side_incidence(self.main_beam, self.cross_beam, ignore_ends=True)
         return self.cross_beam.faces[(face_indices[0] + 1) % 4], self.cross_beam.faces[(face_indices[0] + 3) % 4]
 
     def front_back_surface_main(self):
         assert self.main_beam and self.cross_beam
 
-        face_dict = Joint._beam_side_incidence(self.cross_beam, self.main_beam, ignore_ends=True)
-        face_indices = face_dict.keys()
-        angles = face_dict.values()
-        angles, face_indices = zip(*sorted(zip(angles, face_indices)))
+        _, face_indices = self.side_incidence(self.cross_beam, self.main_beam, ignore_ends=True)
         return self.main_beam.faces[face_indices[0]], self.main_beam.faces[face_indices[3]]
 
     def back_surface_main(self):
@@ -111,7 +106,7 @@ class ButtJoint(Joint):
     def get_main_cutting_plane(self):
         # TODO: this should be split into two functions. It's hard to read on the calling side.
         assert self.main_beam and self.cross_beam
-        self.reference_side_index_cross, cfr = self.get_face_most_ortho_to_beam(
+        self.reference_side_index_cross, cfr = self.face_most_ortho_to_beam(
             self.main_beam, self.cross_beam, ignore_ends=True
         )
 
@@ -192,6 +187,30 @@ class ButtJoint(Joint):
 
         return ph
 
+    def lap_machining_limits(self):
+        """Returns the machining limits of the lap milled into the cross beam.
+
+        Returns
+        -------
+        dict
+
+        """
+        return {"FaceLimitedFront": "no", "FaceLimitedBack": "no"}
+
+    def create_lap_feature(self):
+        """Returns the lap feature which mills the cross beam to accomodate the main beam.
+
+        Returns
+        -------
+        :class:`~compas_timber.elements.LapFeature`
+
+        """
+        volume = self.subtraction_volume()
+        _, ref_face = self.get_main_cutting_plane()
+        btlx_params = dict(self.btlx_params_cross)
+        btlx_params["machining_limits"] = self.lap_machining_limits()
+        return LapFeature(volume, ref_face, btlx_params, is_joinery=True)
+
     def calc_params_birdsmouth(self):
         """
         Calculate the parameters for a birdsmouth joint.
@@ -212,8 +231,7 @@ class ButtJoint(Joint):
             dict: A dictionary containing the calculated parameters for the birdsmouth joint
 
         """
-        face_dict = self._beam_side_incidence(self.main_beam, self.cross_beam, ignore_ends=True)
-        face_keys = sorted([key for key in face_dict.keys()], key=face_dict.get)
+        _, face_keys = self.side_incidence(self.main_beam, self.cross_beam, ignore_ends=True)
 
         frame1 = self.get_main_cutting_plane()[0]  # offset pocket mill plane
         frame2 = self.cross_beam.faces[face_keys[1]]
@@ -63,13 +63,13 @@ class FrenchRidgeLapJoint(Joint):
 
     @property
     def cutting_plane_top(self):
-        _, cfr = self.get_face_most_towards_beam(self.beam_a, self.beam_b, ignore_ends=True)
+        _, cfr = self.face_most_towards_beam(self.beam_a, self.beam_b, ignore_ends=True)
         cfr = Frame(cfr.point, cfr.xaxis, cfr.yaxis * -1.0)  # flip normal
         return cfr
 
     @property
     def cutting_plane_bottom(self):
-        _, cfr = self.get_face_most_towards_beam(self.beam_b, self.beam_b, ignore_ends=True)
+        _, cfr = self.face_most_towards_beam(self.beam_b, self.beam_b, ignore_ends=True)
         return cfr
 
     def restore_beams_from_keys(self, assemly):
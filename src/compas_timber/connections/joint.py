@@ -1,3 +1,5 @@
+from copy import copy
+
 from compas.geometry import Point
 from compas.geometry import angle_vectors
 from compas.geometry import distance_point_line
@@ -61,6 +63,10 @@ class Joint(Interaction):
 
     def __init__(self, **kwargs):
         super(Joint, self).__init__(name=self.__class__.__name__)
+        self.features = []
+        self._incidence_cache = {}
+        self._ends = None
+        self._ends_key = None
 
     @property
     def beams(self):
@@ -77,6 +83,71 @@ class Joint(Interaction):
         """
         raise NotImplementedError
 
+    def remove_features(self):
+        """Removes the features and blank extensions which were added to the beams by this joint.
+
+        Deferred features (see :meth:`Joint.defer_features`) are discarded.
+
+        """
+        for beam in self.beams:
+            if self in beam._pending_joints:
+                beam._pending_joints.remove(self)
+            if self.guid in beam._blank_extensions:
+                beam.remove_blank_extension(self.guid)
+            if self.features:
+                beam.remove_features(self.features)
+        self.features = []
+
+    def defer_features(self):
+        """Defers adding the features of this joint until they are first needed.
+
+        The joint registers itself with its beams, the features are added when the features, geometry or blank
+        of either beam is first accessed. Features of deferred joints are added in the order the joints were deferred.
+
+        """
+        for beam in self.beams:
+            beam._own("_pending_joints")
+            beam._pending_joints.append(self)
+
+    def add_deferred_features(self):
+        """Adds the features of this joint if they have been deferred using :meth:`Joint.defer_features`.
+
+        Joints deferred earlier on either beam are handled first, as are, in turn, the joints deferred earlier on
+        their beams. Other deferred joints are left deferred.
+        Any :class:`~compas_timber.connections.BeamJoinningError` is added to the `debug_info` of the beams.
+
+        """
+        # iterative rather than recursive, a chain of joints may be longer than the recursion limit
+        stack = [self]
+        while stack:
+            joint = stack[-1]
+            earlier = None
+            for beam in joint.beams:
+                if joint in beam._pending_joints and beam._pending_joints[0] is not joint:
+                    earlier = beam._pending_joints[0]
+                    break
+            if earlier is not None:
+                stack.append(earlier)
+                continue
+            stack.pop()
+            if any(joint in beam._pending_joints for beam in joint.beams):
+                joint._add_pending_features()
+
+    def _add_pending_features(self):
+        """Adds the deferred features of this joint, which must be the first pending joint of its beams."""
+        for beam in self.beams:
+            if self in beam._pending_joints:
+                beam._pending_joints.remove(self)
+            beam._adding_joint_features = True
+        try:
+            self.add_features()
+        except BeamJoinningError as bje:
+            for beam in self.beams:
+                beam.debug_info.append(bje)
+        finally:
+            for beam in self.beams:
+                beam._adding_joint_features = False
+
     def restore_beams_from_keys(self, model):
         """Restores the reference to the beams associate with this joint.
 
@@ -95,6 +166,33 @@ class Joint(Interaction):
         """
         raise NotImplementedError
 
+    def _clone(self, model):
+        """Returns a copy of this joint bound to the beams of `model` with the same GUIDs.
+
+        See :meth:`~compas_timber.model.TimberModel.clone`. The copy has the same GUID, lists and dictionaries such
+        as the features of the joint are copied, everything else is shared.
+
+        """
+        joint = self.__class__.__new__(self.__class__)
+        for key, value in self.__dict__.items():
+            joint.__dict__[key] = copy(value) if isinstance(value, (list, dict)) else value
+        joint._ends = None  # keyed by the identity of the beams
+        joint.restore_beams_from_keys(model)
+        return joint
+
+    @staticmethod
+    def check_beams(beams):
+        """Raises a `ValueError` if `beams` contains less than two `Beam` objects.
+
+        Parameters
+        ----------
+        beams : list(:class:`~compas_timber.parts.Beam`)
+            The beams to be joined.
+
+        """
+        if len(beams) < 2:
+            raise ValueError("Expected at least 2 beams. Got instead: {}".format(len(beams)))
+
     @classmethod
     def create(cls, model, *beams, **kwargs):
         """Creates an instance of this joint and creates the new connection in `model`.
@@ -106,6 +204,8 @@ class Joint(Interaction):
 
         A `ValueError` is raised if `beams` contains less than two `Beam` objects.
 
+        If `model.lazy_features` is set, adding the features of the joint is deferred (see :meth:`Joint.defer_features`).
+
         Parameters
         ----------
         model : :class:`~compas_timber.model.TimberModel`
@@ -120,28 +220,65 @@ class Joint(Interaction):
 
         """
 
-        if len(beams) < 2:
-            raise ValueError("Expected at least 2 beams. Got instead: {}".format(len(beams)))
+        cls.check_beams(beams)
         joint = cls(*beams, **kwargs)
         model.add_joint(joint, beams)
-        joint.add_features()
+        if model.lazy_features:
+            joint.defer_features()
+        else:
+            joint.add_features()
         return joint
 
     @property
     def ends(self):
-        """Returns a map of which end of each beam is joined by this joint."""
+        """Returns a map of which end of each beam is joined by this joint.
 
-        self._ends = {}
-        for index, beam in enumerate(self.beams):
-            if distance_point_line(beam.centerline.start, self.beams[index - 1].centerline) < distance_point_line(
-                beam.centerline.end, self.beams[index - 1].centerline
-            ):
-                self._ends[str(beam.guid)] = "start"
-            else:
-                self._ends[str(beam.guid)] = "end"
+        The map is re-calculated only once the frame or the dimensions of any of the beams have changed,
+        see :attr:`Joint.ends_resolved`.
 
+        """
+        if not self.ends_resolved:
+            self.resolve_ends()
         return self._ends
 
+    @property
+    def ends_resolved(self):
+        """True if :attr:`Joint.ends` has been calculated for the current frames and dimensions of the beams."""
+        return self._ends is not None and self._ends_key == self._beams_key()
+
+    def _beams_key(self):
+        return tuple((id(beam), Joint._geometry_key(beam)) for beam in self.beams)
+
+    def resolve_ends(self, centerlines=None):
+        """Calculates which end of each beam is joined by this joint.
+
+        The result is cached and returned by :attr:`Joint.ends`.
+
+        Parameters
+        ----------
+        centerlines : list(:class:`~compas.geometry.Line`), optional
+            The centerlines of the beams of this joint, in the order of `beams`.
+            Can be passed in to avoid re-calculating them, e.g. when resolving many joints at once.
+
+        Returns
+        -------
+        dict(str, str)
+            A map of beam guids to either "start" or "end".
+
+        """
+        centerlines = centerlines or [beam.centerline for beam in self.beams]
+        ends = {}
+        for index, beam in enumerate(self.beams):
+            centerline = centerlines[index]
+            other = centerlines[index - 1]
+            if distance_point_line(centerline.start, other) < distance_point_line(centerline.end, other):
+                ends[str(beam.guid)] = "start"
+            else:
+                ends[str(beam.guid)] = "end"
+        self._ends = ends
+        self._ends_key = self._beams_key()
+        return ends
+
     @staticmethod
     def get_face_most_towards_beam(beam_a, beam_b, ignore_ends=True):
         """Of all the faces of `beam_b`, returns the one whose normal most faces `beam_a`.
@@ -168,6 +305,28 @@ class Joint(Interaction):
         face_index = max(face_dict, key=face_dict.get)  # type: ignore
         return face_index, beam_b.faces[face_index]
 
+    def face_most_towards_beam(self, beam_a, beam_b, ignore_ends=True):
+        """Like :meth:`Joint.get_face_most_towards_beam`, using the face angles cached by :meth:`Joint.side_incidence`.
+
+        Parameters
+        ----------
+        beam_a : :class:`~compas_timber.parts.Beam`
+            The beam that attaches with one of its ends to `beam_b`.
+        beam_b : :class:`~compas_timber.parts.Beam`
+            The other beam.
+        ignore_ends : bool, optional
+            If True, the faces at each end of `beam_b` are ignored.
+
+        Returns
+        -------
+        tuple(face_index, :class:`~compas.geometry.Frame`)
+            Tuple containing the index of the chosen face and a frame at the center of if.
+
+        """
+        face_dict, _ = self.side_incidence(beam_a, beam_b, ignore_ends)
+        face_index = max(face_dict, key=face_dict.get)  # type: ignore
+        return face_index, beam_b.faces[face_index]
+
     @staticmethod
     def get_face_most_ortho_to_beam(beam_a, beam_b, ignore_ends=True):
         """Of all the faces of `beam_b`, returns the one whose normal is most orthogonal to `beam_a`.
@@ -194,6 +353,67 @@ class Joint(Interaction):
         face_index = min(face_dict, key=face_dict.get)  # type: ignore
         return face_index, beam_b.faces[face_index]
 
+    def face_most_ortho_to_beam(self, beam_a, beam_b, ignore_ends=True):
+        """Like :meth:`Joint.get_face_most_ortho_to_beam`, using the face angles cached by :meth:`Joint.side_incidence`.
+
+        Parameters
+        ----------
+        beam_a : :class:`~compas_timber.parts.Beam`
+            The beam that attaches with one of its ends to `beam_b`.
+        beam_b : :class:`~compas_timber.parts.Beam`
+            The other beam.
+        ignore_ends : bool, optional
+            If True, the faces at each end of `beam_b` are ignored.
+
+        Returns
+        -------
+        tuple(face_index, :class:`~compas.geometry.Frame`)
+            Tuple containing the index of the chosen face and a frame at the center of if.
+
+        """
+        face_dict, _ = self.side_incidence(beam_a, beam_b, ignore_ends)
+        face_index = min(face_dict, key=face_dict.get)  # type: ignore
+        return face_index, beam_b.faces[face_index]
+
+    def side_incidence(self, beam_a, beam_b, ignore_ends=True):
+        """Returns the angles of the faces of beam_b with beam_a's centerline, as well as the faces sorted by them.
+
+        The result is cached by this joint for each pair of beams (in both directions) and re-calculated only once
+        the frame or the dimensions of either beam have changed, including changes made in place to the frame.
+        See :meth:`Joint._beam_side_incidence`.
+
+        Parameters
+        ----------
+        beam_a : :class:`~compas_timber.parts.Beam`
+            The beam that attaches with one of its ends to the side of beam_b.
+        beam_b : :class:`~compas_timber.parts.Beam`
+            The other beam.
+        ignore_ends : bool, optional
+            If True, only the first four faces of `beam_b` are considered. Otherwise all faces are considered.
+
+        Returns
+        -------
+        tuple(dict(int, float), list(int))
+            A map of face indices of beam_b and their respective angle with beam_a's centerline,
+            and the face indices sorted by ascending angle.
+
+        """
+        key = (str(beam_a.guid), str(beam_b.guid), ignore_ends)
+        versions = (Joint._geometry_key(beam_a), Joint._geometry_key(beam_b))
+        cached = self._incidence_cache.get(key)
+        if cached is None or cached[0] != versions:
+            face_angles = Joint._beam_side_incidence(beam_a, beam_b, ignore_ends)
+            cached = versions, face_angles, sorted(face_angles, key=face_angles.get)
+            self._incidence_cache[key] = cached
+        _, face_angles, sorted_indices = cached
+        return face_angles, sorted_indices
+
+    @staticmethod
+    def _geometry_key(beam):
+        # the values rather than the geometry_version, which misses changes made in place to the frame
+        frame = beam.frame
+        return tuple(frame.point) + tuple(frame.xaxis) + tuple(frame.yaxis) + (beam.length, beam.width, beam.height)
+
     @staticmethod
     def _beam_side_incidence(beam_a, beam_b, ignore_ends=True):
         """Returns a map of face indices of beam_b and the angle of their normal with beam_a's centerline.
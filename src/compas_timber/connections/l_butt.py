@@ -1,5 +1,4 @@
 from compas_timber.elements import CutFeature
-from compas_timber.elements import MillVolume
 
 from .butt_joint import ButtJoint
 from .joint import BeamJoinningError
@@ -71,19 +70,33 @@ class LButtJoint(ButtJoint):
 
     def get_cross_cutting_plane(self):
         assert self.main_beam and self.cross_beam
-        _, cfr = self.get_face_most_towards_beam(self.cross_beam, self.main_beam, ignore_ends=True)
+        _, cfr = self.face_most_towards_beam(self.cross_beam, self.main_beam, ignore_ends=True)
         return cfr
 
     def get_main_cutting_plane(self):
         assert self.main_beam and self.cross_beam
 
-        index, _ = self.get_face_most_towards_beam(self.main_beam, self.cross_beam, ignore_ends=False)
+        index, _ = self.face_most_towards_beam(self.main_beam, self.cross_beam, ignore_ends=False)
         if self.reject_i and index in [4, 5]:
             raise BeamJoinningError(
                 beams=self.beams, joint=self, debug_info="Beams are in I topology and reject_i flag is True"
             )
         return super(LButtJoint, self).get_main_cutting_plane()
 
+    def lap_machining_limits(self):
+        """Returns the machining limits of the lap milled into the cross beam.
+
+        The lap is open towards the end of the cross beam which is joined.
+
+        Returns
+        -------
+        dict
+
+        """
+        if self.ends[str(self.cross_beam.guid)] == "start":
+            return {"FaceLimitedStart": "no", "FaceLimitedFront": "no", "FaceLimitedBack": "no"}
+        return {"FaceLimitedEnd": "no", "FaceLimitedFront": "no", "FaceLimitedBack": "no"}
+
     def add_features(self):
         """Adds the required extension and trimming features to both beams.
 
@@ -92,7 +105,9 @@ class LButtJoint(ButtJoint):
         """
         assert self.main_beam and self.cross_beam  # should never happen
         if self.features:
-            self.main_beam.remove_features(self.features)
+            for beam in self.beams:
+                beam.remove_features(self.features)
+            self.features = []
         start_main, start_cross = None, None
 
         try:
@@ -115,13 +130,15 @@ class LButtJoint(ButtJoint):
             self.cross_beam.add_blank_extension(
                 start_cross + extension_tolerance, end_cross + extension_tolerance, self.guid
             )
-            f_cross = CutFeature(cross_cutting_plane)
+            f_cross = CutFeature(cross_cutting_plane, is_joinery=True)
             self.cross_beam.add_features(f_cross)
             self.features.append(f_cross)
 
         self.main_beam.add_blank_extension(start_main + extension_tolerance, end_main + extension_tolerance, self.guid)
-        f_main = CutFeature(main_cutting_plane)
+        f_main = CutFeature(main_cutting_plane, is_joinery=True)
         if self.mill_depth:
-            self.cross_beam.add_features(MillVolume(self.subtraction_volume()))
+            lap_feature = self.create_lap_feature()
+            self.cross_beam.add_features(lap_feature)
+            self.features.append(lap_feature)
         self.main_beam.add_features(f_main)
         self.features.append(f_main)
@@ -70,17 +70,17 @@ class LHalfLapJoint(LapJoint):
             start_cross + extension_tolerance, end_cross + extension_tolerance, self.guid
         )
 
-        main_volume = MillVolume(negative_brep_main_beam)
-        cross_volume = MillVolume(negative_brep_cross_beam)
+        main_volume = MillVolume(negative_brep_main_beam, is_joinery=True)
+        cross_volume = MillVolume(negative_brep_cross_beam, is_joinery=True)
 
         self.main_beam.add_features(main_volume)
         self.cross_beam.add_features(cross_volume)
 
-        f_cross = CutFeature(cross_cutting_frame)
+        f_cross = CutFeature(cross_cutting_frame, is_joinery=True)
         self.cross_beam.add_features(f_cross)
 
         trim_frame = Frame(main_cutting_frame.point, main_cutting_frame.xaxis, -main_cutting_frame.yaxis)
-        f_main = CutFeature(trim_frame)
+        f_main = CutFeature(trim_frame, is_joinery=True)
         self.main_beam.add_features(f_main)
 
         self.features = [main_volume, cross_volume, f_main, f_cross]
@@ -41,13 +41,20 @@ class LMiterJoint(Joint):
     @property
     def __data__(self):
         data = super(LMiterJoint, self).__data__
-        data["beam_a"] = self.beam_a_guid
-        data["beam_b"] = self.beam_b_guid
+        data["beam_a_guid"] = self.beam_a_guid
+        data["beam_b_guid"] = self.beam_b_guid
         data["cutoff"] = self.cutoff
         return data
 
-    def __init__(self, beam_a=None, beam_b=None, cutoff=None):
-        super(LMiterJoint, self).__init__()
+    @classmethod
+    def __from_data__(cls, value):
+        instance = cls(**value)
+        instance.beam_a_guid = value["beam_a_guid"]
+        instance.beam_b_guid = value["beam_b_guid"]
+        return instance
+
+    def __init__(self, beam_a=None, beam_b=None, cutoff=None, **kwargs):
+        super(LMiterJoint, self).__init__(**kwargs)
         self.beam_a = beam_a
         self.beam_b = beam_b
         self.beam_a_guid = str(beam_a.guid) if beam_a else None
@@ -124,12 +131,12 @@ class LMiterJoint(Joint):
 
         self.beam_a.add_blank_extension(start_a, end_a, self.guid)
         self.beam_b.add_blank_extension(start_b, end_b, self.guid)
-        f1, f2 = CutFeature(plane_a), CutFeature(plane_b)
+        f1, f2 = CutFeature(plane_a, is_joinery=True), CutFeature(plane_b, is_joinery=True)
         self.beam_a.add_features(f1)
         self.beam_b.add_features(f2)
         self.features = [f1, f2]
 
     def restore_beams_from_keys(self, model):
         """After de-serialization, restores references to the main and cross beams saved in the model."""
-        self.beam_a = model.elementdict[self.beam_a_guid]
-        self.beam_b = model.elementdict[self.beam_b_guid]
+        self.beam_a = model.beam_by_guid(self.beam_a_guid)
+        self.beam_b = model.beam_by_guid(self.beam_b_guid)
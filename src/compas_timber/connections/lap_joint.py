@@ -40,17 +40,33 @@ class LapJoint(Joint):
 
     """
 
+    HEXAHEDRON_FACES = [
+        [1, 7, 5, 3],  # top
+        [0, 2, 4, 6],  # bottom
+        [1, 3, 2, 0],  # left
+        [3, 5, 4, 2],  # back
+        [5, 7, 6, 4],  # right
+        [7, 1, 0, 6],  # front
+    ]
+
     @property
     def __data__(self):
         data = super(LapJoint, self).__data__
-        data["main_beam"] = self.main_beam_guid
-        data["cross_beam"] = self.cross_beam_guid
+        data["main_beam_guid"] = self.main_beam_guid
+        data["cross_beam_guid"] = self.cross_beam_guid
         data["flip_lap_side"] = self.flip_lap_side
         data["cut_plane_bias"] = self.cut_plane_bias
         return data
 
-    def __init__(self, main_beam=None, cross_beam=None, flip_lap_side=False, cut_plane_bias=0.5):
-        super(LapJoint, self).__init__()
+    @classmethod
+    def __from_data__(cls, value):
+        instance = cls(**value)
+        instance.main_beam_guid = value["main_beam_guid"]
+        instance.cross_beam_guid = value["cross_beam_guid"]
+        return instance
+
+    def __init__(self, main_beam=None, cross_beam=None, flip_lap_side=False, cut_plane_bias=0.5, **kwargs):
+        super(LapJoint, self).__init__(**kwargs)
         self.main_beam = main_beam
         self.cross_beam = cross_beam
         self.flip_lap_side = flip_lap_side
@@ -58,6 +74,8 @@ class LapJoint(Joint):
         self.main_beam_guid = str(main_beam.guid) if main_beam else None
         self.cross_beam_guid = str(cross_beam.guid) if cross_beam else None
         self.features = []
+        self._negative_volumes = None
+        self._negative_volumes_key = None
 
     @property
     def beams(self):
@@ -99,34 +117,134 @@ class LapJoint(Joint):
             int_points = b, a, d, c, f, e, h, g
 
         # Step 3: Create a Hexahedron with 6 Faces from the 8 Points
-        return Polyhedron(
-            int_points,
-            [
-                [1, 7, 5, 3],  # top
-                [0, 2, 4, 6],  # bottom
-                [1, 3, 2, 0],  # left
-                [3, 5, 4, 2],  # back
-                [5, 7, 6, 4],  # right
-                [7, 1, 0, 6],  # front
-            ],
-        )
+        return Polyhedron(int_points, [face[:] for face in LapJoint.HEXAHEDRON_FACES])
 
     def get_main_cutting_frame(self):
         assert self.beams
         beam_a, beam_b = self.beams
 
-        _, cfr = self.get_face_most_towards_beam(beam_a, beam_b)
+        _, cfr = self.face_most_towards_beam(beam_a, beam_b)
         cfr = Frame(cfr.point, cfr.yaxis, cfr.xaxis)  # flip normal towards the inside of main beam
         return cfr
 
     def get_cross_cutting_frame(self):
         assert self.beams
         beam_a, beam_b = self.beams
-        _, cfr = self.get_face_most_towards_beam(beam_b, beam_a)
+        _, cfr = self.face_most_towards_beam(beam_b, beam_a)
         return cfr
 
+    def _negative_volumes_inputs(self):
+        return self._beams_key(), self.flip_lap_side, self.cut_plane_bias
+
+    @staticmethod
+    def precompute_negative_volumes(joints):
+        """Calculates the negative volumes of many lap joints at once.
+
+        The plane intersections of all the joints are solved together as a stack of 3x3 linear systems.
+        The result of each joint is used by its next call to `add_features`, unless its beams or parameters
+        have changed in the meantime. Joints whose planes do not intersect in a point are skipped,
+        these fall back to (and raise in) the regular calculation.
+
+        Requires numpy, hence not available in IronPython.
+
+        Parameters
+        ----------
+        joints : list(:class:`~compas_timber.connections.LapJoint`)
+            The lap joints.
+
+        Returns
+        -------
+        None
+
+        """
+        import numpy as np
+
+        if not joints:
+            return
+
+        def beam_arrays(beams):
+            frames = [beam.frame for beam in beams]
+            xaxis = np.array([frame.xaxis for frame in frames], dtype=float)
+            yaxis = np.array([frame.yaxis for frame in frames], dtype=float)
+            zaxis = np.array([frame.zaxis for frame in frames], dtype=float)
+            length = np.array([beam.length for beam in beams], dtype=float)[:, None]
+            width = np.array([beam.width for beam in beams], dtype=float)
+            height = np.array([beam.height for beam in beams], dtype=float)
+            midpoint = np.array([frame.point for frame in frames], dtype=float) + xaxis * length * 0.5
+            # same order as the first four Beam.faces
+            normals = np.stack([yaxis, -zaxis, -yaxis, zaxis], axis=1)
+            offsets = np.stack([width, height, width, height], axis=1)[:, :, None] * 0.5
+            return xaxis * length, normals, midpoint[:, None, :] + normals * offsets
+
+        def angles(u, v):
+            cos = np.einsum("...i,...i", u, v) / (np.linalg.norm(u, axis=-1) * np.linalg.norm(v, axis=-1))
+            return np.arccos(np.clip(cos, -1.0, 1.0))
+
+        def sorted_planes(normals, points, cut_vector):
+            order = np.argsort(angles(cut_vector[:, None, :], normals), axis=1, kind="stable")
+            return (
+                np.take_along_axis(normals, order[:, :, None], axis=1),
+                np.take_along_axis(points, order[:, :, None], axis=1),
+            )
+
+        vector_a, normals_a, points_a = beam_arrays([joint.main_beam for joint in joints])
+        vector_b, normals_b, points_b = beam_arrays([joint.cross_beam for joint in joints])
+        cut_vector = np.cross(vector_a, vector_b)
+        cut_vector[np.array([joint.flip_lap_side for joint in joints])] *= -1.0
+        valid = np.linalg.norm(cut_vector, axis=1) > 1e-12  # parallel beams have no lap
+        cut_vector[~valid] = [0.0, 0.0, 1.0]
+
+        normals_a, points_a = sorted_planes(normals_a, points_a, cut_vector)
+        normals_b, points_b = sorted_planes(normals_b, points_b, -cut_vector)
+
+        # 4 lines, each from the corner of planes (a_i, b_j) on plane a0 to the one on plane b0
+        line_planes = [(1, 1), (1, 2), (2, 2), (2, 1)]
+        systems = []
+        for index_a, index_b in line_planes:
+            for normals, points in ((normals_a, points_a), (normals_b, points_b)):
+                systems.append(
+                    (
+                        np.stack([normals_a[:, index_a], normals_b[:, index_b], normals[:, 0]], axis=1),
+                        np.stack([points_a[:, index_a], points_b[:, index_b], points[:, 0]], axis=1),
+                    )
+                )
+        matrices = np.stack([normals for normals, _ in systems], axis=1)  # (joints, 8, 3, 3)
+        rhs = np.einsum("...ij,...ij->...i", matrices, np.stack([points for _, points in systems], axis=1))
+        singular = np.abs(np.linalg.det(matrices)) < 1e-12
+        valid &= ~singular.any(axis=1)
+        matrices[singular] = np.eye(3)
+        corners = np.linalg.solve(matrices, rhs[..., None])[..., 0]
+        starts, ends = corners[:, 0::2], corners[:, 1::2]  # (joints, 4, 3) on plane a0 and b0 respectively
+
+        def hexahedra_points(tops, bottoms):
+            points = np.stack([tops, bottoms], axis=2).reshape(-1, 8, 3)
+            test_face_normal = np.cross(points[:, 2] - points[:, 0], points[:, 6] - points[:, 0])
+            flip = angles(test_face_normal, points[:, 1] - points[:, 0]) < 1
+            points[flip] = points[flip][:, [1, 0, 3, 2, 5, 4, 7, 6]]
+            return points
+
+        # the lines start on plane a0 and end on plane b0, which are thus the tops of the main and cross volumes
+        bias = np.array([joint.cut_plane_bias for joint in joints], dtype=float)[:, None, None]
+        bottoms = starts + (ends - starts) * bias
+        main_points = hexahedra_points(starts, bottoms)
+        cross_points = hexahedra_points(ends, bottoms)
+
+        for joint, is_valid, main, cross in zip(joints, valid, main_points.tolist(), cross_points.tolist()):
+            if not is_valid:
+                continue
+            joint._negative_volumes = (
+                Polyhedron([Point(*point) for point in main], [face[:] for face in LapJoint.HEXAHEDRON_FACES]),
+                Polyhedron([Point(*point) for point in cross], [face[:] for face in LapJoint.HEXAHEDRON_FACES]),
+            )
+            joint._negative_volumes_key = joint._negative_volumes_inputs()
+
     def _create_negative_volumes(self):
         assert self.beams
+        if self._negative_volumes is not None:
+            volumes, self._negative_volumes = self._negative_volumes, None
+            if self._negative_volumes_key == self._negative_volumes_inputs():
+                return volumes
+
         beam_a, beam_b = self.beams
 
         # Get Cut Plane
@@ -1,9 +1,11 @@
 import itertools
 import math
+from collections import OrderedDict
 
 from compas.geometry import Point
 from compas.geometry import add_vectors
 from compas.geometry import angle_vectors
+from compas.geometry import centroid_points
 from compas.geometry import closest_point_on_line
 from compas.geometry import cross_vectors
 from compas.geometry import distance_point_point
@@ -82,6 +84,45 @@ class JointTopology(object):
             return "TOPO_UNKNOWN"
 
 
+class JointNode(object):
+    """A location where two or more beams meet.
+
+    Parameters
+    ----------
+    point : :class:`~compas.geometry.Point`
+        The location of the node.
+    beams : list(:class:`~compas_timber.parts.Beam`)
+        The beams meeting at this node.
+    roles : dict(str, str)
+        A map of beam guids to the role of the respective beam at this node.
+        One of "start" or "end" if the beam ends at the node, "through" otherwise.
+
+    Attributes
+    ----------
+    end_beams : list(:class:`~compas_timber.parts.Beam`)
+        The beams which end at this node.
+    through_beams : list(:class:`~compas_timber.parts.Beam`)
+        The beams which pass through this node.
+
+    """
+
+    def __init__(self, point, beams, roles):
+        self.point = point
+        self.beams = beams
+        self.roles = roles
+
+    def __repr__(self):
+        return "JointNode({!r}, {} beam(s))".format(self.point, len(self.beams))
+
+    @property
+    def end_beams(self):
+        return [beam for beam in self.beams if self.roles[str(beam.guid)] != "through"]
+
+    @property
+    def through_beams(self):
+        return [beam for beam in self.beams if self.roles[str(beam.guid)] == "through"]
+
+
 class ConnectionSolver(object):
     """Provides tools for detecting beam intersections and joint topologies."""
 
@@ -218,6 +259,105 @@ class ConnectionSolver(object):
         # X-joint (both meeting somewhere along the line)
         return JointTopology.TOPO_X, beam_a, beam_b
 
+    def find_nodes(self, beams, max_distance=None, min_beams=3, rtree=False):
+        """Finds the nodes at which several beams meet.
+
+        The meeting points of all intersecting pairs of beams are clustered using a spatial hash with cells
+        of size `max_distance`, meeting points closer than `max_distance` to each other belong to the same node.
+
+        Parameters
+        ----------
+        beams : list(:class:`~compas_timber.parts.Beam`)
+            A list of beam objects.
+        max_distance : float, optional
+            Maximum distance, in design units, at which two beams are considered intersecting
+            and at which two meeting points are considered the same node.
+        min_beams : int, optional
+            The minimum number of beams meeting at a node for it to be returned. Defaults to 3.
+        rtree : bool, optional
+            When set to True R-tree will be used to search for neighboring beams.
+
+        Returns
+        -------
+        list(:class:`~compas_timber.connections.JointNode`)
+
+        """
+        tol = self.TOLERANCE
+        distance = max(max_distance or 0.0, tol)
+
+        points = []
+        point_beams = []
+        for beam_a, beam_b in self.find_intersecting_pairs(beams, rtree=rtree, max_distance=distance):
+            topology, _, _ = self.find_topology(beam_a, beam_b, max_distance=max_distance)
+            if topology == JointTopology.TOPO_UNKNOWN:
+                continue
+            pa, pb = self._closest_points(beam_a.centerline, beam_b.centerline)
+            points.append(centroid_points([pa, pb]))
+            point_beams.append((beam_a, beam_b))
+
+        # union-find over the meeting points, neighbors are looked up in the adjacent cells of a spatial hash
+        parents = list(range(len(points)))
+
+        def find(i):
+            while parents[i] != i:
+                parents[i] = parents[parents[i]]
+                i = parents[i]
+            return i
+
+        grid = {}
+        for index, point in enumerate(points):
+            cell = tuple(int(math.floor(c / distance)) for c in point)
+            for offset in itertools.product((-1, 0, 1), repeat=3):
+                neighbor_cell = (cell[0] + offset[0], cell[1] + offset[1], cell[2] + offset[2])
+                for other in grid.get(neighbor_cell, []):
+                    if distance_point_point(point, points[other]) <= distance:
+                        parents[find(other)] = find(index)
+            grid.setdefault(cell, []).append(index)
+
+        clusters = OrderedDict()
+        for index in range(len(points)):
+            clusters.setdefault(find(index), []).append(index)
+
+        order = {id(beam): index for index, beam in enumerate(beams)}
+        nodes = []
+        for indices in clusters.values():
+            node_beams = {}
+            for index in indices:
+                for beam in point_beams[index]:
+                    node_beams[id(beam)] = beam
+            if len(node_beams) < min_beams:
+                continue
+            point = Point(*centroid_points([points[index] for index in indices]))
+            node_beams = sorted(node_beams.values(), key=lambda beam: order[id(beam)])
+            roles = {str(beam.guid): self._role_at_point(beam, point, distance) for beam in node_beams}
+            nodes.append(JointNode(point, node_beams, roles))
+        return nodes
+
+    @staticmethod
+    def _closest_points(line_a, line_b):
+        """Returns the closest points between two line segments."""
+        a1, a2 = line_a
+        b1, b2 = line_b
+        va = subtract_vectors(a2, a1)
+        vb = subtract_vectors(b2, b1)
+        vn = cross_vectors(va, vb)
+        if dot_vectors(vn, vn) < 1e-12:  # parallel, closest are the ends that meet
+            return min(itertools.product([a1, a2], [b1, b2]), key=lambda pair: distance_point_point(*pair))
+        vna = cross_vectors(va, vn)
+        vnb = cross_vectors(vb, vn)
+        ta = min(max(ConnectionSolver._calc_t([a1, a2], [b1, vnb]), 0.0), 1.0)
+        tb = min(max(ConnectionSolver._calc_t([b1, b2], [a1, vna]), 0.0), 1.0)
+        return add_vectors(a1, scale_vector(va, ta)), add_vectors(b1, scale_vector(vb, tb))
+
+    @staticmethod
+    def _role_at_point(beam, point, max_distance):
+        start, end = beam.centerline
+        if distance_point_point(start, point) <= max_distance:
+            return "start"
+        if distance_point_point(end, point) <= max_distance:
+            return "end"
+        return "through"
+
     @staticmethod
     def _calc_t(line, plane):
         a, b = line
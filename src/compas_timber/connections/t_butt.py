@@ -1,6 +1,5 @@
 from compas_timber.connections.butt_joint import ButtJoint
 from compas_timber.elements import CutFeature
-from compas_timber.elements import MillVolume
 
 from .joint import BeamJoinningError
 from .solver import JointTopology
@@ -49,7 +48,8 @@ class TButtJoint(ButtJoint):
         assert self.main_beam and self.cross_beam  # should never happen
 
         if self.features:
-            self.main_beam.remove_features(self.features)
+            for beam in self.beams:
+                beam.remove_features(self.features)
         cutting_plane = None
         try:
             cutting_plane = self.get_main_cutting_plane()[0]
@@ -62,8 +62,10 @@ class TButtJoint(ButtJoint):
         extension_tolerance = 0.01  # TODO: this should be proportional to the unit used
         self.main_beam.add_blank_extension(start_main + extension_tolerance, end_main + extension_tolerance, self.guid)
 
-        trim_feature = CutFeature(cutting_plane)
+        trim_feature = CutFeature(cutting_plane, is_joinery=True)
+        self.features = [trim_feature]
         if self.mill_depth:
-            self.cross_beam.add_features(MillVolume(self.subtraction_volume()))
+            lap_feature = self.create_lap_feature()
+            self.cross_beam.add_features(lap_feature)
+            self.features.append(lap_feature)
         self.main_beam.add_features(trim_feature)
-        self.features = [trim_feature]
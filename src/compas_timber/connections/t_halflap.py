@@ -31,8 +31,8 @@ class THalfLapJoint(LapJoint):
 
     SUPPORTED_TOPOLOGY = JointTopology.TOPO_T
 
-    def __init__(self, main_beam=None, cross_beam=None, flip_lap_side=False, cut_plane_bias=0.5):
-        super(THalfLapJoint, self).__init__(main_beam, cross_beam, flip_lap_side, cut_plane_bias)
+    def __init__(self, main_beam=None, cross_beam=None, flip_lap_side=False, cut_plane_bias=0.5, **kwargs):
+        super(THalfLapJoint, self).__init__(main_beam, cross_beam, flip_lap_side, cut_plane_bias, **kwargs)
 
     def add_features(self):
         assert self.main_beam and self.cross_beam  # should never happen
@@ -52,13 +52,13 @@ class THalfLapJoint(LapJoint):
         extension_tolerance = 0.01  # TODO: this should be proportional to the unit used
         self.main_beam.add_blank_extension(start_main + extension_tolerance, end_main + extension_tolerance, self.guid)
 
-        main_volume = MillVolume(negative_brep_main_beam)
-        cross_volume = MillVolume(negative_brep_cross_beam)
+        main_volume = MillVolume(negative_brep_main_beam, is_joinery=True)
+        cross_volume = MillVolume(negative_brep_cross_beam, is_joinery=True)
         self.main_beam.add_features(main_volume)
         self.cross_beam.add_features(cross_volume)
 
         trim_frame = Frame(main_cutting_frame.point, main_cutting_frame.xaxis, -main_cutting_frame.yaxis)
-        f_main = CutFeature(trim_frame)
+        f_main = CutFeature(trim_frame, is_joinery=True)
         self.main_beam.add_features(f_main)
 
         self.features = [main_volume, cross_volume, f_main]
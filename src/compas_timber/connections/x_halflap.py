@@ -38,8 +38,8 @@ class XHalfLapJoint(LapJoint):
             negative_brep_beam_a, negative_brep_beam_b = self._create_negative_volumes()
         except Exception as ex:
             raise BeamJoinningError(beams=self.beams, joint=self, debug_info=str(ex))
-        volume_a = MillVolume(negative_brep_beam_a)
-        volume_b = MillVolume(negative_brep_beam_b)
+        volume_a = MillVolume(negative_brep_beam_a, is_joinery=True)
+        volume_b = MillVolume(negative_brep_beam_b, is_joinery=True)
         self.main_beam.add_features(volume_a)
         self.cross_beam.add_features(volume_b)
         self.features = [volume_a, volume_b]
@@ -0,0 +1,21 @@
+from .workflow import CategoryRule
+from .workflow import DebugInfomation
+from .workflow import DirectRule
+from .workflow import FeatureDefinition
+from .workflow import JointDefinition
+from .workflow import JointRule
+from .workflow import JointRuleSolver
+from .workflow import TopologyRule
+from .workflow import find_topologies
+
+__all__ = [
+    "JointRule",
+    "JointDefinition",
+    "CategoryRule",
+    "TopologyRule",
+    "DirectRule",
+    "FeatureDefinition",
+    "DebugInfomation",
+    "JointRuleSolver",
+    "find_topologies",
+]
@@ -0,0 +1,366 @@
+from compas_timber.connections import ConnectionSolver
+from compas_timber.connections import JointTopology
+from compas_timber.connections import LMiterJoint
+from compas_timber.connections import TButtJoint
+from compas_timber.connections import XHalfLapJoint
+
+
+class JointRule(object):
+    def comply(self, beams):
+        """Returns True if the provided beams comply with the rule defined by this instance. False otherwise.
+
+        Parameters
+        ----------
+        beams : list(:class:`~compas_timber.parts.Beam`)
+
+        Returns
+        -------
+        bool
+
+        """
+        raise NotImplementedError
+
+
+class DirectRule(JointRule):
+    """Creates a Joint Rule that directly joins two beams."""
+
+    def __init__(self, joint_type, beams, **kwargs):
+        self.beams = beams
+        self.joint_type = joint_type
+        self.kwargs = kwargs
+
+    def ToString(self):
+        # GH doesn't know
+        return repr(self)
+
+    def __repr__(self):
+        return "{}({}, {})".format(DirectRule, self.beams, self.joint_type)
+
+    def comply(self, beams):
+        try:
+            return set(self.beams) == set(beams)
+        except TypeError:
+            print("unable to comply direct joint beam sets")
+            return False
+
+
+class CategoryRule(JointRule):
+    """Based on the category attribute attached to the beams, this rule assigns"""
+
+    def __init__(self, joint_type, category_a, category_b, topos=None, **kwargs):
+        self.joint_type = joint_type
+        self.category_a = category_a
+        self.category_b = category_b
+        self.topos = topos or []
+        self.kwargs = kwargs
+
+    def ToString(self):
+        # GH doesn't know
+        return repr(self)
+
+    def __repr__(self):
+        return "{}({}, {}, {}, {})".format(
+            CategoryRule.__name__, self.joint_type.__name__, self.category_a, self.category_b, self.topos
+        )
+
+    def comply(self, beams):
+        try:
+            beam_cats = set([b.attributes["category"] for b in beams])
+            return beam_cats == set([self.category_a, self.category_b])
+        except KeyError:
+            return False
+
+    def reorder(self, beams):
+        """Returns the given beams in a sorted order.
+
+        The beams are sorted according to their category attribute, first the beams with `catergory_a` and second the
+        one with `category_b`.
+        This allows using the category to determine the role of the beams.
+
+        Parameters
+        ----------
+        beams : tuple(:class:`~compas_timber.parts.Beam`, :class:`~compas_timber.parts.Beam`)
+            A tuple containing two beams to sort.
+
+        Returns
+        -------
+        tuple(:class:`~compas_timber.parts.Beam`, :class:`~compas_timber.parts.Beam`)
+
+        """
+        beam_a, beam_b = beams
+        if beam_a.attributes["category"] == self.category_a:
+            return beam_a, beam_b
+        else:
+            return beam_b, beam_a
+
+
+class TopologyRule(JointRule):
+    """for a given connection topology type (L,T,X,I,K...), this rule assigns a joint type.
+
+    parameters
+    ----------
+    topology_type : constant(compas_timber.connections.JointTopology)
+        The topology type to which the rule is applied.
+    joint_type : cls(:class:`compas_timber.connections.Joint`)
+        The joint type to be applied to this topology.
+    kwargs : dict
+        The keyword arguments to be passed to the joint.
+    """
+
+    def __init__(self, topology_type, joint_type, **kwargs):
+        self.topology_type = topology_type
+        self.joint_type = joint_type
+        self.kwargs = kwargs
+
+    def ToString(self):
+        # GH doesn't know
+        return repr(self)
+
+    def __repr__(self):
+        return "{}({}, {})".format(TopologyRule, self.topology_type, self.joint_type)
+
+
+class JointDefinition(object):
+    """Container for a joint type and the beam that shall be joined.
+
+    This allows delaying the actual joining of the beams to a downstream component.
+
+    """
+
+    def __init__(self, joint_type, beams, **kwargs):
+        # if not issubclass(joint_type, Joint):
+        #     raise UserWarning("{} is not a valid Joint type!".format(joint_type.__name__))
+        if len(beams) != 2:
+            raise UserWarning("Expected to get two Beams, got {}.".format(len(beams)))
+
+        self.joint_type = joint_type
+        self.beams = beams
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        return "{}({}, {}, {})".format(JointDefinition.__name__, self.joint_type.__name__, self.beams, self.kwargs)
+
+    def ToString(self):
+        return repr(self)
+
+    def __hash__(self):
+        return hash((self.joint_type, self.beams))
+
+    def is_identical(self, other):
+        return (
+            isinstance(other, JointDefinition)
+            and self.joint_type == other.joint_type
+            and set([b.key for b in self.beams]) == set([b.key for b in other.beams])
+        )
+
+    def match(self, beams):
+        """Returns True if beams are defined within this JointDefinition."""
+        set_a = set([id(b) for b in beams])
+        set_b = set([id(b) for b in self.beams])
+        return set_a == set_b
+
+
+class FeatureDefinition(object):
+    """Container linking a feature for the beams on which it should be applied.
+
+    This allows delaying the actual applying of features to a downstream component.
+
+    """
+
+    def __init__(self, feature, beams):
+        self.feature = feature
+        self.beams = beams
+
+    def __repr__(self):
+        return "{}({}, {})".format(FeatureDefinition.__name__, repr(self.feature), self.beams)
+
+    def ToString(self):
+        return repr(self)
+
+
+class DebugInfomation(object):
+    """Container for debugging information allowing visual inspection of joint and features related errors.
+
+    Attributes
+    ----------
+    feature_errors : list(:class:`~compas_timber.consumers.FeatureApplicationError`)
+        List of errors that occured during the application of features.
+    joint_errors : list(:class:`~compas_timber.connections.BeamJoiningError`)
+        List of errors that occured during the joining of beams.
+
+    See Also
+    --------
+    :class:`~compas_timber.consumers.FeatureApplicationError`
+    :class:`~compas_timber.connections.BeamJoiningError`
+
+    """
+
+    def __init__(self):
+        self.feature_errors = []
+        self.joint_errors = []
+
+    def __repr__(self):
+        return "{}({} feature errors, {} joining errors)".format(
+            DebugInfomation.__name__, len(self.feature_errors), len(self.joint_errors)
+        )
+
+    def ToString(self):
+        return repr(self)
+
+    @property
+    def has_errors(self):
+        return self.feature_errors or self.joint_errors
+
+    def add_feature_error(self, error):
+        if isinstance(error, list):
+            self.feature_errors.extend(error)
+        else:
+            self.feature_errors.append(error)
+
+    def add_joint_error(self, error):
+        self.joint_errors.append(error)
+
+
+def find_topologies(beams, max_distance=None, rtree=False):
+    """Finds the topology of each pair of intersecting beams.
+
+    Parameters
+    ----------
+    beams : list(:class:`~compas_timber.elements.Beam`)
+        The beams to analyze.
+    max_distance : float, optional
+        Maximum distance, in design units, at which two beams are considered intersecting.
+    rtree : bool, optional
+        When set to True R-tree will be used to search for neighboring beams.
+
+    Returns
+    -------
+    list(dict)
+        The topologies as dicts with the keys "detected_topo", "beam_a" and "beam_b".
+        Pairs with unknown topology are omitted.
+
+    """
+    solver = ConnectionSolver()
+    topologies = []
+    for beam_a, beam_b in solver.find_intersecting_pairs(beams, rtree=rtree, max_distance=max_distance or 0.0):
+        detected_topo, beam_a, beam_b = solver.find_topology(beam_a, beam_b, max_distance=max_distance)
+        if not detected_topo == JointTopology.TOPO_UNKNOWN:
+            topologies.append({"detected_topo": detected_topo, "beam_a": beam_a, "beam_b": beam_b})
+    return topologies
+
+
+class JointRuleSolver(object):
+    """Resolves joint rules into joint definitions for a set of beam topologies.
+
+    The rules are indexed once: direct rules by the guids of their beams, category rules by their pair of categories
+    and topology rules by their topology. This way each topology is resolved with a few look-ups, regardless of the
+    number of rules.
+    Direct rules take precedence over category rules, which take precedence over topology rules.
+
+    Parameters
+    ----------
+    rules : list(:class:`~compas_timber.design.JointRule`)
+        The joint rules. None values are ignored.
+
+    Attributes
+    ----------
+    DEFAULT_JOINTS : dict(int, type)
+        The joint type assigned to each topology by default. A default topology rule does not override an existing
+        rule for the same topology.
+
+    """
+
+    DEFAULT_JOINTS = {
+        JointTopology.TOPO_X: XHalfLapJoint,
+        JointTopology.TOPO_T: TButtJoint,
+        JointTopology.TOPO_L: LMiterJoint,
+    }
+
+    def __init__(self, rules):
+        if not isinstance(rules, list):
+            rules = [rules]
+        rules = [rule for rule in rules if rule is not None]
+        self.direct_rules = {}
+        self.category_rules = {}
+        self.topology_rules = {}
+
+        for rule in rules:
+            if isinstance(rule, DirectRule):
+                self.direct_rules.setdefault(self._beams_key(rule.beams), rule)  # first matching rule
+            elif isinstance(rule, CategoryRule):
+                key = frozenset([rule.category_a, rule.category_b])
+                self.category_rules.setdefault(key, []).append(rule)
+            elif isinstance(rule, TopologyRule):
+                existing = self.topology_rules.get(rule.topology_type)
+                if not existing or not self._is_default(rule):
+                    self.topology_rules[rule.topology_type] = rule
+
+    @staticmethod
+    def _beams_key(beams):
+        return frozenset(str(beam.guid) for beam in beams)
+
+    def _is_default(self, rule):
+        return rule.joint_type == self.DEFAULT_JOINTS.get(rule.topology_type) and len(rule.kwargs) == 0
+
+    def resolve(self, topologies):
+        """Resolves the joint definition of each of the given topologies.
+
+        Parameters
+        ----------
+        topologies : list(dict)
+            The topologies as dicts with the keys "detected_topo", "beam_a" and "beam_b".
+            See :func:`~compas_timber.design.find_topologies`.
+
+        Returns
+        -------
+        tuple(list(:class:`~compas_timber.design.JointDefinition`), list(str))
+            The joint definitions and messages describing conflicts between category rules and the detected topologies.
+
+        """
+        joints = []
+        conflicts = []
+        for topo in topologies:
+            definition = self._resolve_topology(topo["detected_topo"], topo["beam_a"], topo["beam_b"], conflicts)
+            if definition:
+                joints.append(definition)
+        return joints, conflicts
+
+    def _resolve_topology(self, detected_topo, beam_a, beam_b, conflicts):
+        if detected_topo == JointTopology.TOPO_UNKNOWN:
+            return None
+
+        rule = self.direct_rules.get(self._beams_key([beam_a, beam_b]))
+        if rule:
+            return JointDefinition(rule.joint_type, rule.beams, **rule.kwargs)
+
+        category_a = beam_a.attributes.get("category")
+        category_b = beam_b.attributes.get("category")
+        if category_a is not None and category_b is not None:
+            for rule in self.category_rules.get(frozenset([category_a, category_b]), []):
+                if rule.joint_type.SUPPORTED_TOPOLOGY != detected_topo:
+                    msg = "Conflict detected! Beams: {}, {} meet with topology: {} but rule assigns: {}"
+                    conflicts.append(
+                        msg.format(
+                            beam_a.guid, beam_b.guid, JointTopology.get_name(detected_topo), rule.joint_type.__name__
+                        )
+                    )
+                    continue
+                if rule.topos and detected_topo not in rule.topos:
+                    msg = "Conflict detected! Beams: {}, {} meet with topology: {} but rule allows: {}"
+                    conflicts.append(
+                        msg.format(
+                            beam_a.guid,
+                            beam_b.guid,
+                            JointTopology.get_name(detected_topo),
+                            [JointTopology.get_name(topo) for topo in rule.topos],
+                        )
+                    )
+                    continue
+                # sort by category to allow beam role by order (main beam first, cross beam second)
+                beams = rule.reorder([beam_a, beam_b])
+                return JointDefinition(rule.joint_type, list(beams), **rule.kwargs)
+
+        rule = self.topology_rules.get(detected_topo)
+        if rule:
+            return JointDefinition(rule.joint_type, [beam_a, beam_b], **rule.kwargs)
+        return None
@@ -4,6 +4,7 @@ from .features import BrepSubtraction
 from .features import CutFeature
 from .features import DrillFeature
 from .features import MillVolume
+from .features import LapFeature
 from .features import FeatureApplicationError
 
 __all__ = [
@@ -12,6 +13,7 @@ __all__ = [
     "CutFeature",
     "DrillFeature",
     "MillVolume",
+    "LapFeature",
     "BrepSubtraction",
     "FeatureApplicationError",
 ]
@@ -19,6 +19,38 @@ from compas_timber.utils.compas_extra import intersection_line_plane
 
 from .features import FeatureApplicationError
 
+try:
+    from sys import intern
+except ImportError:
+    pass  # IronPython 2.7, intern is a builtin
+
+
+class _FrozenDict(dict):
+    """A dictionary which cannot be modified, used as the shared empty sentinel of the dictionaries of beams."""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("This dictionary is shared and cannot be modified.")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    update = setdefault = pop = popitem = clear = _immutable
+
+
+# The containers of a new beam are shared, immutable and empty sentinels, which the beam replaces by its own when it
+# first modifies them, see Beam._own. Clones of a beam share its containers the same way, see Beam._clone.
+_EMPTY = ()
+_EMPTY_DICT = _FrozenDict()
+_CONTAINERS = frozenset(("_features", "_blank_extensions", "_pending_joints", "_attributes", "_debug_info"))
+_OWNED = {}  # (shared names, owned name) -> remaining shared names, the few possible sets are re-used by all beams
+
+
+def _interned(attributes):
+    """Returns a copy of `attributes` whose string keys and values are interned, i.e. shared by all beams."""
+    return {_intern(key): _intern(value) for key, value in attributes.items()}
+
+
+def _intern(value):
+    return intern(value) if type(value) is str else value
+
 
 class Beam(Element):
     """
@@ -79,6 +111,13 @@ class Beam(Element):
         A list containing the 4 lines along the long axis of this beam.
     midpoint : :class:`~compas.geometry.Point`
         The point at the middle of the centerline of this beam.
+    attributes : dict
+        User attributes of this beam, e.g. its category. The string keys and values of an assigned dictionary are
+        interned, i.e. shared by all beams.
+    geometry_version : int
+        A counter which is incremented whenever the frame or the dimensions of this beam are assigned.
+        While the beam is part of a model, such changes and those of its features and blank extensions are
+        recorded in the :attr:`~compas_timber.model.TimberModel.journal` of the model.
 
     """
 
@@ -91,15 +130,20 @@ class Beam(Element):
         return data
 
     def __init__(self, frame, length, width, height, **kwargs):
+        self._geometry_version = 0
+        self._journal = None  # set while the beam is part of a model, see TimberModel.journal
+        self._shared = _CONTAINERS
         super(Beam, self).__init__(frame=frame, **kwargs)
         self.width = width
         self.height = height
         self.length = length
-        self.features = []
-        self.attributes = {}
-        self.attributes.update(kwargs)
-        self._blank_extensions = {}
-        self.debug_info = []
+        self._features = _EMPTY
+        self._attributes = _EMPTY_DICT
+        self._blank_extensions = _EMPTY_DICT
+        self._pending_joints = _EMPTY
+        self._adding_joint_features = False
+        self._debug_info = _EMPTY
+        self._shared = _CONTAINERS  # the setters called by Element mark the containers as owned
 
     def __repr__(self):
         # type: () -> str
@@ -111,6 +155,116 @@ class Beam(Element):
     # Computed attributes
     # ==========================================================================
 
+    @property
+    def geometry_version(self):
+        return self._geometry_version
+
+    @Element.frame.setter
+    def frame(self, frame):
+        Element.frame.fset(self, frame)
+        self._geometry_changed()
+
+    @property
+    def width(self):
+        return self._width
+
+    @width.setter
+    def width(self, width):
+        self._width = width
+        self._geometry_changed()
+
+    @property
+    def height(self):
+        return self._height
+
+    @height.setter
+    def height(self, height):
+        self._height = height
+        self._geometry_changed()
+
+    @property
+    def length(self):
+        return self._length
+
+    @length.setter
+    def length(self, length):
+        self._length = length
+        self._geometry_changed()
+
+    def _geometry_changed(self):
+        self._geometry_version += 1
+        self._record_change("beam_geometry", geometry_version=self._geometry_version)
+
+    def _record_change(self, action, **details):
+        if self._journal is not None:
+            self._journal.record(action, str(self.guid), **details)
+
+    def _clone(self):
+        """Returns a shallow copy of this beam, see :meth:`~compas_timber.model.TimberModel.clone`.
+
+        The copy has the same GUID and shares the frame, the computed geometry, the features and the blank
+        extensions with this beam. The containers are copied by either beam before it first modifies them.
+
+        """
+        beam = Beam.__new__(type(self))
+        beam.__dict__.update(self.__dict__)
+        beam._attributes = dict(self._attributes) if self._attributes else _EMPTY_DICT
+        beam._debug_info = list(self._debug_info) if self._debug_info else _EMPTY
+        beam._pending_joints = _EMPTY
+        beam._journal = None
+        beam.graph_node = None
+        beam.tree_node = None
+        self._shared = beam._shared = _CONTAINERS
+        return beam
+
+    def _own(self, name):
+        """Replaces the container `name` by a copy if it is shared, before it is modified in place."""
+        if name in self._shared:
+            value = getattr(self, name)
+            setattr(self, name, dict(value) if isinstance(value, dict) else list(value))
+            self._unshare(name)
+
+    def _unshare(self, name):
+        """Marks the container `name` as owned by this beam, e.g. after it has been replaced."""
+        if name in self._shared:
+            key = (self._shared, name)
+            if key not in _OWNED:
+                _OWNED[key] = self._shared.difference((name,))
+            self._shared = _OWNED[key]
+
+    @property
+    def features(self):
+        self._add_pending_joint_features()
+        self._own("_features")  # the caller may modify the list in place
+        return self._features
+
+    @features.setter
+    def features(self, features):
+        self._features = features
+        self._unshare("_features")
+
+    @property
+    def attributes(self):
+        if not self._attributes:
+            self._own("_attributes")
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes):
+        self._attributes = _interned(attributes)
+        self._unshare("_attributes")
+
+    @property
+    def debug_info(self):
+        if not self._debug_info:
+            self._own("_debug_info")
+        return self._debug_info
+
+    @debug_info.setter
+    def debug_info(self, debug_info):
+        self._debug_info = debug_info
+        self._unshare("_debug_info")
+
     @property
     def shape(self):
         return self._create_shape(self.frame, self.length, self.width, self.height)
@@ -416,7 +570,10 @@ class Beam(Element):
         """
         if not isinstance(features, list):
             features = [features]
-        self.features.extend(features)
+        self._add_pending_joint_features()
+        self._own("_features")
+        self._features.extend(features)
+        self._record_change("add_features", count=len(features))
 
     @reset_computed
     def remove_features(self, features=None):
@@ -425,15 +582,18 @@ class Beam(Element):
         Parameters
         ----------
         feature : :class:`~compas_timber.parts.Feature` | list(:class:`~compas_timber.parts.Feature`)
-            The feature to be removed. If None, all features will be removed.
+            The feature to be removed. If None, all features will be removed, including those of deferred joints.
 
         """
         if features is None:
+            # the deferred joints would otherwise add their features to this beam once the other beam needs them
+            self._add_pending_joint_features()
             self.features = []
         else:
             if not isinstance(features, list):
                 features = [features]
-            self.features = [f for f in self.features if f not in features]
+            self.features = [f for f in self._features if f not in features]
+        self._record_change("remove_features", count=None if features is None else len(features))
 
     def add_blank_extension(self, start, end, joint_key=None):
         """Adds a blank extension to the beam.
@@ -447,11 +607,13 @@ class Beam(Element):
             this extension will be removed as well.
 
         """
+        self._own("_blank_extensions")
         if joint_key is not None and joint_key in self._blank_extensions:
             s, e = self._blank_extensions[joint_key]
             start += s
             end += e
         self._blank_extensions[joint_key] = (start, end)
+        self._record_change("add_blank_extension", joint_key=None if joint_key is None else str(joint_key))
 
     def remove_blank_extension(self, joint_key=None):
         """Removes a blank extension from the beam.
@@ -465,10 +627,13 @@ class Beam(Element):
         if joint_key is None:
             self._blank_extensions = {}
         else:
+            self._own("_blank_extensions")
             del self._blank_extensions[joint_key]
+        self._record_change("remove_blank_extension", joint_key=None if joint_key is None else str(joint_key))
 
     def _resolve_blank_extensions(self):
         """Returns the max amount by which to extend the beam at both ends."""
+        self._add_pending_joint_features()
         start = 0.0
         end = 0.0
         for s, e in self._blank_extensions.values():
@@ -476,6 +641,13 @@ class Beam(Element):
             end = max(end, e)
         return start, end
 
+    def _add_pending_joint_features(self):
+        """Adds the features of the joints which have deferred them, in the order the joints were created."""
+        if self._adding_joint_features:
+            return  # called by one of the joints while it's adding its features
+        while self._pending_joints:
+            self._pending_joints[0].add_deferred_features()
+
     def extension_to_plane(self, pln):
         """Returns the amount by which to extend the beam in each direction using metric units.
 
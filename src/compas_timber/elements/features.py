@@ -201,6 +201,35 @@ class MillVolume(Feature):
             )
 
 
+class LapFeature(MillVolume):
+    """A lap to be milled out of a beam.
+
+    Besides the volume to be milled, a lap holds the parameters which describe it as a BTLx `Lap` processing.
+
+    Parameters
+    ----------
+    volume : :class:`compas.geometry.Polyhedron` | :class:`compas.datastructures.Mesh`
+        The volume to be milled out of the beam.
+    ref_face : :class:`compas.geometry.Frame`
+        The face of the beam on which the lap is opened.
+    btlx_params : dict, optional
+        The parameters of the lap process. See :class:`~compas_timber.fabrication.BTLxLap`.
+
+    """
+
+    @property
+    def __data__(self):
+        data_dict = super(LapFeature, self).__data__
+        data_dict["ref_face"] = self.ref_face
+        data_dict["btlx_params"] = self.btlx_params
+        return data_dict
+
+    def __init__(self, volume, ref_face, btlx_params=None, **kwargs):
+        super(LapFeature, self).__init__(volume, **kwargs)
+        self.ref_face = ref_face
+        self.btlx_params = btlx_params or {}
+
+
 class BrepSubtraction(Feature):
     """Generic volume subtraction from a beam.
 
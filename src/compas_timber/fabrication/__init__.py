@@ -4,10 +4,14 @@ from .btlx import BTLxPart
 from .btlx_processes.btlx_french_ridge_lap import BTLxFrenchRidgeLap
 from .btlx_processes.btlx_jack_cut import BTLxJackCut
 from .btlx_processes.btlx_lap import BTLxLap
+from .btlx_processes.btlx_drilling import BTLxDrilling
 from .joint_factories.french_ridge_factory import FrenchRidgeFactory
 from .joint_factories.l_butt_factory import LButtFactory
 from .joint_factories.l_miter_factory import LMiterFactory
 from .joint_factories.t_butt_factory import TButtFactory
+from .feature_factories.cut_feature_factory import CutFeatureFactory
+from .feature_factories.drill_feature_factory import DrillFeatureFactory
+from .feature_factories.lap_feature_factory import LapFeatureFactory
 
 __all__ = [
     "BTLx",
@@ -16,8 +20,12 @@ __all__ = [
     "BTLxJackCut",
     "BTLxLap",
     "BTLxFrenchRidgeLap",
+    "BTLxDrilling",
     "LButtFactory",
     "TButtFactory",
     "LMiterFactory",
     "FrenchRidgeFactory",
+    "CutFeatureFactory",
+    "DrillFeatureFactory",
+    "LapFeatureFactory",
 ]
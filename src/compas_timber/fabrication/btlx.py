@@ -1,15 +1,24 @@
+import gzip
+import io
+import json
 import os
+import re
 import uuid
 import xml.dom.minidom as MD
 import xml.etree.ElementTree as ET
+import zipfile
 from collections import OrderedDict
 from datetime import date
 from datetime import datetime
+from xml.sax.saxutils import quoteattr
 
 import compas
 from compas.geometry import Frame
 from compas.geometry import Transformation
-from compas.geometry import angle_vectors
+from compas.geometry import multiply_matrices
+from compas.geometry import transform_points
+from compas.geometry import transpose_matrix
+from compas.plugins import PluginNotInstalledError
 from compas.tolerance import TOL
 
 
@@ -22,6 +31,9 @@ class BTLx(object):
     ----------
     model : :class:`~compas_timber.model.Model`
         The model object.
+    process_features : bool, optional
+        If True, the processings are derived from the features of each beam instead of from the joints of the model.
+        Defaults to False.
 
     Attributes
     ----------
@@ -38,7 +50,11 @@ class BTLx(object):
 
     POINT_PRECISION = 3
     ANGLE_PRECISION = 3
+    INDENT = "   "
+    PROJECT_NAME = "testProject"
+    MANIFEST_NAME = "manifest.json"
     REGISTERED_JOINTS = {}
+    REGISTERED_FEATURES = {}
     FILE_ATTRIBUTES = OrderedDict(
         [
             ("xmlns", "https://www.design2machine.com"),
@@ -52,11 +68,12 @@ class BTLx(object):
         ]
     )
 
-    def __init__(self, model):
+    def __init__(self, model, process_features=False):
         self.model = model
         self.parts = {}
         self._test = []
         self.joints = model.joints
+        self.process_features = process_features
         self.process_model()
 
     @property
@@ -76,27 +93,278 @@ class BTLx(object):
 
     def btlx_string(self):
         """Returns a pretty XML string for visualization in GH, Terminal, etc."""
-        self.ET_element = ET.Element("BTLx", BTLx.FILE_ATTRIBUTES)
-        self.ET_element.append(self.file_history)
-        self.project_element = ET.SubElement(self.ET_element, "Project", Name="testProject")
-        self.parts_element = ET.SubElement(self.project_element, "Parts")
+        stream = io.StringIO()
+        self.write(stream)
+        return stream.getvalue()
 
+    def write(self, file, parts=None):
+        """Writes the BTLx document to a file.
+
+        The document is written part by part, so that it is never held in memory as a whole.
+
+        Parameters
+        ----------
+        file : str | file-like
+            The path of the file or an open text file object to write to.
+        parts : list(:class:`~compas_timber.fabrication.BTLxPart`), optional
+            The parts to write. Defaults to all the parts of this BTLx.
+
+        Returns
+        -------
+        None
+
+        """
+        if isinstance(file, str):
+            with io.open(file, "w", encoding="utf-8") as f:
+                return self.write(f, parts)
+
+        parts = list(self.parts.values() if parts is None else parts)
+        file.write('<?xml version="1.0" ?>\n')
+        file.write("<BTLx{}>\n".format(self._attributes_string(BTLx.FILE_ATTRIBUTES)))
+        self._write_element(file, self.file_history, 1)
+        file.write("{}<Project Name={}>\n".format(BTLx.INDENT, quoteattr(BTLx.PROJECT_NAME)))
+        if not parts:
+            file.write("{}<Parts/>\n".format(BTLx.INDENT * 2))
+        else:
+            file.write("{}<Parts>\n".format(BTLx.INDENT * 2))
+            for part in parts:
+                self._write_element(file, part.et_element, 3)
+            file.write("{}</Parts>\n".format(BTLx.INDENT * 2))
+        file.write("{}</Project>\n".format(BTLx.INDENT))
+        file.write("</BTLx>\n")
+
+    @staticmethod
+    def _attributes_string(attributes):
+        return "".join(" {}={}".format(name, quoteattr(value)) for name, value in attributes.items())
+
+    @staticmethod
+    def _write_element(file, element, level):
+        # pretty-print one element at a time and indent it to its level in the document
+        pretty = MD.parseString(ET.tostring(element)).documentElement.toprettyxml(indent=BTLx.INDENT)
+        prefix = BTLx.INDENT * level
+        for line in pretty.splitlines():
+            file.write("{}{}\n".format(prefix, line))
+
+    def shards(self, key):
+        """Groups the parts of this BTLx into shards.
+
+        Parameters
+        ----------
+        key : str | callable
+            Either "wall", to group the parts by the wall of the model which contains their beam, the name of a beam
+            attribute (e.g. "category", "Package" or "Storey") or a callable which returns the shard name of a given beam.
+            Parts for which the key yields None are grouped in a shard named "unassigned".
+
+        Returns
+        -------
+        dict(str, list(:class:`~compas_timber.fabrication.BTLxPart`))
+            The parts of each shard, by shard name, in the order of the parts.
+
+        """
+        if key == "wall":
+            walls = self.model.walls
+
+            def key(beam):
+                wall = self.model.wall_of_beam(beam)
+                return None if wall is None else "wall_{}".format(walls.index(wall))
+
+        elif not callable(key):
+            attribute = key
+
+            def key(beam):
+                return beam.attributes.get(attribute)
+
+        shards = OrderedDict()
         for part in self.parts.values():
-            self.parts_element.append(part.et_element)
-        return MD.parseString(ET.tostring(self.ET_element)).toprettyxml(indent="   ")
+            value = key(part.beam)
+            name = "unassigned" if value is None else re.sub(r"[^\w.-]", "_", str(value))
+            shards.setdefault(name, []).append(part)
+        return shards
+
+    def write_shards(self, directory, key, workers=None):
+        """Writes one BTLx file per shard along with a manifest indexing the shards.
+
+        Parameters
+        ----------
+        directory : str
+            The directory to write the files to. Created if it does not exist.
+        key : str | callable
+            The key by which the parts are grouped. See :meth:`BTLx.shards`.
+        workers : int, optional
+            The number of shards to write in parallel. Defaults to writing one after the other.
+
+        Returns
+        -------
+        dict
+            The manifest, which is also written to :attr:`BTLx.MANIFEST_NAME` in `directory`.
+
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        shards = self.shards(key)
+        # the elements are cached on the parts, create them upfront to keep the writers independent of each other
+        for parts in shards.values():
+            for part in parts:
+                _ = part.et_element
+        jobs = [(os.path.join(directory, name + ".btlx"), parts) for name, parts in shards.items()]
+        if workers and workers > 1 and not compas.IPY:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(lambda job: self.write(*job), jobs))
+        else:
+            for path, parts in jobs:
+                self.write(path, parts)
+
+        manifest = self.manifest(shards, key)
+        with io.open(os.path.join(directory, BTLx.MANIFEST_NAME), "w", encoding="utf-8") as f:
+            f.write("{}".format(json.dumps(manifest, indent=4)))
+        return manifest
+
+    def write_archive(self, path, key=None, compresslevel=9):
+        """Writes the BTLx document to a compressed archive.
+
+        The document is streamed into the archive part by part, it is never held in memory as a whole.
+        If `path` ends with ".gz", a single gzip compressed BTLx file is written.
+        Otherwise, a zip archive is written, which contains either the BTLx document or, if `key` is given,
+        one BTLx file per shard along with the manifest indexing them.
+
+        Parameters
+        ----------
+        path : str
+            The path of the archive.
+        key : str | callable, optional
+            If given, the parts are sharded by this key. See :meth:`BTLx.shards`.
+        compresslevel : int, optional
+            The compression level, between 0 (none) and 9 (highest). Defaults to 9.
+
+        Returns
+        -------
+        None
+
+        """
+        if path.endswith(".gz"):
+            if key is not None:
+                raise ValueError("Sharded export requires a zip archive, got: {}".format(path))
+            with io.TextIOWrapper(gzip.open(path, "wb", compresslevel), encoding="utf-8") as f:
+                self.write(f)
+            return
+
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as archive:
+            if key is None:
+                name = os.path.splitext(os.path.basename(path))[0]
+                if not name.endswith(".btlx"):
+                    name += ".btlx"
+                with io.TextIOWrapper(archive.open(name, "w"), encoding="utf-8") as f:
+                    self.write(f)
+                return
+
+            shards = self.shards(key)
+            for name, parts in shards.items():
+                with io.TextIOWrapper(archive.open(name + ".btlx", "w"), encoding="utf-8") as f:
+                    self.write(f, parts)
+            archive.writestr(BTLx.MANIFEST_NAME, json.dumps(self.manifest(shards, key), indent=4))
+
+    def manifest(self, shards, key):
+        """Returns the manifest indexing the given shards.
+
+        Parameters
+        ----------
+        shards : dict(str, list(:class:`~compas_timber.fabrication.BTLxPart`))
+            The shards, as returned by :meth:`BTLx.shards`.
+        key : str | callable
+            The key by which the parts were grouped.
+
+        Returns
+        -------
+        dict
+
+        """
+        return {
+            "project": BTLx.PROJECT_NAME,
+            "key": key if isinstance(key, str) else getattr(key, "__name__", str(key)),
+            "date": self.history["Date"],
+            "time": self.history["Time"],
+            "shards": [
+                {
+                    "name": name,
+                    "file": name + ".btlx",
+                    "part_count": len(parts),
+                    "parts": [part.part_guid for part in parts],
+                }
+                for name, parts in shards.items()
+            ],
+        }
 
     def process_model(self):
-        """Processes the model and generates BTLx parts."""
+        """Processes the model and generates BTLx parts.
+
+        By default, the processings are created by the factories registered for each joint type.
+        Features which were not created by joints (e.g. added by the user) are processed by the factory registered for their type, if any.
+
+        If `process_features` is True, all processings are derived from the features of each beam instead.
+        This way, cutting planes and volumes calculated by the joints are reused rather than re-calculated.
+        Joints whose features do not describe their machining, i.e. butt joints with a birdsmouth and joints
+        which add features without a registered feature factory, e.g. a :class:`~compas_timber.elements.MillVolume`,
+        are still processed by their joint factory.
+
+        Raises
+        ------
+        ValueError
+            If no factory is registered for a joint or a feature which has to be processed.
+
+        """
+        self.model.add_deferred_features()  # in model order, rather than in the order the beams are visited
+        self.model.resolve_joint_ends()  # only those joints whose ends are not up to date
         for index, beam in enumerate(self.model.beams):
             self.parts[str(beam.guid)] = BTLxPart(beam, order_num=index)
 
-        # TODO: it would be fantastic if instead of processing joints we'd process features..
+        if self.process_features:
+            processed = set()  # ids of the features covered by joint factories
+            for joint in self.joints:
+                if not self._requires_joint_factory(joint):
+                    continue
+                factory_type = self.REGISTERED_JOINTS.get(str(type(joint)))
+                if factory_type is None:
+                    raise ValueError(
+                        "Joint cannot be processed from its features and no joint factory found for joint: {}".format(
+                            type(joint)
+                        )
+                    )
+                factory_type.apply_processings(joint, self.parts)
+                processed.update(id(feature) for feature in joint.features)
+
+            for part in self.parts.values():
+                for feature in part.beam.features:
+                    if id(feature) in processed:
+                        continue
+                    factory_type = self.REGISTERED_FEATURES.get(str(type(feature)))
+                    if factory_type is None:
+                        raise ValueError("No feature factory found for feature: {}".format(type(feature)))
+                    factory_type.apply_processings(feature, part)
+            return
+
         for joint in self.joints:
             factory_type = self.REGISTERED_JOINTS.get(str(type(joint)))
             if factory_type is None:
                 raise ValueError("No joint factory found for joint: {}".format(type(joint)))
             factory_type.apply_processings(joint, self.parts)
 
+        for part in self.parts.values():
+            for feature in part.beam.features:
+                if feature.is_joinery:
+                    continue  # already covered by the joint factories
+                factory_type = self.REGISTERED_FEATURES.get(str(type(feature)))
+                if factory_type is not None:
+                    factory_type.apply_processings(feature, part)
+
+    @classmethod
+    def _requires_joint_factory(cls, joint):
+        # the features of these joints do not carry the parameters of their machining
+        if getattr(joint, "birdsmouth", False):
+            return True
+        return any(str(type(feature)) not in cls.REGISTERED_FEATURES for feature in joint.features)
+
     @classmethod
     def register_joint(cls, joint_type, joint_factory):
         """Registers a joint type and its corresponding factory.
@@ -115,6 +383,24 @@ class BTLx(object):
         """
         cls.REGISTERED_JOINTS[str(joint_type)] = joint_factory
 
+    @classmethod
+    def register_feature(cls, feature_type, feature_factory):
+        """Registers a feature type and its corresponding factory.
+
+        Parameters
+        ----------
+        feature_type : type
+            The type of the feature.
+        feature_factory : type
+            The factory which creates the processings for this feature type.
+
+        Returns
+        -------
+        None
+
+        """
+        cls.REGISTERED_FEATURES[str(feature_type)] = feature_factory
+
     @property
     def file_history(self):
         """Returns the file history element."""
@@ -174,6 +460,9 @@ class BTLxPart(object):
         self.blank_length = beam.blank_length
         self.processings = []
         self._et_element = None
+        self._shape_strings = None
+        self._reference_surfaces = None
+        self._reference_normals = None
 
     @property
     def part_guid(self):
@@ -182,30 +471,39 @@ class BTLxPart(object):
     @property
     def reference_surfaces(self):
         # TODO: align Beam.faces with this so that conversion is not needed
-        return (
-            Frame(self.frame.point, self.frame.xaxis, self.frame.zaxis),  #
-            Frame(
-                self.frame.point + self.frame.yaxis * self.width,
-                self.frame.xaxis,
-                -self.frame.yaxis,
-            ),
-            Frame(
-                self.frame.point + self.frame.yaxis * self.width + self.frame.zaxis * self.height,
-                self.frame.xaxis,
-                -self.frame.zaxis,
-            ),
-            Frame(
-                self.frame.point + self.frame.zaxis * self.height,
-                self.frame.xaxis,
-                self.frame.yaxis,
-            ),
-            Frame(self.frame.point, self.frame.zaxis, self.frame.yaxis),
-            Frame(
-                self.frame.point + self.frame.xaxis * self.blank_length + self.frame.yaxis * self.width,
-                self.frame.zaxis,
-                -self.frame.yaxis,
-            ),
-        )
+        if not self._reference_surfaces:
+            self._reference_surfaces = (
+                Frame(self.frame.point, self.frame.xaxis, self.frame.zaxis),  #
+                Frame(
+                    self.frame.point + self.frame.yaxis * self.width,
+                    self.frame.xaxis,
+                    -self.frame.yaxis,
+                ),
+                Frame(
+                    self.frame.point + self.frame.yaxis * self.width + self.frame.zaxis * self.height,
+                    self.frame.xaxis,
+                    -self.frame.zaxis,
+                ),
+                Frame(
+                    self.frame.point + self.frame.zaxis * self.height,
+                    self.frame.xaxis,
+                    self.frame.yaxis,
+                ),
+                Frame(self.frame.point, self.frame.zaxis, self.frame.yaxis),
+                Frame(
+                    self.frame.point + self.frame.xaxis * self.blank_length + self.frame.yaxis * self.width,
+                    self.frame.zaxis,
+                    -self.frame.yaxis,
+                ),
+            )
+        return self._reference_surfaces
+
+    @property
+    def reference_normals(self):
+        """The normals of the six reference surfaces as rows of a 6x3 matrix (list of tuples)."""
+        if not self._reference_normals:
+            self._reference_normals = [tuple(surface.normal) for surface in self.reference_surfaces]
+        return self._reference_normals
 
     def ref_side_from_face(self, beam_face):
         """Finds the one-based index of the reference side with normal that matches the normal of the given beam face.
@@ -223,11 +521,36 @@ class BTLxPart(object):
             The key(index 1-6) of the reference surface.
 
         """
-        for index, ref_face in enumerate(self.reference_surfaces):
-            angle = angle_vectors(ref_face.normal, beam_face.normal, deg=True)
-            if TOL.is_zero(angle):
-                return index + 1  # in BTLx face indices are one-based
-        raise ValueError("Given beam face does not match any of the reference surfaces.")
+        x, y, z = beam_face.normal
+        dots = [x * nx + y * ny + z * nz for nx, ny, nz in self.reference_normals]
+        index = max(range(len(dots)), key=dots.__getitem__)
+        if not TOL.is_close(dots[index], 1.0):
+            raise ValueError("Given beam face does not match any of the reference surfaces.")
+        return index + 1  # in BTLx face indices are one-based
+
+    def ref_sides_from_faces(self, beam_faces):
+        """Finds the one-based indices of the reference sides matching each of the given beam faces.
+
+        Parameters
+        -----------
+        beam_faces : list(:class:`~compas.geometry.Frame`)
+            Frames of beam faces from beam.faces.
+
+        Returns
+        --------
+        list(int)
+            The keys(index 1-6) of the reference surfaces, in the order of `beam_faces`.
+
+        """
+        # the dot products of all face normals with all reference normals, as one (n x 3) x (3 x 6) product
+        dots = multiply_matrices([list(face.normal) for face in beam_faces], transpose_matrix(self.reference_normals))
+        sides = []
+        for row in dots:
+            index = max(range(len(row)), key=row.__getitem__)
+            if not TOL.is_close(row[index], 1.0):
+                raise ValueError("Given beam face does not match any of the reference surfaces.")
+            sides.append(index + 1)  # in BTLx face indices are one-based
+        return sides
 
     @property
     def attr(self):
@@ -289,7 +612,6 @@ class BTLxPart(object):
     def et_element(self):
         if not self._et_element:
             self._et_element = ET.Element("Part", self.attr)
-            self._shape_strings = None
             self._et_element.append(self.et_transformations)
             self._et_element.append(ET.Element("GrainDirection", X="1", Y="0", Z="0", Align="no"))
             self._et_element.append(ET.Element("ReferenceSide", Side="1", Align="no"))
@@ -315,46 +637,64 @@ class BTLxPart(object):
     @property
     def et_shape(self):
         shape = ET.Element("Shape")
-        indexed_face_set = ET.SubElement(shape, "IndexedFaceSet", convex="true", coordIndex="")
-        indexed_face_set.set("coordIndex", " ")
-        indexed_face_set.append(ET.Element("Coordinate"))
-        # indexed_face_set.set("coordIndex", self.shape_strings[0])
-        # indexed_face_set.append(ET.Element("Coordinate", point=self.shape_strings[1]))
+        coord_index, points = self.shape_strings
+        indexed_face_set = ET.SubElement(shape, "IndexedFaceSet", convex="true", coordIndex=coord_index)
+        indexed_face_set.append(ET.Element("Coordinate", point=points))
         return shape
 
     @property
     def shape_strings(self):
+        """Returns the coordinate indices and the vertex coordinates of the part's shape as BTLx formatted strings.
+
+        The vertices are expressed in the coordinate system of the part (:attr:`BTLxPart.frame`).
+        Vertices which coincide at :attr:`BTLx.POINT_PRECISION` are merged. Each face in the indices string is terminated with `-1`.
+
+        Returns
+        -------
+        list(str, str)
+            The `coordIndex` and `point` strings of the `IndexedFaceSet`.
+
+        """
         if not self._shape_strings:
-            brep_vertex_points = []
-            brep_indices = []
-            try:
-                for face in self.beam.geometry.faces:
-                    for loop in face.loops:
-                        for vertex in loop.vertices:
-                            if brep_vertex_points.contains(vertex.point):
-                                brep_indices.append(brep_vertex_points.index(vertex.point))
-                            else:
-                                brep_vertex_points.append(vertex.point)
-                                brep_indices.append(len(brep_vertex_points))
-
-                brep_indices.append(-1)
-                brep_indices.pop(-1)
-            except NotImplementedError:
-                print("brep.face.loop.vertices not implemented")
-            brep_indices_string = " "
-            for index in brep_indices:
-                brep_indices_string += str(index) + " "
-
-            brep_vertices_string = " "
-            for point in brep_vertex_points:
-                xform = Transformation.from_frame_to_frame(self.frame, Frame((0, 0, 0), (1, 0, 0), (0, 1, 0)))
-                point.transform(xform)
-                brep_vertices_string += "{:.{prec}f} {:.{prec}f} {:.{prec}f} ".format(
-                    point.x, point.y, point.z, prec=BTLx.POINT_PRECISION
-                )
-            self._shape_strings = [brep_indices_string, brep_vertices_string]
+            vertices, faces = self._shape_vertices_and_faces()
+            xform = Transformation.from_frame_to_frame(self.frame, Frame.worldXY())
+            vertices = transform_points(vertices, xform)
+
+            # vertices are merged by their formatted coordinates, which is also what ends up in the file
+            vertex_index = {}
+            vertex_strings = []
+            index_map = []
+            for vertex in vertices:
+                vertex_string = " ".join(
+                    "{:.{prec}f}".format(round(value, BTLx.POINT_PRECISION) + 0.0, prec=BTLx.POINT_PRECISION)
+                    for value in vertex
+                )  # + 0.0 gets rid of negative zeros
+                index = vertex_index.get(vertex_string)
+                if index is None:
+                    index = vertex_index[vertex_string] = len(vertex_strings)
+                    vertex_strings.append(vertex_string)
+                index_map.append(index)
+
+            face_strings = []
+            for face in faces:
+                face_strings.append(" ".join(str(index_map[vertex]) for vertex in face) + " -1")
+            self._shape_strings = [" ".join(face_strings), " ".join(vertex_strings)]
         return self._shape_strings
 
+    def _shape_vertices_and_faces(self):
+        """Returns the vertices and faces of the tessellated beam geometry.
+
+        Falls back to the feature-less blank of the beam when no Brep backend is available.
+
+        """
+        try:
+            tesselation = self.beam.geometry.to_tesselation()
+        except (PluginNotInstalledError, NotImplementedError):
+            return self.beam.blank.to_vertices_and_faces()
+        if isinstance(tesselation, tuple):  # some backends return the face boundaries as well
+            tesselation = tesselation[0]
+        return tesselation.to_vertices_and_faces()
+
 
 class BTLxProcess(object):
     """Generic class for BTLx processings.
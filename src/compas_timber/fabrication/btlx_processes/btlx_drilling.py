@@ -0,0 +1,120 @@
+import math
+from collections import OrderedDict
+
+from compas.geometry import Plane
+from compas.geometry import Vector
+from compas.geometry import angle_vectors_signed
+from compas.geometry import dot_vectors
+
+from compas_timber.fabrication import BTLx
+from compas_timber.fabrication import BTLxProcess
+from compas_timber.utils.compas_extra import intersection_line_plane
+
+
+class BTLxDrilling(object):
+    """
+    Represents a drilling process for timber fabrication.
+
+    The drill enters the part through the reference side whose normal is most opposed to the drill direction.
+
+    Parameters
+    ----------
+    part : :class:`~compas_timber.fabrication.btlx_part.BTLxPart`
+        The BTLxPart object representing the beam.
+    line : :class:`~compas.geometry.Line`
+        The axis of the drill hole, pointing in drilling direction.
+    diameter : float
+        The diameter of the drill hole.
+    length : float
+        The length of the drill hole, measured from the start of `line`.
+    joint_name : str, optional
+        The name of the joint. Defaults to None.
+
+    """
+
+    PROCESS_TYPE = "Drilling"
+
+    def __init__(self, part, line, diameter, length, joint_name=None):
+        self.part = part
+        self.line = line
+        self.diameter = diameter
+        self.length = length
+        self.apply_process = True
+        self.generate_process()
+        if joint_name:
+            self.name = joint_name
+        else:
+            self.name = "drilling"
+
+    @property
+    def header_attributes(self):
+        """the following attributes are required for all processes, but the keys and values of header_attributes are process specific."""
+        return {
+            "Name": self.name,
+            "Process": "yes",
+            "Priority": "0",
+            "ProcessID": "0",
+            "ReferencePlaneID": str(self.reference_plane_id),
+        }
+
+    @property
+    def process_params(self):
+        """This property is required for all process types. It returns a dict with the geometric parameters to fabricate the joint."""
+
+        if self.apply_process:
+            """the following attributes are specific to Drilling"""
+            od = OrderedDict(
+                [
+                    ("StartX", "{:.{prec}f}".format(self.start_x, prec=BTLx.POINT_PRECISION)),
+                    ("StartY", "{:.{prec}f}".format(self.start_y, prec=BTLx.POINT_PRECISION)),
+                    ("Angle", "{:.{prec}f}".format(self.angle, prec=BTLx.ANGLE_PRECISION)),
+                    ("Inclination", "{:.{prec}f}".format(self.inclination, prec=BTLx.ANGLE_PRECISION)),
+                    ("DepthLimited", self.depth_limited),
+                    ("Depth", "{:.{prec}f}".format(self.depth, prec=BTLx.POINT_PRECISION)),
+                    ("Diameter", "{:.{prec}f}".format(self.diameter, prec=BTLx.POINT_PRECISION)),
+                ]
+            )
+            return od
+        else:
+            return None
+
+    def generate_process(self):
+        """This is an internal method to generate process parameters"""
+        direction = Vector(*self.line.direction)
+        surfaces = self.part.reference_surfaces
+
+        # the drill enters through the side whose (outward) normal points against it and exits through the opposite one
+        dots = [dot_vectors(direction, surface.normal) for surface in surfaces]
+        entry_index = min(range(len(surfaces)), key=dots.__getitem__)
+        exit_index = max(range(len(surfaces)), key=dots.__getitem__)
+        self.reference_plane_id = entry_index + 1  # in BTLx face indices are one-based
+        ref_side = surfaces[entry_index]
+
+        entry_point, entry_t = intersection_line_plane(self.line, Plane.from_frame(ref_side))
+        _, exit_t = intersection_line_plane(self.line, Plane.from_frame(surfaces[exit_index]))
+        line_length = self.line.length
+        entry_distance = entry_t * line_length
+        exit_distance = exit_t * line_length
+
+        local = entry_point - ref_side.point
+        self.start_x = dot_vectors(local, ref_side.xaxis)
+        self.start_y = dot_vectors(local, ref_side.yaxis)
+
+        projected = direction - ref_side.normal * dot_vectors(direction, ref_side.normal)
+        if projected.length < 1e-9:
+            self.angle = 0.0  # perpendicular to the reference side, angle is arbitrary
+        else:
+            self.angle = math.degrees(angle_vectors_signed(ref_side.xaxis, projected, ref_side.normal)) % 360.0
+        self.inclination = math.degrees(math.asin(min(1.0, abs(dots[entry_index]))))
+
+        if self.length >= exit_distance:
+            self.depth_limited = "no"
+            self.depth = exit_distance - entry_distance
+        else:
+            self.depth_limited = "yes"
+            self.depth = self.length - entry_distance
+
+    @classmethod
+    def create_process(cls, part, line, diameter, length, joint_name=None):
+        drilling = BTLxDrilling(part, line, diameter, length, joint_name)
+        return BTLxProcess(BTLxDrilling.PROCESS_TYPE, drilling.header_attributes, drilling.process_params)
@@ -0,0 +1,31 @@
+from compas_timber.elements import CutFeature
+from compas_timber.fabrication import BTLx
+from compas_timber.fabrication import BTLxJackCut
+
+
+class CutFeatureFactory(object):
+    """Factory class for creating processings from cut features."""
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def apply_processings(cls, feature, part):
+        """Apply a jack cut along the cutting plane of the feature to the part.
+
+        Parameters
+        ----------
+        feature : :class:`~compas_timber.elements.CutFeature`
+            The feature object.
+        part : :class:`~compas_timber.fabrication.BTLxPart`
+            The BTLxPart of the beam this feature belongs to.
+
+        Returns
+        -------
+        None
+
+        """
+        part.processings.append(BTLxJackCut.create_process(part, feature.cutting_plane))
+
+
+BTLx.register_feature(CutFeature, CutFeatureFactory)
@@ -0,0 +1,31 @@
+from compas_timber.elements import DrillFeature
+from compas_timber.fabrication import BTLx
+from compas_timber.fabrication import BTLxDrilling
+
+
+class DrillFeatureFactory(object):
+    """Factory class for creating processings from drill features."""
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def apply_processings(cls, feature, part):
+        """Apply a drilling along the line of the feature to the part.
+
+        Parameters
+        ----------
+        feature : :class:`~compas_timber.elements.DrillFeature`
+            The feature object.
+        part : :class:`~compas_timber.fabrication.BTLxPart`
+            The BTLxPart of the beam this feature belongs to.
+
+        Returns
+        -------
+        None
+
+        """
+        part.processings.append(BTLxDrilling.create_process(part, feature.line, feature.diameter, feature.length))
+
+
+BTLx.register_feature(DrillFeature, DrillFeatureFactory)
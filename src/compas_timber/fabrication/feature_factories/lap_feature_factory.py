@@ -0,0 +1,33 @@
+from compas_timber.elements import LapFeature
+from compas_timber.fabrication import BTLx
+from compas_timber.fabrication import BTLxLap
+
+
+class LapFeatureFactory(object):
+    """Factory class for creating processings from lap features."""
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def apply_processings(cls, feature, part):
+        """Apply a lap described by the parameters of the feature to the part.
+
+        Parameters
+        ----------
+        feature : :class:`~compas_timber.elements.LapFeature`
+            The feature object.
+        part : :class:`~compas_timber.fabrication.BTLxPart`
+            The BTLxPart of the beam this feature belongs to.
+
+        Returns
+        -------
+        None
+
+        """
+        params = dict(feature.btlx_params)
+        params["reference_plane_id"] = part.ref_side_from_face(feature.ref_face)
+        part.processings.append(BTLxLap.create_process(params))
+
+
+BTLx.register_feature(LapFeature, LapFeatureFactory)
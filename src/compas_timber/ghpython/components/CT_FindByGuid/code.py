@@ -3,17 +3,22 @@ from Grasshopper.Kernel.GH_RuntimeMessageLevel import Warning
 
 
 class FindBeamByRhinoGuid(component):
-    def RunScript(self, beams, Guid):
-        if not (beams and Guid):
+    def RunScript(self, beams, Guid, Model):
+        if not ((beams or Model) and Guid):
             return
 
         if not isinstance(Guid, list):
             Guid = [Guid]
-        Guid = [str(g) for g in Guid]
         FoundBeam = []
-        for beam in beams:
-            if beam.attributes.get("rhino_guid", None) in Guid:
-                FoundBeam.append(beam)
+        if Model:
+            # the index of the model finds the beams without scanning all of them
+            for guid in Guid:
+                FoundBeam.extend(Model.beams_by_attribute("rhino_guid", str(guid)))
+        else:
+            Guid = set(str(g) for g in Guid)
+            for beam in beams:
+                if beam.attributes.get("rhino_guid", None) in Guid:
+                    FoundBeam.append(beam)
 
         if not FoundBeam:
             self.AddRuntimeMessage(Warning, "No beams found!")
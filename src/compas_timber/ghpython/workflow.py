@@ -1,5 +1,12 @@
 from compas_timber.connections import LMiterJoint
 from compas_timber.connections import TButtJoint
+from compas_timber.design import CategoryRule  # noqa: F401
+from compas_timber.design import DebugInfomation  # noqa: F401
+from compas_timber.design import DirectRule  # noqa: F401
+from compas_timber.design import FeatureDefinition  # noqa: F401
+from compas_timber.design import JointDefinition  # noqa: F401
+from compas_timber.design import JointRule  # noqa: F401
+from compas_timber.design import TopologyRule  # noqa: F401
 from compas_timber.utils.compas_extra import intersection_line_line_3D
 
 
@@ -19,179 +26,6 @@ class CollectionDef(object):
         return "Collection with %s items." % len(self.objs)
 
 
-class JointRule(object):
-    def comply(self, beams):
-        """Returns True if the provided beams comply with the rule defined by this instance. False otherwise.
-
-        Parameters
-        ----------
-        beams : list(:class:`~compas_timber.parts.Beam`)
-
-        Returns
-        -------
-        bool
-
-        """
-        raise NotImplementedError
-
-
-class DirectRule(JointRule):
-    """Creates a Joint Rule that directly joins two beams."""
-
-    def __init__(self, joint_type, beams, **kwargs):
-        self.beams = beams
-        self.joint_type = joint_type
-        self.kwargs = kwargs
-
-    def ToString(self):
-        # GH doesn't know
-        return repr(self)
-
-    def __repr__(self):
-        return "{}({}, {})".format(DirectRule, self.beams, self.joint_type)
-
-    def comply(self, beams):
-        try:
-            return set(self.beams) == set(beams)
-        except TypeError:
-            print("unable to comply direct joint beam sets")
-            return False
-
-
-class CategoryRule(JointRule):
-    """Based on the category attribute attached to the beams, this rule assigns"""
-
-    def __init__(self, joint_type, category_a, category_b, topos=None, **kwargs):
-        self.joint_type = joint_type
-        self.category_a = category_a
-        self.category_b = category_b
-        self.topos = topos or []
-        self.kwargs = kwargs
-
-    def ToString(self):
-        # GH doesn't know
-        return repr(self)
-
-    def __repr__(self):
-        return "{}({}, {}, {}, {})".format(
-            CategoryRule.__name__, self.joint_type.__name__, self.category_a, self.category_b, self.topos
-        )
-
-    def comply(self, beams):
-        try:
-            beam_cats = set([b.attributes["category"] for b in beams])
-            return beam_cats == set([self.category_a, self.category_b])
-        except KeyError:
-            return False
-
-    def reorder(self, beams):
-        """Returns the given beams in a sorted order.
-
-        The beams are sorted according to their category attribute, first the beams with `catergory_a` and second the
-        one with `category_b`.
-        This allows using the category to determine the role of the beams.
-
-        Parameters
-        ----------
-        beams : tuple(:class:`~compas_timber.parts.Beam`, :class:`~compas_timber.parts.Beam`)
-            A tuple containing two beams to sort.
-
-        Returns
-        -------
-        tuple(:class:`~compas_timber.parts.Beam`, :class:`~compas_timber.parts.Beam`)
-
-        """
-        beam_a, beam_b = beams
-        if beam_a.attributes["category"] == self.category_a:
-            return beam_a, beam_b
-        else:
-            return beam_b, beam_a
-
-
-class TopologyRule(JointRule):
-    """for a given connection topology type (L,T,X,I,K...), this rule assigns a joint type.
-
-    parameters
-    ----------
-    topology_type : constant(compas_timber.connections.JointTopology)
-        The topology type to which the rule is applied.
-    joint_type : cls(:class:`compas_timber.connections.Joint`)
-        The joint type to be applied to this topology.
-    kwargs : dict
-        The keyword arguments to be passed to the joint.
-    """
-
-    def __init__(self, topology_type, joint_type, **kwargs):
-        self.topology_type = topology_type
-        self.joint_type = joint_type
-        self.kwargs = kwargs
-
-    def ToString(self):
-        # GH doesn't know
-        return repr(self)
-
-    def __repr__(self):
-        return "{}({}, {})".format(TopologyRule, self.topology_type, self.joint_type)
-
-
-class JointDefinition(object):
-    """Container for a joint type and the beam that shall be joined.
-
-    This allows delaying the actual joining of the beams to a downstream component.
-
-    """
-
-    def __init__(self, joint_type, beams, **kwargs):
-        # if not issubclass(joint_type, Joint):
-        #     raise UserWarning("{} is not a valid Joint type!".format(joint_type.__name__))
-        if len(beams) != 2:
-            raise UserWarning("Expected to get two Beams, got {}.".format(len(beams)))
-
-        self.joint_type = joint_type
-        self.beams = beams
-        self.kwargs = kwargs
-
-    def __repr__(self):
-        return "{}({}, {}, {})".format(JointDefinition.__name__, self.joint_type.__name__, self.beams, self.kwargs)
-
-    def ToString(self):
-        return repr(self)
-
-    def __hash__(self):
-        return hash((self.joint_type, self.beams))
-
-    def is_identical(self, other):
-        return (
-            isinstance(other, JointDefinition)
-            and self.joint_type == other.joint_type
-            and set([b.key for b in self.beams]) == set([b.key for b in other.beams])
-        )
-
-    def match(self, beams):
-        """Returns True if beams are defined within this JointDefinition."""
-        set_a = set([id(b) for b in beams])
-        set_b = set([id(b) for b in self.beams])
-        return set_a == set_b
-
-
-class FeatureDefinition(object):
-    """Container linking a feature for the beams on which it should be applied.
-
-    This allows delaying the actual applying of features to a downstream component.
-
-    """
-
-    def __init__(self, feature, beams):
-        self.feature = feature
-        self.beams = beams
-
-    def __repr__(self):
-        return "{}({}, {})".format(FeatureDefinition.__name__, repr(self.feature), self.beams)
-
-    def ToString(self):
-        return repr(self)
-
-
 class Attribute:
     def __init__(self, attr_name, attr_value):
         self.name = attr_name
@@ -259,46 +93,3 @@ def set_defaul_joints(model, x_default="x-lap", t_default="t-butt", l_default="l
 
     for beamA, beamB in connectivity["X"]:
         pass
-
-
-class DebugInfomation(object):
-    """Container for debugging information allowing visual inspection of joint and features related errors.
-
-    Attributes
-    ----------
-    feature_errors : list(:class:`~compas_timber.consumers.FeatureApplicationError`)
-        List of errors that occured during the application of features.
-    joint_errors : list(:class:`~compas_timber.connections.BeamJoiningError`)
-        List of errors that occured during the joining of beams.
-
-    See Also
-    --------
-    :class:`~compas_timber.consumers.FeatureApplicationError`
-    :class:`~compas_timber.connections.BeamJoiningError`
-
-    """
-
-    def __init__(self):
-        self.feature_errors = []
-        self.joint_errors = []
-
-    def __repr__(self):
-        return "{}({} feature errors, {} joining errors)".format(
-            DebugInfomation.__name__, len(self.feature_errors), len(self.joint_errors)
-        )
-
-    def ToString(self):
-        return repr(self)
-
-    @property
-    def has_errors(self):
-        return self.feature_errors or self.joint_errors
-
-    def add_feature_error(self, error):
-        if isinstance(error, list):
-            self.feature_errors.extend(error)
-        else:
-            self.feature_errors.append(error)
-
-    def add_joint_error(self, error):
-        self.joint_errors.append(error)
@@ -1,3 +1,8 @@
 from .model import TimberModel
+from .store import ModelStore
+from .diff import ModelDelta
+from .journal import ChangeJournal
+from .journal import ChangeRecord
+from .partition import ModelPartition
 
-__all__ = ["TimberModel"]
+__all__ = ["TimberModel", "ModelStore", "ModelDelta", "ChangeJournal", "ChangeRecord", "ModelPartition"]
@@ -0,0 +1,199 @@
+"""Compact binary representation of :class:`~compas_timber.model.TimberModel`.
+
+The container starts with a magic number and a format version, followed by length-prefixed sections:
+
+* ``order``: one byte per element of the model, 0 for a beam and 1 for a wall.
+* ``beam_guids``: the 16 bytes of the GUID of each beam.
+* ``beams``: 12 little-endian doubles per beam: the frame's point, x-axis and y-axis, the length, width and height.
+* ``beam_meta``: JSON list of the name, attributes and transformation of each beam.
+* ``blank_extensions``: 3 little-endian doubles per blank extension: the index of its beam, its start and its end.
+* ``blank_extension_keys``: JSON list of the key of each blank extension.
+* ``walls``: JSON list of the walls.
+* ``joints``: JSON table of the indices of the two joined beams and the joint.
+* ``features``: JSON table of the index of a beam and a feature which was not added by a joint.
+* ``joinery``: only if :attr:`~compas_timber.model.TimberModel.persist_joinery` is set, JSON of all the features
+  and blank extensions of the beams, which are then restored instead of being re-calculated.
+
+Otherwise, the features and blank extensions of the joints are not stored, they are deferred and re-calculated on
+demand as with JSON. The blank extensions which were not added by a joint of the model are stored in their own
+sections then.
+
+"""
+
+import struct
+import uuid
+
+from compas.data import json_dumps
+from compas.data import json_loads
+
+from compas_timber.elements import Beam
+from compas_timber.elements import Wall
+
+from .packing import extension_key
+from .packing import frame_from_values
+from .packing import pack_doubles
+from .packing import unpack_doubles
+
+MAGIC = b"CTMB"
+VERSION = 1
+BEAM_STRIDE = 12
+
+_BEAM = 0
+_WALL = 1
+
+
+def _write_sections(sections):
+    chunks = [MAGIC, struct.pack("<I", VERSION)]
+    for name, data in sections:
+        name = name.encode("utf-8")
+        chunks.append(struct.pack("<I", len(name)))
+        chunks.append(name)
+        chunks.append(struct.pack("<Q", len(data)))
+        chunks.append(data)
+    return b"".join(chunks)
+
+
+def _read_sections(data):
+    if data[:4] != MAGIC:
+        raise ValueError("Not a binary timber model.")
+    (version,) = struct.unpack_from("<I", data, 4)
+    if version > VERSION:
+        raise ValueError("Unsupported binary timber model version: {}".format(version))
+    sections = {}
+    offset = 8
+    while offset < len(data):
+        (name_length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        name = data[offset : offset + name_length].decode("utf-8")
+        offset += name_length
+        (data_length,) = struct.unpack_from("<Q", data, offset)
+        offset += 8
+        sections[name] = data[offset : offset + data_length]
+        offset += data_length
+    return sections
+
+
+def model_to_bytes(model):
+    """Returns the binary representation of the given timber model.
+
+    Parameters
+    ----------
+    model : :class:`~compas_timber.model.TimberModel`
+        The model.
+
+    Returns
+    -------
+    bytes
+
+    """
+    order = []
+    beams = []
+    walls = []
+    for element in model.elements():
+        if isinstance(element, Beam):
+            order.append(_BEAM)
+            beams.append(element)
+        elif isinstance(element, Wall):
+            order.append(_WALL)
+            walls.append(element)
+        else:
+            raise ValueError("Unsupported element type: {}".format(type(element).__name__))
+
+    values = []
+    for beam in beams:
+        frame = beam.frame
+        values.extend(frame.point)
+        values.extend(frame.xaxis)
+        values.extend(frame.yaxis)
+        values.extend((beam.length, beam.width, beam.height))
+
+    indices = {id(beam): index for index, beam in enumerate(beams)}
+    joints = [[indices[id(beam)] for beam in joint.beams] + [joint] for joint in model.joints]
+    features = []
+    extensions = []
+    extension_keys = []
+    if not model.persist_joinery:
+        joint_keys = set(joint.guid for joint in model.joints)
+        for index, beam in enumerate(beams):
+            # features of joints are re-calculated, no need to materialize the deferred ones
+            features.extend([index, feature] for feature in beam._features if not feature.is_joinery)
+            for key, (start, end) in beam._blank_extensions.items():
+                if key not in joint_keys:
+                    extensions.extend((index, start, end))
+                    extension_keys.append(None if key is None else str(key))
+    meta = [[beam._name, beam._attributes, beam.transformation] for beam in beams]
+
+    sections = [
+        ("order", bytearray(order)),
+        ("beam_guids", b"".join(beam.guid.bytes for beam in beams)),
+        ("beams", pack_doubles(values)),
+        ("beam_meta", json_dumps(meta).encode("utf-8")),
+        ("blank_extensions", pack_doubles(extensions)),
+        ("blank_extension_keys", json_dumps(extension_keys).encode("utf-8")),
+        ("walls", json_dumps(walls).encode("utf-8")),
+        ("joints", json_dumps(joints).encode("utf-8")),
+        ("features", json_dumps(features).encode("utf-8")),
+    ]
+    if model.persist_joinery:
+        sections.append(("joinery", json_dumps(model._joinery_data()).encode("utf-8")))
+    return _write_sections(sections)
+
+
+def model_from_bytes(data, cls):
+    """Creates a timber model from its binary representation.
+
+    Parameters
+    ----------
+    data : bytes
+        The binary representation, see :func:`model_to_bytes`.
+    cls : type
+        The type of the model, :class:`~compas_timber.model.TimberModel` or a sub-class of it.
+
+    Returns
+    -------
+    :class:`~compas_timber.model.TimberModel`
+
+    """
+    sections = _read_sections(data)
+    values = unpack_doubles(sections["beams"])
+    guids = sections["beam_guids"]
+    meta = json_loads(sections["beam_meta"].decode("utf-8"))
+
+    beams = []
+    for index, (name, attributes, transformation) in enumerate(meta):
+        v = values[index * BEAM_STRIDE : (index + 1) * BEAM_STRIDE]
+        beam = Beam(frame_from_values(v), v[9], v[10], v[11])
+        beam._guid = uuid.UUID(bytes=bytes(guids[index * 16 : (index + 1) * 16]))
+        beam._name = name
+        beam.attributes = attributes
+        beam.transformation = transformation
+        beams.append(beam)
+    for index, feature in json_loads(sections["features"].decode("utf-8")):
+        beams[index].add_features(feature)
+    extensions = unpack_doubles(sections["blank_extensions"])
+    keys = json_loads(sections["blank_extension_keys"].decode("utf-8"))
+    for i, key in enumerate(keys):
+        beams[int(extensions[i * 3])].add_blank_extension(
+            extensions[i * 3 + 1], extensions[i * 3 + 2], extension_key(key)
+        )
+
+    model = cls()
+    walls = iter(json_loads(sections["walls"].decode("utf-8")))
+    beams_iter = iter(beams)
+    for kind in bytearray(sections["order"]):
+        if kind == _BEAM:
+            model.add_beam(next(beams_iter))
+        else:
+            model.add_wall(next(walls))
+
+    for index_a, index_b, joint in json_loads(sections["joints"].decode("utf-8")):
+        model.add_joint(joint, (beams[index_a], beams[index_b]))
+        joint.restore_beams_from_keys(model)
+
+    if "joinery" in sections:
+        model.persist_joinery = True
+        model._restore_joinery(json_loads(sections["joinery"].decode("utf-8")))
+    else:
+        for joint in model.joints:
+            joint.defer_features()
+    return model
@@ -0,0 +1,321 @@
+import hashlib
+import uuid
+
+from compas.data import Data
+from compas.data import json_dumps
+from compas.data import json_loads
+
+from compas_timber.elements import Beam
+
+
+def _hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def beam_fingerprint(beam, precision=6):
+    """Returns a hash of the geometry, name and attributes of the given beam.
+
+    The coordinates and dimensions are rounded to `precision` digits,
+    hence beams which differ by less than that have the same fingerprint.
+
+    Parameters
+    ----------
+    beam : :class:`~compas_timber.elements.Beam`
+    precision : int, optional
+        The number of digits of the coordinates and dimensions. Defaults to 6.
+
+    Returns
+    -------
+    str
+
+    """
+    frame = beam.frame
+    values = list(frame.point) + list(frame.xaxis) + list(frame.yaxis) + [beam.length, beam.width, beam.height]
+    geometry = ",".join("{:.{prec}f}".format(value, prec=precision) for value in values)
+    attributes = sorted(beam._attributes.items())
+    return _hash("{}|{}|{}".format(geometry, beam.name, json_dumps(attributes, minimal=True)))
+
+
+def joint_fingerprint(joint):
+    """Returns a hash of the type and the parameters of the given joint.
+
+    Parameters
+    ----------
+    joint : :class:`~compas_timber.connections.Joint`
+
+    Returns
+    -------
+    str
+
+    """
+    return _hash(json_dumps([type(joint).__name__, joint.__data__], minimal=True))
+
+
+def feature_fingerprint(feature):
+    """Returns a hash of the type and the parameters of the given feature.
+
+    Parameters
+    ----------
+    feature : :class:`~compas_timber.elements.Feature`
+
+    Returns
+    -------
+    str
+
+    """
+    return _hash(json_dumps(feature, minimal=True))
+
+
+def _joint_keys(joints):
+    """Returns the joints by the pair of GUIDs of their beams, their type name and their index among the joints of
+    that type between the same beams, in the order the joints were added."""
+    keyed = {}
+    counts = {}
+    for joint in joints:
+        pair_type = (frozenset(str(beam.guid) for beam in joint.beams), type(joint).__name__)
+        index = counts.get(pair_type, 0)
+        counts[pair_type] = index + 1
+        keyed[pair_type + (index,)] = joint
+    return keyed
+
+
+def _joint_ref(key):
+    pair, type_name, index = key
+    return {"beams": sorted(pair), "type": type_name, "index": index}
+
+
+def _ref_key(ref):
+    return frozenset(ref["beams"]), ref["type"], ref["index"]
+
+
+def _joint_state(key, joint):
+    state = _joint_ref(key)
+    state["beams"] = [str(beam.guid) for beam in joint.beams]
+    state["joint"] = joint
+    return state
+
+
+def _beam_state(beam):
+    return {
+        "guid": str(beam.guid),
+        "frame": beam.frame,
+        "length": beam.length,
+        "width": beam.width,
+        "height": beam.height,
+        "name": beam._name,
+        "attributes": beam._attributes,
+    }
+
+
+class ModelDelta(Data):
+    """The differences between two revisions of a timber model, as returned by :meth:`TimberModel.diff`.
+
+    Beams are identified by their GUID. Joints are identified by the GUIDs of the pair of beams they join, their type
+    and their index among the joints of that type between the same beams, so that several joints of a pair of beams
+    are told apart. A joint which changes type is thus removed and added.
+    Only features which were not added by joints are compared, the joinery follows the beams and joints.
+    A delta serializes to JSON, with copies of the added and modified beams, joints and features.
+
+    Parameters
+    ----------
+    added_beams : list(dict), optional
+    removed_beams : list(str), optional
+    modified_beams : list(dict), optional
+    added_joints : list(dict), optional
+    removed_joints : list(dict), optional
+    modified_joints : list(dict), optional
+    added_features : dict(str, list(:class:`~compas_timber.elements.Feature`)), optional
+    removed_features : dict(str, list(str)), optional
+
+    Attributes
+    ----------
+    added_beams : list(dict)
+        The state (GUID, frame, dimensions, name and attributes) of the beams which were added.
+    removed_beams : list(str)
+        The GUIDs of the beams which were removed.
+    modified_beams : list(dict)
+        The new state of the beams whose fingerprint has changed.
+    added_joints : list(dict)
+        The GUIDs of the "beams", the "type", the "index" and the "joint" of the joints which were added.
+    removed_joints : list(dict)
+        The sorted GUIDs of the "beams", the "type" and the "index" of the joints which were removed.
+    modified_joints : list(dict)
+        The GUIDs of the "beams", the "type", the "index" and the new "joint" of the joints whose parameters have
+        changed.
+    added_features : dict(str, list(:class:`~compas_timber.elements.Feature`))
+        The features added to each beam, by beam GUID.
+    removed_features : dict(str, list(str))
+        The fingerprints of the features removed from each beam, by beam GUID.
+    is_empty : bool
+        True if the two revisions do not differ.
+
+    """
+
+    @property
+    def __data__(self):
+        return {
+            "added_beams": self.added_beams,
+            "removed_beams": self.removed_beams,
+            "modified_beams": self.modified_beams,
+            "added_joints": self.added_joints,
+            "removed_joints": self.removed_joints,
+            "modified_joints": self.modified_joints,
+            "added_features": self.added_features,
+            "removed_features": self.removed_features,
+        }
+
+    def __init__(
+        self,
+        added_beams=None,
+        removed_beams=None,
+        modified_beams=None,
+        added_joints=None,
+        removed_joints=None,
+        modified_joints=None,
+        added_features=None,
+        removed_features=None,
+        **kwargs
+    ):
+        super(ModelDelta, self).__init__(**kwargs)
+        self.added_beams = added_beams or []
+        self.removed_beams = removed_beams or []
+        self.modified_beams = modified_beams or []
+        self.added_joints = added_joints or []
+        self.removed_joints = removed_joints or []
+        self.modified_joints = modified_joints or []
+        self.added_features = added_features or {}
+        self.removed_features = removed_features or {}
+
+    def __str__(self):
+        return "ModelDelta: beams +{} -{} ~{}, joints +{} -{} ~{}, features +{} -{}".format(
+            len(self.added_beams),
+            len(self.removed_beams),
+            len(self.modified_beams),
+            len(self.added_joints),
+            len(self.removed_joints),
+            len(self.modified_joints),
+            sum(len(features) for features in self.added_features.values()),
+            sum(len(features) for features in self.removed_features.values()),
+        )
+
+    @property
+    def is_empty(self):
+        return not any(self.__data__.values())
+
+
+def diff_models(old, new):
+    """Returns the differences between two revisions of a timber model.
+
+    Parameters
+    ----------
+    old : :class:`~compas_timber.model.TimberModel`
+        The previous revision.
+    new : :class:`~compas_timber.model.TimberModel`
+        The new revision.
+
+    Returns
+    -------
+    :class:`ModelDelta`
+
+    """
+    old_beams = {str(beam.guid): beam for beam in old.beams}
+    new_beams = {str(beam.guid): beam for beam in new.beams}
+    delta = ModelDelta()
+
+    for guid, beam in new_beams.items():
+        if guid not in old_beams:
+            delta.added_beams.append(_beam_state(beam))
+        elif beam_fingerprint(beam) != beam_fingerprint(old_beams[guid]):
+            delta.modified_beams.append(_beam_state(beam))
+    delta.removed_beams = [guid for guid in old_beams if guid not in new_beams]
+
+    old_joints = _joint_keys(old.joints)
+    new_joints = _joint_keys(new.joints)
+    for key, joint in new_joints.items():
+        if key not in old_joints:
+            delta.added_joints.append(_joint_state(key, joint))
+        elif joint_fingerprint(joint) != joint_fingerprint(old_joints[key]):
+            delta.modified_joints.append(_joint_state(key, joint))
+    delta.removed_joints = [_joint_ref(key) for key in old_joints if key not in new_joints]
+
+    for guid, beam in new_beams.items():
+        # only features added by the user are compared, all of them in case of added beams
+        new_features = [f for f in beam._features if not f.is_joinery]
+        old_features = [f for f in old_beams[guid]._features if not f.is_joinery] if guid in old_beams else []
+        new_prints = [feature_fingerprint(f) for f in new_features]
+        old_prints = [feature_fingerprint(f) for f in old_features]
+        added = [f for f, fingerprint in zip(new_features, new_prints) if fingerprint not in old_prints]
+        removed = [fingerprint for fingerprint in old_prints if fingerprint not in new_prints]
+        if added:
+            delta.added_features[guid] = added
+        if removed:
+            delta.removed_features[guid] = removed
+    return delta
+
+
+def apply_delta(model, delta):
+    """Applies a :class:`ModelDelta` to a model, changing only the affected beams, joints and features.
+
+    As with :meth:`~compas_timber.model.TimberModel.update_beam`, the joints of the modified beams and of their
+    immediate neighbors are re-calculated.
+
+    Parameters
+    ----------
+    model : :class:`~compas_timber.model.TimberModel`
+        The model to patch, usually the previous revision the delta was created against.
+    delta : :class:`ModelDelta`
+        The differences to apply.
+
+    Returns
+    -------
+    list(:class:`~compas_timber.connections.BeamJoinningError`)
+        The errors raised while adding the features of the new or affected joints.
+
+    """
+    joints = _joint_keys(model.joints)
+    removed_keys = set(_ref_key(ref) for ref in delta.removed_joints)
+    removed_keys.update(_ref_key(state) for state in delta.modified_joints)
+    removed_beams = set(delta.removed_beams)
+    for key, joint in joints.items():
+        if key in removed_keys or key[0] & removed_beams:
+            model.remove_joint(joint)
+
+    for guid in delta.removed_beams:
+        model.remove_beam(model.beam_by_guid(guid))
+
+    for state in delta.added_beams:
+        beam = Beam(state["frame"].copy(), state["length"], state["width"], state["height"])
+        beam._guid = uuid.UUID(state["guid"])
+        beam._name = state["name"]
+        beam.attributes = state["attributes"]
+        model.add_beam(beam)
+
+    modified = []
+    for state in delta.modified_beams:
+        beam = model.beam_by_guid(state["guid"])
+        beam.frame = state["frame"].copy()
+        beam.length = state["length"]
+        beam.width = state["width"]
+        beam.height = state["height"]
+        beam._name = state["name"]
+        beam.attributes = state["attributes"]
+        model.reindex_beam(beam)
+        modified.append(beam)
+
+    errors = model._recalculate_joints(model._joints_around(modified))
+
+    for guid, fingerprints in delta.removed_features.items():
+        beam = model.beam_by_guid(guid)
+        remove = [f for f in beam._features if not f.is_joinery and feature_fingerprint(f) in fingerprints]
+        beam.remove_features(remove)
+    for guid, features in delta.added_features.items():
+        model.beam_by_guid(guid).add_features([json_loads(json_dumps(f)) for f in features])
+
+    new_joints = []
+    for state in delta.added_joints + delta.modified_joints:
+        joint = json_loads(json_dumps(state["joint"]))  # a copy bound to the beams of this model
+        joint.restore_beams_from_keys(model)
+        model.add_joint(joint, joint.beams)
+        new_joints.append(joint)
+    errors.extend(model.recompute_joinery(new_joints))
+    return errors
@@ -0,0 +1,174 @@
+from collections import deque
+
+
+class ChangeRecord(object):
+    """A single change of a timber model, see :class:`ChangeJournal`.
+
+    Parameters
+    ----------
+    revision : int
+        The revision of the model after the change.
+    action : str
+        The kind of change, one of the actions of :class:`ChangeJournal`.
+    guid : str
+        The GUID of the changed beam, wall or joint.
+    details : dict
+        Additional information on the change, e.g. the GUIDs of the beams of a joint.
+
+    Attributes
+    ----------
+    revision : int
+        The revision of the model after the change.
+    action : str
+        The kind of change.
+    guid : str
+        The GUID of the changed beam, wall or joint.
+    details : dict
+        Additional information on the change.
+
+    """
+
+    __slots__ = ("revision", "action", "guid", "details")
+
+    def __init__(self, revision, action, guid, details):
+        self.revision = revision
+        self.action = action
+        self.guid = guid
+        self.details = details
+
+    def __repr__(self):
+        return "ChangeRecord({}, {!r}, {!r}, {!r})".format(self.revision, self.action, self.guid, self.details)
+
+
+class ChangeJournal(object):
+    """Append-only journal of the changes of a timber model, with a monotonically increasing revision number.
+
+    Every change increments the revision and notifies the subscribers, which are called with the
+    :class:`ChangeRecord` of the change. Consumers such as caches either subscribe or remember the revision they
+    were built at and ask for the changes since, see :meth:`ChangeJournal.since`.
+
+    Parameters
+    ----------
+    maxlen : int, optional
+        The number of records to keep, older records are discarded. Defaults to :attr:`ChangeJournal.DEFAULT_MAXLEN`.
+        None keeps all records.
+
+    Attributes
+    ----------
+    revision : int
+        The revision after the latest change, 0 if nothing has changed yet.
+    records : list(:class:`ChangeRecord`)
+        The kept records, oldest first.
+    DEFAULT_MAXLEN : int
+        The number of records kept by default. The changes since older revisions are no longer available then,
+        consumers which fall further behind have to rebuild from the model.
+    ADD_BEAM, REMOVE_BEAM, ADD_WALL, ADD_JOINT, REMOVE_JOINT : str
+        Actions recorded by :class:`~compas_timber.model.TimberModel`.
+    BEAM_GEOMETRY, ADD_FEATURES, REMOVE_FEATURES, ADD_BLANK_EXTENSION, REMOVE_BLANK_EXTENSION : str
+        Actions recorded by the beams of a model.
+
+    """
+
+    ADD_BEAM = "add_beam"
+    REMOVE_BEAM = "remove_beam"
+    ADD_WALL = "add_wall"
+    ADD_JOINT = "add_joint"
+    REMOVE_JOINT = "remove_joint"
+    BEAM_GEOMETRY = "beam_geometry"
+    ADD_FEATURES = "add_features"
+    REMOVE_FEATURES = "remove_features"
+    ADD_BLANK_EXTENSION = "add_blank_extension"
+    REMOVE_BLANK_EXTENSION = "remove_blank_extension"
+
+    DEFAULT_MAXLEN = 10000
+
+    def __init__(self, maxlen=DEFAULT_MAXLEN):
+        self._records = deque(maxlen=maxlen)
+        self._revision = 0
+        self._subscribers = []
+
+    @property
+    def revision(self):
+        return self._revision
+
+    @property
+    def records(self):
+        return list(self._records)
+
+    def record(self, action, guid, **details):
+        """Appends a change to the journal and notifies the subscribers.
+
+        Parameters
+        ----------
+        action : str
+            The kind of change.
+        guid : str
+            The GUID of the changed beam, wall or joint.
+        **details : dict, optional
+            Additional information on the change.
+
+        Returns
+        -------
+        :class:`ChangeRecord`
+
+        """
+        self._revision += 1
+        change = ChangeRecord(self._revision, action, guid, details)
+        self._records.append(change)
+        for callback in list(self._subscribers):
+            callback(change)
+        return change
+
+    def since(self, revision):
+        """Returns the changes after the given revision.
+
+        Parameters
+        ----------
+        revision : int
+            A revision previously read from :attr:`ChangeJournal.revision`.
+
+        Returns
+        -------
+        list(:class:`ChangeRecord`)
+            The changes, oldest first.
+
+        Raises
+        ------
+        ValueError
+            If some of the changes have already been discarded, see `maxlen`.
+
+        """
+        if revision >= self._revision:
+            return []
+        oldest = self._records[0].revision if self._records else self._revision + 1
+        if revision + 1 < oldest:
+            raise ValueError("The changes since revision {} are no longer available.".format(revision))
+        return list(self._records)[revision + 1 - oldest :]
+
+    def subscribe(self, callback):
+        """Registers a callback which is called with the :class:`ChangeRecord` of every change.
+
+        Parameters
+        ----------
+        callback : callable
+            The callback.
+
+        Returns
+        -------
+        callable
+            The callback, for use with :meth:`ChangeJournal.unsubscribe`.
+
+        """
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        """Removes a callback registered with :meth:`ChangeJournal.subscribe`.
+
+        Parameters
+        ----------
+        callback : callable
+            The callback.
+
+        """
+        self._subscribers.remove(callback)
@@ -0,0 +1,177 @@
+"""Streaming JSON Lines representation of :class:`~compas_timber.model.TimberModel`.
+
+Every line is a JSON record with a ``type``:
+
+* ``model``: the first record, with the format ``version``, ``lazy_features`` and ``persist_joinery``.
+* ``wall``: a ``wall``.
+* ``beam``: the ``guid``, ``attributes`` and ``beam``, with the ``blank_extensions`` if joinery is persisted.
+* ``feature``: the ``guid`` of a ``beam`` and a ``feature`` which was not added by a joint, or any feature of it
+  if joinery is persisted, then with its ``index`` in the features of the beam.
+* ``joint``: the guids of the ``beams`` and the ``joint``, with the indices of its ``features`` if joinery is persisted.
+
+Walls and beams come in the order of the elements of the model, followed by the features and then the joints,
+so that a model can be written and read one record at a time. Records of beams can be filtered while reading,
+the features and joints of the rejected beams are then skipped without being de-serialized.
+
+"""
+
+import json
+
+from compas.data import json_dumps
+from compas.data import json_loads
+
+from compas_timber.elements import Beam
+from compas_timber.elements import Wall
+
+from .packing import extension_key
+
+VERSION = 1
+
+
+def _line(record):
+    return json_dumps(record, compact=True) + "\n"
+
+
+def model_lines(model):
+    """Yields the JSON Lines of the given timber model, one record at a time.
+
+    Parameters
+    ----------
+    model : :class:`~compas_timber.model.TimberModel`
+        The model.
+
+    Returns
+    -------
+    generator(str)
+        The lines, each terminated by a newline.
+
+    """
+    persist = model.persist_joinery
+    if persist:
+        model.add_deferred_features()  # the blank extensions are written with the beams
+    yield _line({"type": "model", "version": VERSION, "lazy_features": model.lazy_features, "persist_joinery": persist})
+
+    for element in model.elements():
+        if isinstance(element, Beam):
+            record = {"type": "beam", "guid": str(element.guid), "attributes": element._attributes, "beam": element}
+            if persist:
+                record["blank_extensions"] = [
+                    [None if key is None else str(key), start, end]
+                    for key, (start, end) in element._blank_extensions.items()
+                ]
+            yield _line(record)
+        elif isinstance(element, Wall):
+            yield _line({"type": "wall", "wall": element})
+        else:
+            raise ValueError("Unsupported element type: {}".format(type(element).__name__))
+
+    indices = {}
+    for beam in model.beams:
+        guid = str(beam.guid)
+        if persist:
+            for index, feature in enumerate(beam._features):
+                indices[id(feature)] = [guid, index]
+                yield _line({"type": "feature", "beam": guid, "index": index, "feature": feature})
+        else:
+            for feature in beam._features:
+                if not feature.is_joinery:
+                    yield _line({"type": "feature", "beam": guid, "feature": feature})
+
+    for joint in model.joints:
+        record = {"type": "joint", "beams": [str(beam.guid) for beam in joint.beams], "joint": joint}
+        if persist:
+            record["features"] = [indices[id(f)] for f in joint.features if id(f) in indices]
+        yield _line(record)
+
+
+def _lines(source):
+    if isinstance(source, str):
+        with open(source, "r") as f:
+            for line in f:
+                yield line
+    else:
+        for line in source:
+            yield line
+
+
+def read_records(source, beam_filter=None):
+    """Yields the de-serialized records of a JSON Lines model, one at a time.
+
+    Parameters
+    ----------
+    source : str | iterable(str)
+        The path of the file, or the lines, e.g. an open file.
+    beam_filter : callable, optional
+        Called with the plain JSON record of each beam, with its "guid" and "attributes", before the beam is
+        de-serialized. Beams for which it returns False are skipped, as are their features and joints.
+
+    Returns
+    -------
+    generator(dict)
+
+    """
+    accepted = set()
+    for line in _lines(source):
+        if not line.strip():
+            continue
+        if beam_filter is None:
+            record = json_loads(line)
+        else:
+            plain = json.loads(line)
+            kind = plain["type"]
+            if kind == "beam" and not beam_filter(plain):
+                continue
+            if kind == "feature" and plain["beam"] not in accepted:
+                continue
+            if kind == "joint" and not all(guid in accepted for guid in plain["beams"]):
+                continue
+            record = json_loads(line)
+        if record["type"] == "model" and record["version"] > VERSION:
+            raise ValueError("Unsupported JSON Lines timber model version: {}".format(record["version"]))
+        if record["type"] == "beam":
+            accepted.add(record["guid"])
+        yield record
+
+
+def model_from_records(records, cls):
+    """Creates a timber model from the records yielded by :func:`read_records`.
+
+    Parameters
+    ----------
+    records : iterable(dict)
+        The records, starting with the "model" record.
+    cls : type
+        The type of the model, :class:`~compas_timber.model.TimberModel` or a sub-class of it.
+
+    Returns
+    -------
+    :class:`~compas_timber.model.TimberModel`
+
+    """
+    records = iter(records)
+    header = next(records, None)
+    if header is None or header["type"] != "model":
+        raise ValueError("Not a JSON Lines timber model.")
+    model = cls(lazy_features=header["lazy_features"], persist_joinery=header["persist_joinery"])
+
+    for record in records:
+        kind = record["type"]
+        if kind == "beam":
+            beam = record["beam"]
+            beam.attributes = record["attributes"]
+            for key, start, end in record.get("blank_extensions", []):
+                beam.add_blank_extension(start, end, extension_key(key))
+            model.add_beam(beam)
+        elif kind == "wall":
+            model.add_wall(record["wall"])
+        elif kind == "feature":
+            model.beam_by_guid(record["beam"]).add_features(record["feature"])
+        elif kind == "joint":
+            joint = record["joint"]
+            joint.restore_beams_from_keys(model)
+            model.add_joint(joint, joint.beams)
+            if model.persist_joinery:
+                joint.features = [model.beam_by_guid(guid)._features[index] for guid, index in record["features"]]
+            else:
+                joint.defer_features()
+    return model
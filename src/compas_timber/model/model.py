@@ -1,9 +1,27 @@
+import os
+import uuid
+from collections import OrderedDict
+
+import compas
 from compas.geometry import Point
 from compas_model.models import Model
 
+from compas_timber.connections import BeamJoinningError
+from compas_timber.connections import Joint
+from compas_timber.connections import LapJoint
 from compas_timber.elements import Beam
 from compas_timber.elements import Wall
 
+from .binary import model_from_bytes
+from .binary import model_to_bytes
+from .diff import apply_delta
+from .diff import diff_models
+from .journal import ChangeJournal
+from .jsonlines import model_from_records
+from .jsonlines import model_lines
+from .jsonlines import read_records
+from .partition import partition_model
+
 
 class TimberModel(Model):
     """Represents a timber model containing different elements such as walls, beams and joints.
@@ -18,6 +36,18 @@ class TimberModel(Model):
         The calculated center of mass of the model.
     joints : list(:class:`~compas_timber.connections.Joint`)
         A list of joints assigned to this model.
+    journal : :class:`~compas_timber.model.ChangeJournal`
+        The journal of the changes of this model, its beams and their features and blank extensions.
+        It keeps the latest :attr:`~compas_timber.model.ChangeJournal.DEFAULT_MAXLEN` changes.
+    lazy_features : bool
+        If True, joints added to this model defer adding their features to the beams until these are first needed.
+        See :meth:`~compas_timber.connections.Joint.defer_features`.
+    persist_joinery : bool
+        If True, the features and blank extensions of the beams are stored in the data of this model and restored
+        as they are when loading it, instead of being re-calculated by the joints.
+        See :meth:`~compas_timber.model.TimberModel.recompute_joinery`.
+    revision : int
+        The revision of this model, incremented by every change recorded in the :attr:`TimberModel.journal`.
     topologies :  list(dict)
         A list of JointTopology for model. dict is: {"detected_topo": detected_topo, "beam_a_key": beam_a_key, "beam_b_key":beam_b_key}
         See :class:`~compas_timber.connections.JointTopology`.
@@ -28,26 +58,56 @@ class TimberModel(Model):
 
     """
 
+    @property
+    def __data__(self):
+        data = super(TimberModel, self).__data__
+        attributes = {str(beam.guid): beam._attributes for beam in self._beams if beam._attributes}
+        if attributes:
+            data["beam_attributes"] = attributes  # not part of the data of the beams
+        if self.persist_joinery:
+            data["joinery"] = self._joinery_data()
+        return data
+
     @classmethod
     def __from_data__(cls, data):
         model = super(TimberModel, cls).__from_data__(data)
+        for node in model.graph.nodes():
+            model.graph.node_element(node).graph_node = node
+        beam_attributes = data.get("beam_attributes", {})
         for element in model.elements():
             if isinstance(element, Beam):
+                if str(element.guid) in beam_attributes:
+                    element.attributes = beam_attributes[str(element.guid)]
                 model._beams.append(element)
+                model._index_beam(element)
+                element._journal = model.journal
             elif isinstance(element, Wall):
                 model._walls.append(element)
+        joinery = data.get("joinery")
         for interaction in model.interactions():
-            model._joints.append(interaction)
             interaction.restore_beams_from_keys(model)
-            interaction.add_features()
+            model._index_joint(interaction, interaction.beams)
+        if joinery is None:
+            for joint in model._joints.values():
+                joint.defer_features()
+        else:
+            model.persist_joinery = True
+            model._restore_joinery(joinery)
         return model
 
     def __init__(self, *args, **kwargs):
         super(TimberModel, self).__init__()
+        self.lazy_features = kwargs.pop("lazy_features", False)
+        self.persist_joinery = kwargs.pop("persist_joinery", False)
         self._beams = []
         self._walls = []
-        self._joints = []
+        self._joints = OrderedDict()  # id(joint) -> joint, in the order the joints were added
+        self._joints_by_type = {}  # type -> OrderedDict(id(joint) -> joint)
+        self._joints_by_pair = {}  # frozenset of the beams' guids -> joints, in the order they were added
+        self._beams_by_attribute = {}  # attribute key -> attribute value -> OrderedDict(guid -> beam)
+        self._beam_index_entries = {}  # guid -> indexed (key, value) pairs of the beam
         self._topologies = []  # added to avoid calculating multiple times
+        self.journal = ChangeJournal()
 
     def __str__(self):
         return "TimberModel ({}) with {} beam(s) and {} joint(s).".format(self.guid, len(self.beams), len(self.joints))
@@ -60,13 +120,18 @@ class TimberModel(Model):
     @property
     def joints(self):
         # type: () -> list[Joint]
-        return self._joints
+        return list(self._joints.values())
 
     @property
     def walls(self):
         # type: () -> list[Wall]
         return self._walls
 
+    @property
+    def revision(self):
+        # type: () -> int
+        return self.journal.revision
+
     @property
     def topologies(self):
         return self._topologies
@@ -108,6 +173,50 @@ class TimberModel(Model):
         """
         return self._guid_element[guid]
 
+    def wall_of_beam(self, beam):
+        # type: (Beam) -> Wall | None
+        """Get the wall which contains the given beam.
+
+        A beam is contained by a wall if the midpoint of its centerline lies within the shape of the wall.
+
+        Parameters
+        ----------
+        beam : :class:`~compas_timber.elements.Beam`
+            The beam of interest.
+
+        Returns
+        -------
+        :class:`~compas_timber.elements.Wall` | None
+            The wall containing the beam, None if the beam is not contained by any of the walls of this model.
+
+        """
+        midpoint = beam.midpoint
+        for wall in self._walls:
+            if wall.shape.contains_point(midpoint):
+                return wall
+        return None
+
+    def joints_of_beam(self, beam):
+        # type: (Beam) -> list[Joint]
+        """Get the joints which connect the given beam to other beams.
+
+        Parameters
+        ----------
+        beam : :class:`~compas_timber.elements.Beam`
+            The beam of interest.
+
+        Returns
+        -------
+        list(:class:`~compas_timber.connections.Joint`)
+
+        """
+        joints = []
+        node = beam.graph_node
+        for neighbor in self.graph.neighbors(node):
+            edge = (node, neighbor) if self.graph.has_edge((node, neighbor)) else (neighbor, node)
+            joints.extend(self.graph.edge_interactions(edge) or [])
+        return joints
+
     def add_beam(self, beam):
         # type: (Beam) -> None
         """Adds a Beam to this model.
@@ -120,6 +229,168 @@ class TimberModel(Model):
         """
         _ = self.add_element(beam)
         self._beams.append(beam)
+        self._index_beam(beam)
+        beam._journal = self.journal
+        self.journal.record(ChangeJournal.ADD_BEAM, str(beam.guid))
+
+    def remove_beam(self, beam):
+        # type: (Beam) -> None
+        """Removes a beam and its joints from this model.
+
+        Parameters
+        ----------
+        beam : :class:`~compas_timber.elements.Beam`
+            The beam to remove.
+
+        """
+        for joint in self.joints_of_beam(beam):
+            self.remove_joint(joint)
+        self._unindex_beam(beam)
+        self.remove_element(beam)
+        self._beams.remove(beam)
+        beam._journal = None
+        self.journal.record(ChangeJournal.REMOVE_BEAM, str(beam.guid))
+
+    def reindex_beam(self, beam):
+        # type: (Beam) -> None
+        """Updates the index of the attributes of the given beam, after these have been modified.
+
+        See :meth:`TimberModel.beams_by_attribute`.
+
+        Parameters
+        ----------
+        beam : :class:`~compas_timber.elements.Beam`
+            The beam whose attributes have been modified.
+
+        """
+        self._unindex_beam(beam)
+        self._index_beam(beam)
+
+    def beams_by_attribute(self, key, value):
+        # type: (str, object) -> list[Beam]
+        """Get the beams whose attribute `key` equals `value`, using an index instead of scanning all beams.
+
+        The index is updated when beams are added, removed or passed to :meth:`TimberModel.reindex_beam` or
+        :meth:`TimberModel.update_beam`. Attributes with unhashable values are not indexed.
+
+        Parameters
+        ----------
+        key : str
+            The name of the attribute, e.g. "category" or "rhino_guid".
+        value : object
+            The value of the attribute.
+
+        Returns
+        -------
+        list(:class:`~compas_timber.elements.Beam`)
+            The beams, in the order they were indexed.
+
+        """
+        try:
+            beams = self._beams_by_attribute.get(key, {}).get(value)
+        except TypeError:  # unhashable
+            return []
+        return list(beams.values()) if beams else []
+
+    def joints_by_type(self, joint_type, include_subclasses=False):
+        # type: (type, bool) -> list[Joint]
+        """Get the joints of the given type, using an index instead of scanning all joints.
+
+        Parameters
+        ----------
+        joint_type : type
+            The type of joint, e.g. :class:`~compas_timber.connections.TButtJoint`.
+        include_subclasses : bool, optional
+            If True, joints of sub-classes of `joint_type` are included as well.
+
+        Returns
+        -------
+        list(:class:`~compas_timber.connections.Joint`)
+
+        """
+        if not include_subclasses:
+            return list(self._joints_by_type.get(joint_type, {}).values())
+        joints = []
+        for cls, by_id in self._joints_by_type.items():
+            if issubclass(cls, joint_type):
+                joints.extend(by_id.values())
+        return joints
+
+    def joint_between(self, beam_a, beam_b):
+        # type: (Beam, Beam) -> Joint | None
+        """Get the joint which connects the two given beams.
+
+        If several joints connect the beams, the one added first is returned, see :meth:`TimberModel.joints_between`.
+
+        Parameters
+        ----------
+        beam_a : :class:`~compas_timber.elements.Beam`
+        beam_b : :class:`~compas_timber.elements.Beam`
+
+        Returns
+        -------
+        :class:`~compas_timber.connections.Joint` | None
+            The joint, None if the beams are not joined.
+
+        """
+        joints = self._joints_by_pair.get(frozenset((str(beam_a.guid), str(beam_b.guid))))
+        return joints[0] if joints else None
+
+    def joints_between(self, beam_a, beam_b):
+        # type: (Beam, Beam) -> list[Joint]
+        """Get all the joints which connect the two given beams.
+
+        Parameters
+        ----------
+        beam_a : :class:`~compas_timber.elements.Beam`
+        beam_b : :class:`~compas_timber.elements.Beam`
+
+        Returns
+        -------
+        list(:class:`~compas_timber.connections.Joint`)
+            The joints, in the order they were added.
+
+        """
+        return list(self._joints_by_pair.get(frozenset((str(beam_a.guid), str(beam_b.guid))), []))
+
+    def _index_beam(self, beam):
+        guid = str(beam.guid)
+        entries = []
+        for key, value in beam._attributes.items():
+            try:
+                self._beams_by_attribute.setdefault(key, {}).setdefault(value, OrderedDict())[guid] = beam
+            except TypeError:  # unhashable values are not indexed
+                continue
+            entries.append((key, value))
+        self._beam_index_entries[guid] = entries
+
+    def _unindex_beam(self, beam):
+        guid = str(beam.guid)
+        for key, value in self._beam_index_entries.pop(guid, []):
+            by_value = self._beams_by_attribute[key]
+            del by_value[value][guid]
+            if not by_value[value]:
+                del by_value[value]
+            if not by_value:
+                del self._beams_by_attribute[key]
+
+    def _index_joint(self, joint, beams):
+        self._joints[id(joint)] = joint
+        self._joints_by_type.setdefault(type(joint), OrderedDict())[id(joint)] = joint
+        self._joints_by_pair.setdefault(frozenset(str(beam.guid) for beam in beams), []).append(joint)
+
+    def _unindex_joint(self, joint):
+        del self._joints[id(joint)]
+        by_id = self._joints_by_type[type(joint)]
+        del by_id[id(joint)]
+        if not by_id:
+            del self._joints_by_type[type(joint)]
+        key = frozenset(str(beam.guid) for beam in joint.beams)
+        joints = [other for other in self._joints_by_pair.get(key, []) if other is not joint]
+        if joints:
+            self._joints_by_pair[key] = joints
+        else:
+            self._joints_by_pair.pop(key, None)
 
     def add_wall(self, wall):
         # type: (Wall) -> None
@@ -133,6 +404,7 @@ class TimberModel(Model):
         """
         _ = self.add_element(wall)
         self._walls.append(wall)
+        self.journal.record(ChangeJournal.ADD_WALL, str(wall.guid))
 
     def add_joint(self, joint, beams):
         # type: (Joint, tuple[Beam]) -> None
@@ -151,12 +423,246 @@ class TimberModel(Model):
             raise ValueError("Expected 2 parts. Got instead: {}".format(len(beams)))
         a, b = beams
         _ = self.add_interaction(a, b, interaction=joint)
-        self._joints.append(joint)
+        self._index_joint(joint, beams)
+        self.journal.record(ChangeJournal.ADD_JOINT, str(joint.guid), beams=[str(a.guid), str(b.guid)])
+
+    def add_joints(self, definitions):
+        # type: (list) -> tuple[list[Joint], list[BeamJoinningError]]
+        """Adds many joints to the model at once.
+
+        Each definition is expected to have the attributes `joint_type`, `beams` and `kwargs`,
+        as does :class:`~compas_timber.design.JointDefinition`.
+        Definitions which refer to the same pair of beams override each other, the last one wins.
+        If adding the features of its joint fails, the joint is removed and the previous definition of the same
+        pair is tried instead, until one succeeds or none is left.
+
+        All the joints are first added to the model and only then are their features calculated,
+        so that the features are applied in one go, in the order of the remaining definitions.
+        The negative volumes of lap joints are calculated in one batch beforehand, see
+        :meth:`~compas_timber.connections.LapJoint.precompute_negative_volumes`.
+        If `lazy_features` is set, the features are deferred instead, no errors are returned and only the last
+        definition of each pair is used.
+
+        Parameters
+        ----------
+        definitions : list
+            The joint definitions.
+
+        Returns
+        -------
+        tuple(list(:class:`~compas_timber.connections.Joint`), list(:class:`~compas_timber.connections.BeamJoinningError`))
+            The created joints and the errors raised while adding their features.
+
+        Raises
+        ------
+        ValueError
+            If a definition refers to less than two beams.
+
+        """
+        by_pair = OrderedDict()  # pair of beams -> definitions, the last one first
+        for definition in definitions:
+            Joint.check_beams(definition.beams)
+            key = frozenset(str(beam.guid) for beam in definition.beams)
+            candidates = by_pair.pop(key, [])  # an override takes the position of the overriding definition
+            candidates.insert(0, definition)
+            by_pair[key] = candidates
+
+        joints = []
+        fallbacks = {}  # id(joint) -> the definitions to try if adding its features fails
+        for candidates in by_pair.values():
+            joint = self._add_joint_from_definition(candidates[0])
+            fallbacks[id(joint)] = candidates[1:]
+            joints.append(joint)
+
+        errors = self._add_joint_features(joints)
+        failed = list(errors)
+        while failed:
+            retries = []
+            for error in failed:
+                candidates = fallbacks.pop(id(error.joint), None)
+                if not candidates:
+                    continue
+                self.remove_joint(error.joint)
+                joint = self._add_joint_from_definition(candidates[0])
+                fallbacks[id(joint)] = candidates[1:]
+                joints[joints.index(error.joint)] = joint
+                retries.append(joint)
+            failed = self._add_joint_features(retries)
+            errors.extend(failed)
+        return joints, errors
+
+    def _add_joint_from_definition(self, definition):
+        joint = definition.joint_type(*definition.beams, **definition.kwargs)
+        self.add_joint(joint, definition.beams)
+        return joint
+
+    def _add_joint_features(self, joints):
+        """Adds or defers the features of the given new joints, see :meth:`TimberModel.add_joints`."""
+        if self.lazy_features:
+            for joint in joints:
+                joint.defer_features()
+            return []
+
+        laps = [joint for joint in joints if isinstance(joint, LapJoint)]
+        if laps and not compas.IPY:
+            LapJoint.precompute_negative_volumes(laps)
+
+        errors = []
+        for joint in joints:
+            try:
+                joint.add_features()
+            except BeamJoinningError as bje:
+                errors.append(bje)
+        return errors
+
+    def add_deferred_features(self):
+        # type: () -> None
+        """Adds the features of all joints in this model which have deferred them, in the order of the joints.
+
+        Errors are added to the `debug_info` of the affected beams.
+        See :meth:`~compas_timber.connections.Joint.defer_features`.
+
+        """
+        for joint in self.joints:
+            joint.add_deferred_features()
+
+    def update_beam(self, beam):
+        # type: (Beam) -> list[BeamJoinningError]
+        """Re-calculates the joints affected by a modification of the given beam.
+
+        The features and blank extensions of the joints of `beam` and of its immediate neighbors are removed and
+        calculated anew, in the order the joints were added to the model. All other joints are left untouched.
+        The attributes of `beam` are re-indexed, see :meth:`TimberModel.reindex_beam`.
+
+        Parameters
+        ----------
+        beam : :class:`~compas_timber.elements.Beam`
+            The beam which has been modified.
+
+        Returns
+        -------
+        list(:class:`~compas_timber.connections.BeamJoinningError`)
+            The errors raised while adding the features of the affected joints.
+
+        """
+        self.reindex_beam(beam)
+        return self._recalculate_joints(self._joints_around([beam]))
+
+    def _joints_around(self, beams):
+        """Returns the joints of the given beams and of their immediate neighbors, in the order they were added."""
+        affected = set()
+        for beam in beams:
+            for joint in self.joints_of_beam(beam):
+                for other in joint.beams:
+                    affected.update(id(j) for j in self.joints_of_beam(other))
+        return [joint for joint in self._joints.values() if id(joint) in affected]
+
+    def recompute_joinery(self, joints=None):
+        # type: (list[Joint] | None) -> list[BeamJoinningError]
+        """Re-calculates the features and blank extensions of the given joints, or of all joints of this model.
+
+        Use this to bring restored joinery (see :attr:`TimberModel.persist_joinery`) up to date with the current
+        implementation of the joints, or after modifying beams.
+
+        Parameters
+        ----------
+        joints : list(:class:`~compas_timber.connections.Joint`), optional
+            The joints to re-calculate. Defaults to all the joints of this model.
+
+        Returns
+        -------
+        list(:class:`~compas_timber.connections.BeamJoinningError`)
+            The errors raised while adding the features of the joints.
+
+        """
+        if joints is None:
+            return self._recalculate_joints(self.joints)
+        selected = set(id(joint) for joint in joints)
+        return self._recalculate_joints([joint for joint in self._joints.values() if id(joint) in selected])
+
+    def _recalculate_joints(self, joints):
+        for joint in joints:
+            joint.remove_features()
+
+        errors = []
+        for joint in joints:
+            if self.lazy_features:
+                joint.defer_features()
+                continue
+            try:
+                joint.add_features()
+            except BeamJoinningError as bje:
+                errors.append(bje)
+        return errors
+
+    def _joinery_data(self):
+        """Returns the features and blank extensions of the beams and which of the features were added by which joint."""
+        beams = {}
+        indices = {}
+        for beam in self._beams:
+            features = beam.features  # adds the features of deferred joints
+            indices.update((id(feature), (str(beam.guid), index)) for index, feature in enumerate(features))
+            beams[str(beam.guid)] = {
+                "features": list(features),
+                "blank_extensions": [
+                    [None if key is None else str(key), start, end]
+                    for key, (start, end) in beam._blank_extensions.items()
+                ],
+            }
+        joints = {}
+        for joint in self._joints.values():
+            joints[str(joint.guid)] = [list(indices[id(f)]) for f in joint.features if id(f) in indices]
+        return {"beams": beams, "joints": joints}
+
+    def _restore_joinery(self, data):
+        """Restores the data returned by :meth:`TimberModel._joinery_data` without re-calculating the joints."""
+        joint_keys = {str(joint.guid): joint.guid for joint in self._joints.values()}
+        for beam in self._beams:
+            beam_data = data["beams"].get(str(beam.guid))
+            if beam_data is None:
+                continue
+            beam.features = list(beam_data["features"])
+            beam._blank_extensions = {
+                joint_keys.get(key, key): (start, end) for key, start, end in beam_data["blank_extensions"]
+            }
+        for joint in self._joints.values():
+            features = data["joints"].get(str(joint.guid))
+            if features is None:
+                joint.defer_features()
+                continue
+            joint.features = [self.beam_by_guid(guid)._features[index] for guid, index in features]
+
+    def resolve_joint_ends(self, force=False):
+        # type: (bool) -> None
+        """Calculates which end of each beam is joined by each of the joints of this model in one pass.
+
+        The centerline of each beam is calculated once and shared by all the joints of that beam.
+        Joints whose ends are up to date are skipped, see :attr:`~compas_timber.connections.Joint.ends_resolved`.
+        See :meth:`~compas_timber.connections.Joint.resolve_ends`.
+
+        Parameters
+        ----------
+        force : bool, optional
+            If True, the ends of all joints are re-calculated.
+
+        """
+        centerlines = {}
+        for joint in self._joints.values():
+            if not force and joint.ends_resolved:
+                continue
+            lines = []
+            for beam in joint.beams:
+                if id(beam) not in centerlines:
+                    centerlines[id(beam)] = beam.centerline
+                lines.append(centerlines[id(beam)])
+            joint.resolve_ends(lines)
 
     def remove_joint(self, joint):
         # type: (Joint) -> None
         """Removes this joint object from the model.
 
+        The features and blank extensions added by the joint are removed from the beams.
+
         Parameters
         ----------
         joint : :class:`~compas_timber.connections.Joint`
@@ -164,8 +670,337 @@ class TimberModel(Model):
 
         """
         a, b = joint.beams
-        self.remove_interaction(a, b)
-        self._joints.remove(joint)
+        joint.remove_features()
+        self.remove_interaction(a, b)  # removes the interactions of all the joints between the two beams
+        self._unindex_joint(joint)
+        for other in self.joints_between(a, b):
+            self.add_interaction(a, b, interaction=other)
+        self.journal.record(ChangeJournal.REMOVE_JOINT, str(joint.guid), beams=[str(a.guid), str(b.guid)])
+
+    def subscribe(self, callback):
+        # type: (callable) -> callable
+        """Registers a callback which is called with the :class:`~compas_timber.model.ChangeRecord` of every change.
+
+        See :class:`~compas_timber.model.ChangeJournal` for the recorded changes.
+
+        Parameters
+        ----------
+        callback : callable
+            The callback.
+
+        Returns
+        -------
+        callable
+            The callback, for use with :meth:`TimberModel.unsubscribe`.
+
+        """
+        return self.journal.subscribe(callback)
+
+    def unsubscribe(self, callback):
+        # type: (callable) -> None
+        """Removes a callback registered with :meth:`TimberModel.subscribe`.
+
+        Parameters
+        ----------
+        callback : callable
+            The callback.
+
+        """
+        self.journal.unsubscribe(callback)
+
+    def changes_since(self, revision):
+        # type: (int) -> list[ChangeRecord]
+        """Returns the changes of this model after the given revision.
+
+        Parameters
+        ----------
+        revision : int
+            A revision previously read from :attr:`TimberModel.revision`.
+
+        Returns
+        -------
+        list(:class:`~compas_timber.model.ChangeRecord`)
+
+        """
+        return self.journal.since(revision)
+
+    def clone(self):
+        # type: () -> TimberModel
+        """Returns a copy-on-write copy of this model, for cheaply exploring variants of it.
+
+        Unlike :meth:`TimberModel.copy`, nothing is serialized. Each beam and joint of the clone is a shallow copy
+        with the same GUID as the original, which shares the frame, the computed geometry, the features and the
+        blank extensions of the original. The list of features and the blank extensions of a beam are copied when
+        either the original or the clone first modifies them or hands them out through
+        :attr:`~compas_timber.elements.Beam.features`. Deferred joint features remain deferred in both models.
+
+        Shared objects must be replaced rather than modified in place, e.g. assign a new frame to a beam instead
+        of changing the point of its frame. Walls are copied.
+
+        Returns
+        -------
+        :class:`~compas_timber.model.TimberModel`
+
+        Examples
+        --------
+        >>> variant = model.clone()  # doctest: +SKIP
+        >>> beam = variant.beam_by_guid(guid)  # doctest: +SKIP
+        >>> beam.length += 0.2  # doctest: +SKIP
+        >>> errors = variant.update_beam(beam)  # doctest: +SKIP
+
+        """
+        model = type(self)(lazy_features=self.lazy_features, persist_joinery=self.persist_joinery)
+        self._clone_into(model, self.elements(), self.joints)
+        model._topologies = list(self._topologies)
+        return model
+
+    def partition(self, key=None):
+        # type: (callable | None) -> ModelPartition
+        """Splits this model into sub-models which can be processed independently, e.g. in parallel.
+
+        By default, the beams are partitioned by the wall which contains them, see :meth:`TimberModel.wall_of_beam`,
+        and each wall is part of the sub-model of its beams. Beams outside of any wall form the partition `None`.
+        Alternatively, the partition of each beam is given by `key`, the walls are then added to the stitched model
+        only.
+
+        The sub-models are copy-on-write clones, see :meth:`TimberModel.clone`. Joints between beams of different
+        partitions are not part of any sub-model, they are added when stitching the processed sub-models back
+        together, see :meth:`~compas_timber.model.ModelPartition.stitch`.
+
+        Parameters
+        ----------
+        key : callable, optional
+            Returns the partition key of a beam, e.g. its storey. Any hashable value.
+
+        Returns
+        -------
+        :class:`~compas_timber.model.ModelPartition`
+
+        Examples
+        --------
+        >>> partition = model.partition(key=lambda beam: beam.attributes.get("storey"))  # doctest: +SKIP
+        >>> for sub_model in partition.models.values():  # doctest: +SKIP
+        ...     sub_model.add_deferred_features()
+        >>> stitched, errors = partition.stitch()  # doctest: +SKIP
+
+        """
+        return partition_model(self, key)
+
+    def _clone_into(self, model, elements, joints):
+        """Adds clones of the given elements and joints of this model to `model`, see :meth:`TimberModel.clone`.
+
+        Deferred joints which are not among `joints` are dropped from the clones of the beams.
+
+        """
+        beams = []
+        for element in elements:
+            if isinstance(element, Beam):
+                beam = element._clone()
+                model.add_beam(beam)
+                beams.append((element, beam))
+            elif isinstance(element, Wall):
+                model.add_wall(element.copy(copy_guid=True))
+
+        clones = {}
+        for joint in joints:
+            clone = joint._clone(model)
+            model.add_joint(clone, clone.beams)
+            clones[id(joint)] = clone
+        for original, beam in beams:
+            if original._pending_joints:
+                beam._pending_joints = [clones[id(j)] for j in original._pending_joints if id(j) in clones]
+
+    def diff(self, other):
+        # type: (TimberModel) -> ModelDelta
+        """Returns the differences between this model and a newer revision of it.
+
+        Beams are compared by GUID and geometry fingerprint, joints by the pair of beams they join and their
+        type and parameters, features which were not added by joints by their fingerprint.
+
+        Parameters
+        ----------
+        other : :class:`~compas_timber.model.TimberModel`
+            The newer revision.
+
+        Returns
+        -------
+        :class:`~compas_timber.model.ModelDelta`
+            The added, removed and modified beams, joints and features.
+
+        """
+        return diff_models(self, other)
+
+    def apply_patch(self, delta):
+        # type: (ModelDelta) -> list[BeamJoinningError]
+        """Applies the differences returned by :meth:`TimberModel.diff` to this model.
+
+        Only the changed beams, joints and features are touched. The joinery of modified beams and of new joints
+        is re-calculated, that of all other joints is left as it is.
+
+        Parameters
+        ----------
+        delta : :class:`~compas_timber.model.ModelDelta`
+            The differences to apply.
+
+        Returns
+        -------
+        list(:class:`~compas_timber.connections.BeamJoinningError`)
+            The errors raised while adding the features of the affected joints.
+
+        """
+        return apply_delta(self, delta)
+
+    def to_binary(self, filepath):
+        # type: (str) -> None
+        """Writes this model to a file in the compact binary format.
+
+        The beams and their blank extensions are stored as packed floats, the joints and the features which were
+        not added by joints as JSON tables. The files are less than half the size of JSON, saving is several times
+        faster and loading about twice as fast.
+        Like with JSON, the features of the joints are re-calculated on demand after loading.
+        See :mod:`compas_timber.model.binary`.
+
+        Parameters
+        ----------
+        filepath : str
+            The path of the file.
+
+        """
+        with open(filepath, "wb") as f:
+            f.write(self.to_bytes())
+
+    def to_bytes(self):
+        # type: () -> bytes
+        """Returns the compact binary representation of this model.
+
+        Returns
+        -------
+        bytes
+
+        """
+        return model_to_bytes(self)
+
+    @classmethod
+    def from_binary(cls, filepath):
+        # type: (str) -> TimberModel
+        """Reads a model from a file written by :meth:`TimberModel.to_binary`.
+
+        Parameters
+        ----------
+        filepath : str
+            The path of the file.
+
+        Returns
+        -------
+        :class:`~compas_timber.model.TimberModel`
+
+        """
+        with open(filepath, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    @classmethod
+    def from_bytes(cls, data):
+        # type: (bytes) -> TimberModel
+        """Creates a model from the bytes returned by :meth:`TimberModel.to_bytes`.
+
+        Parameters
+        ----------
+        data : bytes
+            The binary representation of the model.
+
+        Returns
+        -------
+        :class:`~compas_timber.model.TimberModel`
+
+        """
+        return model_from_bytes(data, cls)
+
+    def to_jsonl(self, filepath):
+        # type: (str) -> None
+        """Writes this model to a JSON Lines file, one record per wall, beam, feature and joint.
+
+        The records are written one at a time, without building the data of the whole model in memory.
+        They are written to a temporary file next to `filepath`, which then replaces it, so that a failure
+        leaves no partial file behind.
+        Like with JSON, the features of the joints are re-calculated on demand after loading, unless
+        :attr:`TimberModel.persist_joinery` is set. See :mod:`compas_timber.model.jsonlines`.
+
+        Parameters
+        ----------
+        filepath : str
+            The path of the file.
+
+        """
+        temp_path = "{}.{}.tmp".format(filepath, uuid.uuid4().hex)
+        try:
+            with open(temp_path, "w") as f:
+                for line in self.jsonl_lines():
+                    f.write(line)
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def jsonl_lines(self):
+        # type: () -> Generator[str]
+        """Yields the lines of the JSON Lines representation of this model, e.g. to write them to any stream.
+
+        Returns
+        -------
+        generator(str)
+            The lines, each terminated by a newline.
+
+        """
+        return model_lines(self)
+
+    @staticmethod
+    def iter_jsonl(source, beam_filter=None):
+        # type: (str | Iterable[str], callable | None) -> Generator[dict]
+        """Yields the records of a JSON Lines model one at a time, without creating a model.
+
+        Each record is a dict with a "type", one of "model", "wall", "beam", "feature" and "joint",
+        see :mod:`compas_timber.model.jsonlines`.
+
+        Parameters
+        ----------
+        source : str | iterable(str)
+            The path of the file written by :meth:`TimberModel.to_jsonl`, or its lines.
+        beam_filter : callable, optional
+            Called with the plain JSON record of each beam, with its "guid" and "attributes", before the beam is
+            de-serialized. Beams for which it returns False are skipped, as are their features and joints.
+
+        Returns
+        -------
+        generator(dict)
+
+        Examples
+        --------
+        >>> studs = TimberModel.iter_jsonl("block.jsonl", lambda r: r["attributes"].get("category") == "stud")  # doctest: +SKIP
+        >>> volume = sum(r["beam"].blank.volume for r in studs if r["type"] == "beam")  # doctest: +SKIP
+
+        """
+        return read_records(source, beam_filter)
+
+    @classmethod
+    def from_jsonl(cls, source, beam_filter=None):
+        # type: (str | Iterable[str], callable | None) -> TimberModel
+        """Reads a model from a JSON Lines file written by :meth:`TimberModel.to_jsonl`, one record at a time.
+
+        Parameters
+        ----------
+        source : str | iterable(str)
+            The path of the file, or its lines.
+        beam_filter : callable, optional
+            Only the beams for which it returns True are loaded, with their features and the joints among them.
+            See :meth:`TimberModel.iter_jsonl`.
+
+        Returns
+        -------
+        :class:`~compas_timber.model.TimberModel`
+
+        """
+        return model_from_records(read_records(source, beam_filter), cls)
 
     def set_topologies(self, topologies):
         """TODO: calculate the topologies inside the model using the ConnectionSolver."""
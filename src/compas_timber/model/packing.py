@@ -0,0 +1,94 @@
+"""Helpers shared by the binary, JSON Lines and store representations of :class:`~compas_timber.model.TimberModel`."""
+
+import sys
+import uuid
+from array import array
+
+from compas.geometry import Frame
+from compas.geometry import Geometry
+from compas.geometry import Point
+from compas.geometry import Vector
+
+
+def pack_doubles(values):
+    """Returns the given values as little-endian doubles.
+
+    Parameters
+    ----------
+    values : iterable(float)
+
+    Returns
+    -------
+    bytes
+
+    """
+    doubles = array("d", values)
+    if sys.byteorder != "little":
+        doubles.byteswap()
+    return doubles.tobytes() if hasattr(doubles, "tobytes") else doubles.tostring()
+
+
+def unpack_doubles(data):
+    """Returns the little-endian doubles packed by :func:`pack_doubles`.
+
+    Parameters
+    ----------
+    data : bytes
+
+    Returns
+    -------
+    :class:`array.array`
+
+    """
+    doubles = array("d")
+    if hasattr(doubles, "frombytes"):
+        doubles.frombytes(data)
+    else:
+        doubles.fromstring(data)
+    if sys.byteorder != "little":
+        doubles.byteswap()
+    return doubles
+
+
+def frame_from_values(values):
+    """Returns the frame of the point, x-axis and y-axis given by the first nine values.
+
+    The axes are expected to be those of a frame, i.e. orthonormal, and are used as they are. Unlike the constructor
+    of :class:`~compas.geometry.Frame`, they are not unitized and orthogonalized again, which dominates loading.
+
+    Parameters
+    ----------
+    values : sequence(float)
+
+    Returns
+    -------
+    :class:`~compas.geometry.Frame`
+
+    """
+    frame = Frame.__new__(Frame)
+    Geometry.__init__(frame)
+    frame._point = Point(values[0], values[1], values[2])
+    frame._xaxis = Vector(values[3], values[4], values[5])
+    frame._yaxis = Vector(values[6], values[7], values[8])
+    frame._zaxis = None
+    return frame
+
+
+def extension_key(key):
+    """Returns the key of a blank extension from its string representation.
+
+    Blank extensions are keyed by the GUID of the joint which added them, other keys are returned as they are.
+
+    Parameters
+    ----------
+    key : str | None
+
+    Returns
+    -------
+    :class:`uuid.UUID` | str | None
+
+    """
+    try:
+        return uuid.UUID(key)
+    except (TypeError, ValueError):
+        return key
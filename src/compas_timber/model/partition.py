@@ -0,0 +1,163 @@
+from collections import OrderedDict
+
+from compas_timber.elements import Beam
+from compas_timber.elements import Wall
+
+
+class ModelPartition(object):
+    """The sub-models of a timber model and the joints between them, as returned by :meth:`TimberModel.partition`.
+
+    Each sub-model holds clones of the beams of one partition and of the joints among them, see
+    :meth:`TimberModel.clone`. The features and blank extensions of the joints between partitions, the boundary
+    joints, are removed from the clones. Sub-models can thus be processed independently, e.g. in parallel, and
+    stitched back together, after which the boundary joints are added last.
+
+    Parameters
+    ----------
+    models : :class:`collections.OrderedDict`
+        The sub-models by partition key.
+    boundary_joints : list(:class:`~compas_timber.connections.Joint`)
+        The joints of the original model whose beams are in different partitions.
+    walls : list(:class:`~compas_timber.elements.Wall`)
+        The walls of the original model which are not part of any sub-model.
+    model_type : type, optional
+        The type of the stitched model. Defaults to :class:`~compas_timber.model.TimberModel`.
+    lazy_features : bool, optional
+        The `lazy_features` of the stitched model.
+    persist_joinery : bool, optional
+        The `persist_joinery` of the stitched model.
+
+    Attributes
+    ----------
+    models : :class:`collections.OrderedDict`
+        The sub-models by partition key.
+    boundary_joints : list(:class:`~compas_timber.connections.Joint`)
+        The joints of the original model whose beams are in different partitions.
+    walls : list(:class:`~compas_timber.elements.Wall`)
+        The walls of the original model which are not part of any sub-model.
+
+    Examples
+    --------
+    >>> partition = model.partition()  # doctest: +SKIP
+    >>> with ProcessPoolExecutor() as executor:  # doctest: +SKIP
+    ...     keys = list(partition.models)
+    ...     results = executor.map(process, [partition.models[key].to_bytes() for key in keys])
+    ...     processed = {key: TimberModel.from_bytes(data) for key, data in zip(keys, results)}
+    >>> stitched, errors = partition.stitch(processed)  # doctest: +SKIP
+
+    """
+
+    def __init__(self, models, boundary_joints, walls, model_type=None, lazy_features=False, persist_joinery=False):
+        self.models = models
+        self.boundary_joints = boundary_joints
+        self.walls = walls
+        self._model_type = model_type
+        self._lazy_features = lazy_features
+        self._persist_joinery = persist_joinery
+
+    def __len__(self):
+        return len(self.models)
+
+    def __str__(self):
+        return "ModelPartition with {} sub-model(s) and {} boundary joint(s).".format(
+            len(self.models), len(self.boundary_joints)
+        )
+
+    def stitch(self, models=None):
+        """Creates a single model of the given processed sub-models, then adds the boundary joints.
+
+        The beams and joints of the sub-models are cloned into the stitched model, partition by partition, followed by
+        the boundary joints whose features are added, or deferred if `lazy_features` is set, last.
+        Boundary joints of beams which were removed from their sub-model are dropped.
+
+        Parameters
+        ----------
+        models : dict, optional
+            The processed sub-models by partition key, e.g. received from other processes. The beams must keep
+            their GUIDs. Defaults to :attr:`ModelPartition.models`.
+
+        Returns
+        -------
+        tuple(:class:`~compas_timber.model.TimberModel`, list(:class:`~compas_timber.connections.BeamJoinningError`))
+            The stitched model and the errors raised while adding the features of the boundary joints.
+
+        """
+        from .model import TimberModel
+
+        models = self.models if models is None else models
+        model_type = self._model_type or TimberModel
+        stitched = model_type(lazy_features=self._lazy_features, persist_joinery=self._persist_joinery)
+        for wall in self.walls:
+            stitched.add_wall(wall.copy(copy_guid=True))
+        for key in self.models:
+            model = models[key]
+            model._clone_into(stitched, model.elements(), model.joints)
+
+        joints = []
+        for joint in self.boundary_joints:
+            try:
+                clone = joint._clone(stitched)
+            except KeyError:
+                continue  # one of the beams was removed
+            clone.features = []
+            stitched.add_joint(clone, clone.beams)
+            joints.append(clone)
+        return stitched, stitched._add_joint_features(joints)
+
+
+def partition_model(model, key=None):
+    """Splits a timber model into sub-models, see :meth:`TimberModel.partition`.
+
+    Parameters
+    ----------
+    model : :class:`~compas_timber.model.TimberModel`
+        The model to partition.
+    key : callable, optional
+        Returns the partition key of a beam.
+
+    Returns
+    -------
+    :class:`ModelPartition`
+
+    """
+    groups = OrderedDict()  # partition key -> elements
+    keys = {}  # beam guid -> partition key
+    free_walls = []
+    for element in model.elements():
+        if isinstance(element, Beam):
+            if key is None:
+                wall = model.wall_of_beam(element)
+                beam_key = None if wall is None else str(wall.guid)
+            else:
+                beam_key = key(element)
+            keys[str(element.guid)] = beam_key
+            groups.setdefault(beam_key, []).append(element)
+        elif isinstance(element, Wall):
+            if key is None:
+                groups.setdefault(str(element.guid), []).append(element)
+            else:
+                free_walls.append(element)
+
+    internal = OrderedDict((partition_key, []) for partition_key in groups)
+    boundary = []
+    for joint in model.joints:
+        joint_keys = set(keys[str(beam.guid)] for beam in joint.beams)
+        if len(joint_keys) == 1:
+            internal[joint_keys.pop()].append(joint)
+        else:
+            boundary.append(joint)
+
+    models = OrderedDict()
+    for partition_key, elements in groups.items():
+        sub_model = type(model)(lazy_features=model.lazy_features, persist_joinery=model.persist_joinery)
+        model._clone_into(sub_model, elements, internal[partition_key])
+        models[partition_key] = sub_model
+
+    for joint in boundary:
+        for beam in joint.beams:
+            clone = models[keys[str(beam.guid)]].beam_by_guid(str(beam.guid))
+            if joint.guid in clone._blank_extensions:
+                clone.remove_blank_extension(joint.guid)
+            if joint.features:
+                clone.remove_features(joint.features)
+    return ModelPartition(models, boundary, free_walls, type(model), model.lazy_features, model.persist_joinery)
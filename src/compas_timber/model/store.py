@@ -0,0 +1,413 @@
+import json
+import mmap
+import os
+import shutil
+import struct
+import uuid
+
+from compas.data import json_dumps
+from compas.data import json_loads
+from compas.geometry import bounding_box
+
+from compas_timber.elements import Beam
+
+from .binary import BEAM_STRIDE
+from .packing import extension_key
+from .packing import frame_from_values
+from .packing import pack_doubles
+
+STORE_VERSION = 1
+RECORD_STRIDE = BEAM_STRIDE + 6  # the beam data followed by its axis-aligned bounding box
+_RECORD = struct.Struct("<{}d".format(RECORD_STRIDE))
+_AABB = struct.Struct("<6d")
+
+
+class ModelStore(object):
+    """A read-only, on-disk store of a timber model whose beams are materialized only when accessed.
+
+    A store is a directory with:
+
+    * ``beams.bin``: per beam, the frame's point, x-axis and y-axis, the length, width and height and the
+      axis-aligned bounding box of its blank as little-endian doubles.
+    * ``guids.bin``: the 16 bytes of the GUID of each beam.
+    * ``records.bin``: JSON records of the name, attributes, transformation, features and blank extensions of each
+      beam, of each joint and of each wall.
+    * ``index.json``: the offsets of the records and the beams by category and by joint type.
+
+    Only beams are materialized on access, the walls are few and materialized by :meth:`ModelStore.walls`.
+
+    The binary files are memory-mapped read-only, so that several processes opening the same store share one
+    copy of it. Queries work directly on the mapped data, without creating any beams.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the store, written by :meth:`ModelStore.write`.
+
+    Attributes
+    ----------
+    path : str
+        The directory of the store.
+    categories : list(str)
+        The categories of the beams in the store.
+    joint_types : list(str)
+        The names of the types of the joints in the store.
+
+    Examples
+    --------
+    >>> ModelStore.write(model, "site.store")  # doctest: +SKIP
+    >>> with ModelStore("site.store") as store:  # doctest: +SKIP
+    ...     studs = store.query(category="stud", bbox=(0, 0, 0, 10, 10, 3))
+    ...     beams = [store.beam(index) for index in studs]
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "index.json"), "r") as f:
+            self._index = json.load(f)
+        if self._index["version"] > STORE_VERSION:
+            raise ValueError("Unsupported model store version: {}".format(self._index["version"]))
+        self._files = []
+        self._beams = self._map("beams.bin")
+        self._guids = self._map("guids.bin")
+        self._records = self._map("records.bin")
+
+    def _map(self, name):
+        f = open(os.path.join(self.path, name), "rb")
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""  # empty files cannot be mapped
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self._index["count"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Closes the mapped files of this store. Beams materialized before remain valid."""
+        for mapped in (self._beams, self._guids, self._records):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    @property
+    def categories(self):
+        return sorted(self._index["categories"])
+
+    @property
+    def joint_types(self):
+        return sorted(self._index["joint_types"])
+
+    @staticmethod
+    def write(model, path):
+        """Writes the given model to a store at `path`.
+
+        The features of deferred joints are added before writing, the features stored for each beam are
+        thus all of its features, as are its blank extensions.
+
+        The store is written to a temporary directory next to `path`, which then replaces the store at `path`,
+        if any. Stores opened before keep reading the previous files.
+
+        Parameters
+        ----------
+        model : :class:`~compas_timber.model.TimberModel`
+            The model.
+        path : str
+            The directory of the store, created if it does not exist.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        ValueError
+            If `path` is an existing directory which is not a store.
+
+        """
+        path = os.path.normpath(path)
+        if os.path.exists(path) and not os.path.isfile(os.path.join(path, "index.json")):
+            raise ValueError("Not a model store, will not replace: {}".format(path))
+        temp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+        os.makedirs(temp_path)
+        try:
+            ModelStore._write_files(model, temp_path)
+            if os.path.exists(path):
+                old_path = "{}.{}.old".format(path, uuid.uuid4().hex)
+                os.rename(path, old_path)
+                os.rename(temp_path, path)
+                shutil.rmtree(old_path, ignore_errors=True)
+            else:
+                os.rename(temp_path, path)
+        except BaseException:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def _write_files(model, path):
+        beams = model.beams
+        indices = {id(beam): index for index, beam in enumerate(beams)}
+        categories = {}
+        joint_types = {}
+        joint_beams = []
+        beam_records = []
+        joint_records = []
+        records = []
+        offset = 0
+
+        def add_record(item):
+            record = json_dumps(item).encode("utf-8")
+            records.append(record)
+            return [offset, len(record)]
+
+        values = []
+        feature_indices = {}
+        for index, beam in enumerate(beams):
+            frame = beam.frame
+            values.extend(frame.point)
+            values.extend(frame.xaxis)
+            values.extend(frame.yaxis)
+            values.extend((beam.length, beam.width, beam.height))
+            vertices, _ = beam.blank.to_vertices_and_faces()
+            box = bounding_box(vertices)
+            values.extend(box[0])
+            values.extend(box[6])
+
+            category = beam._attributes.get("category")
+            if category is not None:
+                categories.setdefault(str(category), []).append(index)
+            features = beam.features  # adds the features of deferred joints
+            feature_indices.update((id(feature), [index, i]) for i, feature in enumerate(features))
+            item = {
+                "name": beam._name,
+                "attributes": beam._attributes,
+                "transformation": beam.transformation,
+                "features": features,
+                "blank_extensions": [
+                    [None if k is None else str(k), s, e] for k, (s, e) in beam._blank_extensions.items()
+                ],
+            }
+            beam_records.append(add_record(item))
+            offset += beam_records[-1][1]
+
+        for index, joint in enumerate(model.joints):
+            joint_types.setdefault(type(joint).__name__, []).append(index)
+            joint_beams.append([indices[id(beam)] for beam in joint.beams])
+            features = [feature_indices[id(f)] for f in joint.features if id(f) in feature_indices]
+            joint_records.append(add_record([joint, features]))
+            offset += joint_records[-1][1]
+
+        wall_records = []
+        for wall in model.walls:
+            wall_records.append(add_record(wall))
+            offset += wall_records[-1][1]
+
+        with open(os.path.join(path, "beams.bin"), "wb") as f:
+            f.write(pack_doubles(values))
+        with open(os.path.join(path, "guids.bin"), "wb") as f:
+            f.write(b"".join(beam.guid.bytes for beam in beams))
+        with open(os.path.join(path, "records.bin"), "wb") as f:
+            f.write(b"".join(records))
+        index = {
+            "version": STORE_VERSION,
+            "count": len(beams),
+            "beam_records": beam_records,
+            "joint_records": joint_records,
+            "wall_records": wall_records,
+            "joint_beams": joint_beams,
+            "categories": categories,
+            "joint_types": joint_types,
+        }
+        with open(os.path.join(path, "index.json"), "w") as f:
+            json.dump(index, f)
+
+    def _record(self, offset, length):
+        return json_loads(self._records[offset : offset + length].decode("utf-8"))
+
+    def guid(self, index):
+        """Returns the GUID of the beam at `index`.
+
+        Parameters
+        ----------
+        index : int
+
+        Returns
+        -------
+        :class:`uuid.UUID`
+
+        """
+        return uuid.UUID(bytes=bytes(self._guids[index * 16 : (index + 1) * 16]))
+
+    def aabb(self, index):
+        """Returns the axis-aligned bounding box of the blank of the beam at `index`.
+
+        Parameters
+        ----------
+        index : int
+
+        Returns
+        -------
+        tuple(float, float, float, float, float, float)
+            xmin, ymin, zmin, xmax, ymax, zmax
+
+        """
+        return _AABB.unpack_from(self._beams, (index * RECORD_STRIDE + BEAM_STRIDE) * 8)
+
+    def beam(self, index):
+        """Materializes the beam at `index`, with its attributes, features and blank extensions.
+
+        Every call creates a new :class:`~compas_timber.elements.Beam`.
+
+        Parameters
+        ----------
+        index : int
+
+        Returns
+        -------
+        :class:`~compas_timber.elements.Beam`
+
+        """
+        values = _RECORD.unpack_from(self._beams, index * RECORD_STRIDE * 8)
+        beam = Beam(frame_from_values(values), values[9], values[10], values[11])
+        beam._guid = self.guid(index)
+        item = self._record(*self._index["beam_records"][index])
+        beam._name = item["name"]
+        beam.attributes = item["attributes"]
+        beam.transformation = item.get("transformation")
+        beam.features = item["features"]
+        for key, start, end in item["blank_extensions"]:
+            beam.add_blank_extension(start, end, extension_key(key))
+        return beam
+
+    def beams(self, indices=None):
+        """Materializes the beams at the given indices, or all beams, one at a time.
+
+        Parameters
+        ----------
+        indices : list(int), optional
+
+        Returns
+        -------
+        generator(:class:`~compas_timber.elements.Beam`)
+
+        """
+        for index in range(len(self)) if indices is None else indices:
+            yield self.beam(index)
+
+    def walls(self):
+        """Materializes the walls of the store.
+
+        Returns
+        -------
+        list(:class:`~compas_timber.elements.Wall`)
+
+        """
+        return [self._record(*record) for record in self._index.get("wall_records", [])]
+
+    def joints(self, joint_type=None):
+        """Returns the indices of the joints, optionally only those of the given type, and the beams they join.
+
+        Parameters
+        ----------
+        joint_type : str | type, optional
+            The name of the joint type or the joint type.
+
+        Returns
+        -------
+        list(tuple(int, list(int)))
+            The index of each joint and the indices of its beams.
+
+        """
+        if joint_type is None:
+            selected = range(len(self._index["joint_records"]))
+        else:
+            name = joint_type if isinstance(joint_type, str) else joint_type.__name__
+            selected = self._index["joint_types"].get(name, [])
+        return [(index, self._index["joint_beams"][index]) for index in selected]
+
+    def query(self, category=None, bbox=None, joint_type=None):
+        """Returns the indices of the beams which match all the given criteria, without materializing any beam.
+
+        Parameters
+        ----------
+        category : str, optional
+            Only beams with this category attribute.
+        bbox : tuple(float, float, float, float, float, float), optional
+            Only beams whose bounding box overlaps xmin, ymin, zmin, xmax, ymax, zmax.
+        joint_type : str | type, optional
+            Only beams joined by a joint of this type, given by name or type.
+
+        Returns
+        -------
+        list(int)
+            Sorted indices of the beams.
+
+        """
+        if category is None:
+            candidates = range(len(self))
+        else:
+            candidates = self._index["categories"].get(str(category), [])
+        if joint_type is not None:
+            joined = set()
+            for _, beams in self.joints(joint_type):
+                joined.update(beams)
+            candidates = [index for index in candidates if index in joined]
+        if bbox is not None:
+            xmin, ymin, zmin, xmax, ymax, zmax = bbox
+            result = []
+            for index in candidates:
+                axmin, aymin, azmin, axmax, aymax, azmax = self.aabb(index)
+                if (
+                    axmin <= xmax
+                    and axmax >= xmin
+                    and aymin <= ymax
+                    and aymax >= ymin
+                    and azmin <= zmax
+                    and azmax >= zmin
+                ):
+                    result.append(index)
+            candidates = result
+        return sorted(candidates)
+
+    def to_model(self, indices=None):
+        """Materializes a timber model of the walls, the given beams, or all beams, and the joints between them.
+
+        The stored features and blank extensions are restored, the joints are not re-calculated.
+        The walls are added before the beams.
+
+        Parameters
+        ----------
+        indices : list(int), optional
+
+        Returns
+        -------
+        :class:`~compas_timber.model.TimberModel`
+
+        """
+        from .model import TimberModel
+
+        indices = range(len(self)) if indices is None else sorted(set(indices))
+        model = TimberModel()
+        for wall in self.walls():
+            model.add_wall(wall)
+        beams = {}
+        for index in indices:
+            beams[index] = self.beam(index)
+            model.add_beam(beams[index])
+
+        for joint_index, joint_beams in enumerate(self._index["joint_beams"]):
+            if not all(index in beams for index in joint_beams):
+                continue
+            joint, features = self._record(*self._index["joint_records"][joint_index])
+            model.add_joint(joint, [beams[index] for index in joint_beams])
+            joint.restore_beams_from_keys(model)
+            joint.features = [beams[index]._features[i] for index, i in features]
+        return model
@@ -0,0 +1,11 @@
+from .pipeline import Pipeline
+from .pipeline import PipelineResult
+from .pipeline import load_rules
+from .pipeline import write_atomic
+
+__all__ = [
+    "Pipeline",
+    "PipelineResult",
+    "load_rules",
+    "write_atomic",
+]
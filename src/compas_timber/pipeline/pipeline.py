@@ -0,0 +1,330 @@
+import hashlib
+import json
+import os
+import uuid
+
+from compas.data import json_dumps
+from compas.data import json_loads
+
+from compas_timber import connections
+from compas_timber.connections import JointTopology
+from compas_timber.design import CategoryRule
+from compas_timber.design import DirectRule
+from compas_timber.design import JointDefinition
+from compas_timber.design import JointRuleSolver
+from compas_timber.design import TopologyRule
+from compas_timber.design import find_topologies
+from compas_timber.elements import Beam
+from compas_timber.elements import FeatureApplicationError
+from compas_timber.fabrication import BTLx
+from compas_timber.model import TimberModel
+
+
+def write_atomic(path, text):
+    """Writes the given text to a file such that the file is either fully written or not touched at all.
+
+    The text is written to a temporary file next to `path`, which then replaces `path`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+    text : str
+        The content of the file.
+
+    Returns
+    -------
+    None
+
+    """
+    temp_path = "{}.{}.tmp".format(path, uuid.uuid4().hex)
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_rules(data, beams):
+    """Creates joint rules from their JSON representation.
+
+    Each rule is a dict with a "type" of either "topology", "category" or "direct", the name of a joint class from
+    :mod:`compas_timber.connections` as "joint" and optionally the keyword arguments of the joint as "kwargs".
+
+    * topology rules define the "topology" by name, e.g. "TOPO_L".
+    * category rules define "category_a", "category_b" and optionally a list of allowed "topos" by name.
+    * direct rules define the indices of the two "beams" they join.
+
+    Parameters
+    ----------
+    data : list(dict)
+        The rules.
+    beams : list(:class:`~compas_timber.elements.Beam`)
+        The beams, referred to by index by direct rules.
+
+    Returns
+    -------
+    list(:class:`~compas_timber.design.JointRule`)
+
+    """
+    rules = []
+    for rule in data:
+        joint_type = getattr(connections, rule["joint"])
+        kwargs = rule.get("kwargs", {})
+        rule_type = rule["type"]
+        if rule_type == "topology":
+            rules.append(TopologyRule(getattr(JointTopology, rule["topology"]), joint_type, **kwargs))
+        elif rule_type == "category":
+            topos = [getattr(JointTopology, topo) for topo in rule.get("topos", [])]
+            rules.append(CategoryRule(joint_type, rule["category_a"], rule["category_b"], topos, **kwargs))
+        elif rule_type == "direct":
+            rules.append(DirectRule(joint_type, [beams[index] for index in rule["beams"]], **kwargs))
+        else:
+            raise ValueError("Unknown rule type: {}".format(rule_type))
+    return rules
+
+
+class PipelineResult(object):
+    """The outputs of a run of :class:`Pipeline`.
+
+    Attributes
+    ----------
+    model_json : str
+        The JSON representation of the timber model.
+    btlx : str
+        The BTLx document of the model.
+    conflicts : list(str)
+        Conflicts between the joint rules and the detected topologies.
+    errors : list(str)
+        Errors raised while joining the beams.
+    feature_errors : list(str)
+        Errors raised while applying the features to the geometry of the beams for the BTLx, if a
+        :class:`~compas.geometry.Brep` backend is available.
+    computed : list(str)
+        The names of the stages which were computed by this run, i.e. which were not found in the cache.
+
+    """
+
+    def __init__(self, model_json, btlx, conflicts, errors, computed, feature_errors=None):
+        self.model_json = model_json
+        self.btlx = btlx
+        self.conflicts = conflicts
+        self.errors = errors
+        self.feature_errors = feature_errors or []
+        self.computed = computed
+
+    @property
+    def model(self):
+        """The timber model, de-serialized from :attr:`PipelineResult.model_json`."""
+        return json_loads(self.model_json)
+
+    def write(self, model_path=None, btlx_path=None):
+        """Writes the model JSON and/or the BTLx document to the given paths.
+
+        Parameters
+        ----------
+        model_path : str, optional
+            The path of the model JSON file.
+        btlx_path : str, optional
+            The path of the BTLx file.
+
+        Returns
+        -------
+        None
+
+        """
+        if model_path:
+            write_atomic(model_path, self.model_json)
+        if btlx_path:
+            write_atomic(btlx_path, self.btlx)
+
+
+class Pipeline(object):
+    """Runs the design to fabrication flow of centerlines, beams, topologies, joint rules, model and BTLx headless.
+
+    Each stage is memoized by a hash of its inputs, which include the hashes of the stages it depends on.
+    Re-running with e.g. one changed rule re-uses the beams and topologies and re-computes only the joints,
+    the model and the BTLx.
+    Stage results are kept in memory and, if `cache_dir` is given, on disk so that they can be shared between runs.
+
+    Parameters
+    ----------
+    cache_dir : str, optional
+        A directory in which to persist the stage results.
+
+    Attributes
+    ----------
+    DEFAULT_SETTINGS : dict
+        The default settings, which can be overridden by the rules JSON: the "width" and "height" of the beams,
+        the "max_distance" at which beams are considered intersecting and whether to use "rtree" to find
+        neighboring beams.
+
+    """
+
+    DEFAULT_SETTINGS = {"width": 0.12, "height": 0.06, "max_distance": None, "rtree": False}
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._memory = {}
+        if cache_dir and not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+
+    @staticmethod
+    def _hash(*inputs):
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _stage(self, name, inputs, compute, computed):
+        """Returns the key and the JSON string result of a stage, computing it only if it is not cached."""
+        key = self._hash(name, inputs)
+        if key in self._memory:
+            return key, self._memory[key]
+
+        path = os.path.join(self.cache_dir, "{}_{}.json".format(name, key)) if self.cache_dir else None
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                result = f.read()
+        else:
+            result = compute()
+            computed.append(name)
+            if path:
+                write_atomic(path, result)
+        self._memory[key] = result
+        return key, result
+
+    def run(self, centerlines, rules):
+        """Runs the pipeline.
+
+        Parameters
+        ----------
+        centerlines : str
+            The path of a JSON file with a list of :class:`~compas.geometry.Line`, e.g. `data/lines.json`.
+        rules : str | dict
+            The path of a JSON file, or its content, with a list of "rules" (see :func:`load_rules`),
+            optionally a list of "categories" of the beams and overrides of :attr:`Pipeline.DEFAULT_SETTINGS`.
+
+        Returns
+        -------
+        :class:`PipelineResult`
+
+        """
+        if not isinstance(rules, dict):
+            with open(rules, "r", encoding="utf-8") as f:
+                rules = json.load(f)
+        settings = dict(self.DEFAULT_SETTINGS)
+        settings.update({key: rules[key] for key in settings if key in rules})
+        computed = []
+
+        with open(centerlines, "r", encoding="utf-8") as f:
+            lines_json = f.read()
+        lines_key = self._hash("centerlines", lines_json)
+
+        beams_inputs = [lines_key, settings["width"], settings["height"], rules.get("categories")]
+        beams_key, beams_json = self._stage(
+            "beams", beams_inputs, lambda: self._create_beams(lines_json, settings, rules.get("categories")), computed
+        )
+
+        topologies_inputs = [beams_key, settings["max_distance"]]
+        topologies_key, topologies_json = self._stage(
+            "topologies", topologies_inputs, lambda: self._find_topologies(beams_json, settings), computed
+        )
+
+        joints_inputs = [topologies_key, rules.get("rules", [])]
+        joints_key, joints_json = self._stage(
+            "joints",
+            joints_inputs,
+            lambda: self._resolve_joints(beams_json, topologies_json, rules.get("rules", [])),
+            computed,
+        )
+
+        model_key, model_json = self._stage(
+            "model", [joints_key], lambda: self._create_model(beams_json, joints_json), computed
+        )
+
+        _, btlx_json = self._stage("btlx", [model_key], lambda: self._create_btlx(model_json), computed)
+
+        joints = json.loads(joints_json)
+        model = json.loads(model_json)
+        btlx = json.loads(btlx_json)
+        return PipelineResult(
+            model["model"], btlx["btlx"], joints["conflicts"], model["errors"], computed, btlx["feature_errors"]
+        )
+
+    @staticmethod
+    def _create_beams(lines_json, settings, categories):
+        beams = []
+        for index, line in enumerate(json_loads(lines_json)):
+            beam = Beam.from_centerline(line, settings["width"], settings["height"])
+            if isinstance(categories, list):
+                beam.attributes["category"] = categories[index]
+            elif isinstance(categories, dict) and str(index) in categories:
+                beam.attributes["category"] = categories[str(index)]
+            beams.append(beam)
+        # attributes are not part of the data of the beams
+        return json_dumps({"beams": beams, "attributes": [beam._attributes for beam in beams]})
+
+    @staticmethod
+    def _load_beams(beams_json):
+        data = json_loads(beams_json)
+        for beam, attributes in zip(data["beams"], data["attributes"]):
+            beam.attributes = attributes
+        return data["beams"]
+
+    @staticmethod
+    def _find_topologies(beams_json, settings):
+        beams = Pipeline._load_beams(beams_json)
+        indices = {id(beam): index for index, beam in enumerate(beams)}
+        topologies = find_topologies(beams, max_distance=settings["max_distance"], rtree=settings["rtree"])
+        return json.dumps(
+            [[topo["detected_topo"], indices[id(topo["beam_a"])], indices[id(topo["beam_b"])]] for topo in topologies]
+        )
+
+    @staticmethod
+    def _resolve_joints(beams_json, topologies_json, rules_data):
+        beams = Pipeline._load_beams(beams_json)
+        indices = {id(beam): index for index, beam in enumerate(beams)}
+        topologies = [
+            {"detected_topo": topo, "beam_a": beams[a], "beam_b": beams[b]}
+            for topo, a, b in json.loads(topologies_json)
+        ]
+        definitions, conflicts = JointRuleSolver(load_rules(rules_data, beams)).resolve(topologies)
+        joints = [
+            {
+                "joint": definition.joint_type.__name__,
+                "beams": [indices[id(beam)] for beam in definition.beams],
+                "kwargs": definition.kwargs,
+            }
+            for definition in definitions
+        ]
+        return json.dumps({"joints": joints, "conflicts": conflicts})
+
+    @staticmethod
+    def _create_model(beams_json, joints_json):
+        beams = Pipeline._load_beams(beams_json)
+        model = TimberModel()
+        for beam in beams:
+            model.add_beam(beam)
+        definitions = [
+            JointDefinition(
+                getattr(connections, joint["joint"]), [beams[index] for index in joint["beams"]], **joint["kwargs"]
+            )
+            for joint in json.loads(joints_json)["joints"]
+        ]
+        _, errors = model.add_joints(definitions)
+        errors = [error.debug_info or repr(error) for error in errors]
+        return json.dumps({"model": json_dumps(model), "errors": errors})
+
+    @staticmethod
+    def _create_btlx(model_json):
+        model = json_loads(json.loads(model_json)["model"])
+        btlx = BTLx(model).btlx_string()
+        # the beam geometries computed for the BTLx collect the features which could not be applied
+        feature_errors = [
+            error.message
+            for beam in model.beams
+            for error in beam.debug_info
+            if isinstance(error, FeatureApplicationError)
+        ]
+        return json.dumps({"btlx": btlx, "feature_errors": feature_errors})
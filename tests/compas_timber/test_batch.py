@@ -0,0 +1,85 @@
+import os
+import shutil
+
+from compas_timber.batch import format_summary
+from compas_timber.batch import output_names
+from compas_timber.batch import run
+from compas_timber.elements import Beam
+from compas_timber.elements import FeatureApplicationError
+
+LINES = os.path.abspath(r"data/lines.json")
+RULES = {"rules": [{"type": "topology", "topology": "TOPO_T", "joint": "TButtJoint"}], "max_distance": 0.01}
+
+
+def _variants(tmp_path):
+    paths = []
+    for name in ("a", "b"):
+        path = str(tmp_path / "{}.json".format(name))
+        shutil.copy(LINES, path)
+        paths.append(path)
+    broken = tmp_path / "broken.json"
+    broken.write_text("not json")
+    return paths + [str(broken)]
+
+
+def test_run_reports_each_model(tmp_path):
+    paths = _variants(tmp_path)
+    output = str(tmp_path / "out")
+    progress = []
+
+    summaries = run(
+        paths, RULES, output, workers=1, on_progress=lambda summary, done, total: progress.append((done, total))
+    )
+
+    assert [summary["path"] for summary in summaries] == paths
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert sorted(os.listdir(output)) == ["a.btlx", "a.json", "b.btlx", "b.json"]
+    assert summaries[2]["error"].startswith("JSONDecodeError")
+    assert summaries[2]["model"] is None
+
+
+def test_run_process_pool(tmp_path):
+    paths = _variants(tmp_path)[:2]
+    output = str(tmp_path / "out")
+
+    summaries = run(paths, RULES, output, workers=2, cache_dir=str(tmp_path / "cache"))
+
+    assert all(summary["error"] is None for summary in summaries)
+    assert all(os.path.exists(summary["btlx"]) for summary in summaries)
+
+
+def test_run_duplicate_names(tmp_path):
+    paths = []
+    for folder in ("a", "b"):
+        (tmp_path / folder).mkdir()
+        path = str(tmp_path / folder / "lines.json")
+        shutil.copy(LINES, path)
+        paths.append(path)
+    paths.append(paths[0])
+    output = str(tmp_path / "out")
+
+    summaries = run(paths, RULES, output, workers=1)
+
+    assert [summary["path"] for summary in summaries] == paths
+    assert len(set(summary["btlx"] for summary in summaries)) == 3
+    assert sorted(os.listdir(output)) == [
+        "lines_{}.{}".format(number, extension) for number in (1, 2, 3) for extension in ("btlx", "json")
+    ]
+
+
+def test_output_names():
+    assert output_names(["a/x.json", "b/x.json", "y.json"]) == ["x_1", "x_2", "y"]
+
+
+def test_run_reports_feature_errors(tmp_path, mocker):
+    def compute_geometry(beam, include_features=True):
+        beam.debug_info.append(FeatureApplicationError(None, None, "does not intersect"))
+        raise NotImplementedError  # no Brep backend, the BTLx falls back to the blank
+
+    mocker.patch.object(Beam, "compute_geometry", compute_geometry)
+
+    summary = run(_variants(tmp_path)[:1], RULES, str(tmp_path / "out"), workers=1)[0]
+
+    assert summary["error"] is None
+    assert summary["feature_errors"] and set(summary["feature_errors"]) == {"does not intersect"}
+    assert "feature error(s)" in format_summary(summary)
@@ -77,3 +77,52 @@ def test_reset_computed(mocker):
     b.add_features(mocker.Mock())
 
     assert b._geometry is None
+
+
+def test_empty_containers_are_shared_until_written():
+    B1 = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.2)
+    B2 = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.2)
+
+    assert B1._features is B2._features
+    assert B1._attributes is B2._attributes
+    assert B1._blank_extensions is B2._blank_extensions
+
+    B1.attributes["category"] = "stud"
+    B1.add_blank_extension(0.1, 0.2)
+    B1.debug_info.append("error")
+
+    assert B1.attributes == {"category": "stud"} and not B2.attributes
+    assert B1._blank_extensions == {None: (0.1, 0.2)} and not B2._blank_extensions
+    assert B1.debug_info == ["error"] and not B2.debug_info
+    assert B2._features is B1._features
+
+
+def test_attributes_are_interned():
+    B1 = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.2)
+    B2 = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.2)
+
+    B1.attributes = {"".join(["cate", "gory"]): "".join(["st", "ud"])}
+    B2.attributes = {"".join(["categ", "ory"]): "".join(["stu", "d"])}
+
+    (key_1, value_1), (key_2, value_2) = list(B1.attributes.items()) + list(B2.attributes.items())
+    assert key_1 is key_2 and value_1 is value_2
+
+
+def test_element_arguments_are_not_attributes():
+    beam = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.2, name="stud")
+
+    assert beam.name == "stud"
+    assert beam.attributes == {}
+
+
+def test_shared_empty_containers_are_immutable():
+    B1 = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.2)
+
+    with pytest.raises(TypeError):
+        B1._blank_extensions["key"] = (0.1, 0.2)
+    with pytest.raises(AttributeError):
+        B1._features.append("feature")
+
+    B2 = copy.deepcopy(B1)
+    B2.attributes["category"] = "stud"
+    assert not Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.2).attributes
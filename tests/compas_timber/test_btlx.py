@@ -1,3 +1,8 @@
+import gzip
+import json
+import xml.etree.ElementTree as ET
+import zipfile
+
 import pytest
 
 from compas.geometry import Line
@@ -5,8 +10,15 @@ from compas.geometry import Point
 from compas.geometry import Frame
 from compas.geometry import Vector
 
+from compas_timber.connections import TButtJoint
+from compas_timber.connections import XHalfLapJoint
 from compas_timber.elements import Beam
+from compas_timber.elements import DrillFeature
+from compas_timber.fabrication import BTLx
 from compas_timber.fabrication import BTLxPart
+from compas_timber.fabrication import LapFeatureFactory
+from compas_timber.fabrication import TButtFactory
+from compas_timber.model import TimberModel
 
 
 @pytest.fixture
@@ -15,6 +27,24 @@ def mock_beam():
     return Beam.from_centerline(centerline, width=1.0, height=1.0)
 
 
+@pytest.fixture
+def t_butt_model():
+    main = Beam.from_endpoints(Point(0, 0.5, 0), Point(1, 0.5, 0), z_vector=Vector(0, 0, 1), width=0.1, height=0.1)
+    cross = Beam.from_endpoints(Point(0, 0, 0), Point(0, 1, 0), z_vector=Vector(0, 0, 1), width=0.1, height=0.1)
+    model = TimberModel()
+    model.add_beam(main)
+    model.add_beam(cross)
+    TButtJoint.create(model, main, cross, mill_depth=0.01)
+    return model
+
+
+def _processings(btlx, beam):
+    return [
+        (p.process_type, p.header_attributes, dict(p.process_parameters))
+        for p in btlx.parts[str(beam.guid)].processings
+    ]
+
+
 def test_beam_ref_faces(mock_beam):
     # https://www.design2machine.com/btlx/btlx_20.pdf page 5
     btlx_part = BTLxPart(mock_beam, 0)
@@ -93,3 +123,165 @@ def test_beam_ref_edges(mock_beam):
         ref_edge = mock_beam.ref_edges[index]
         assert ref_edges_expected[index] == ref_edge
         assert ref_edge.name == "RE_{}".format(index + 1)
+
+
+def test_part_shape_strings(mock_beam):
+    btlx_part = BTLxPart(mock_beam, 0)
+
+    coord_index, points = btlx_part.shape_strings
+    coordinates = [float(value) for value in points.split()]
+    indices = [int(index) for index in coord_index.split()]
+
+    assert len(coordinates) == 8 * 3  # duplicate vertices are merged
+    assert indices.count(-1) == 6
+    assert max(indices) == 7
+    assert all(value >= 0.0 for value in coordinates)  # the part frame puts the blank in positive coordinates
+    assert max(coordinates) == pytest.approx(mock_beam.blank_length, abs=1e-3)
+
+
+def test_part_ref_sides_from_faces(mock_beam):
+    btlx_part = BTLxPart(mock_beam, 0)
+    surfaces = btlx_part.reference_surfaces
+
+    ref_sides = btlx_part.ref_sides_from_faces(surfaces)
+
+    assert ref_sides == [1, 2, 3, 4, 5, 6]
+    assert btlx_part.reference_surfaces is surfaces
+    assert btlx_part.ref_side_from_face(mock_beam.faces[3]) == btlx_part.ref_sides_from_faces(mock_beam.faces)[3]
+
+
+def test_part_ref_side_from_face_no_match(mock_beam):
+    btlx_part = BTLxPart(mock_beam, 0)
+    oblique = Frame(Point(0, 0, 0), Vector(1, 1, 0), Vector(0, 0, 1))
+
+    with pytest.raises(ValueError):
+        btlx_part.ref_side_from_face(oblique)
+    with pytest.raises(ValueError):
+        btlx_part.ref_sides_from_faces([mock_beam.faces[0], oblique])
+    assert btlx_part.ref_sides_from_faces([]) == []
+
+
+def test_part_shape_element(mock_beam):
+    btlx_part = BTLxPart(mock_beam, 0)
+
+    indexed_face_set = btlx_part.et_shape.find("IndexedFaceSet")
+
+    assert indexed_face_set.get("coordIndex") == btlx_part.shape_strings[0]
+    assert indexed_face_set.find("Coordinate").get("point") == btlx_part.shape_strings[1]
+
+
+def test_process_features_matches_joint_factories(t_butt_model):
+    main, cross = t_butt_model.beams
+
+    from_joints = BTLx(t_butt_model)
+    from_features = BTLx(t_butt_model, process_features=True)
+
+    assert [p[0] for p in _processings(from_features, main)] == ["JackRafterCut"]
+    assert [p[0] for p in _processings(from_features, cross)] == ["Lap"]
+    # processing names differ, the geometric parameters should not
+    for beam in t_butt_model.beams:
+        expected = [(p[0], p[1]["ReferencePlaneID"], p[2]) for p in _processings(from_joints, beam)]
+        assert [(p[0], p[1]["ReferencePlaneID"], p[2]) for p in _processings(from_features, beam)] == expected
+
+
+def test_process_features_lap_from_feature_factory(t_butt_model, mocker):
+    _, cross = t_butt_model.beams
+    joint_factory = mocker.spy(TButtFactory, "apply_processings")
+    lap_factory = mocker.spy(LapFeatureFactory, "apply_processings")
+
+    btlx = BTLx(t_butt_model, process_features=True)
+
+    assert joint_factory.call_count == 0
+    assert lap_factory.call_count == 1
+    assert [p[0] for p in _processings(btlx, cross)] == ["Lap"]
+
+
+def test_user_drill_feature_reaches_btlx(t_butt_model):
+    main, _ = t_butt_model.beams
+    main.add_features(DrillFeature(Line(Point(0.5, 0.5, 0.3), Point(0.5, 0.5, -0.3)), 0.01, 0.6))
+
+    for btlx in (BTLx(t_butt_model), BTLx(t_butt_model, process_features=True)):
+        drilling = _processings(btlx, main)[-1]
+        process_type, header, params = drilling
+
+        assert process_type == "Drilling"
+        assert header["ReferencePlaneID"] == "4"
+        assert params["StartX"] == "0.500"
+        assert params["Inclination"] == "90.000"
+        assert params["DepthLimited"] == "no"
+        assert params["Depth"] == "0.100"
+
+
+def test_process_features_unsupported_feature():
+    model = TimberModel()
+    beam_a = Beam.from_endpoints(Point(3, 1, 0), Point(4, 0, 0), width=0.2, height=0.2)
+    beam_b = Beam.from_endpoints(Point(3, 0, 0), Point(4, 1, 0), width=0.2, height=0.2)
+    model.add_beam(beam_a)
+    model.add_beam(beam_b)
+    XHalfLapJoint.create(model, beam_a, beam_b)
+
+    with pytest.raises(ValueError, match="no joint factory"):
+        BTLx(model, process_features=True)
+
+
+def test_process_features_birdsmouth_uses_joint_factory():
+    main = Beam.from_endpoints(Point(0, 0.5, 0), Point(1, 0.5, 0.3), z_vector=Vector(0, 0, 1), width=0.1, height=0.1)
+    cross = Beam.from_endpoints(Point(0, 0, 0), Point(0, 1, 0), z_vector=Vector(0, 0, 1), width=0.1, height=0.1)
+    model = TimberModel()
+    model.add_beam(main)
+    model.add_beam(cross)
+    TButtJoint.create(model, main, cross, birdsmouth=True)
+
+    from_joints = BTLx(model)
+    from_features = BTLx(model, process_features=True)
+
+    assert [p[0] for p in _processings(from_features, main)] == ["DoubleCut"]
+    assert _processings(from_features, main) == _processings(from_joints, main)
+
+
+def test_write_shards_by_category(tmp_path):
+    model = TimberModel()
+    for index, category in enumerate(["stud", "stud", "plate", None]):
+        beam = Beam.from_endpoints(Point(index, 0, 0), Point(index, 0, 1), width=0.1, height=0.1)
+        if category:
+            beam.attributes["category"] = category
+        model.add_beam(beam)
+    btlx = BTLx(model)
+
+    manifest = btlx.write_shards(str(tmp_path), "category", workers=2)
+
+    assert [shard["name"] for shard in manifest["shards"]] == ["stud", "plate", "unassigned"]
+    assert [shard["part_count"] for shard in manifest["shards"]] == [2, 1, 1]
+    assert (tmp_path / BTLx.MANIFEST_NAME).exists()
+    for shard in manifest["shards"]:
+        root = ET.parse(str(tmp_path / shard["file"])).getroot()
+        parts = root.findall("{https://www.design2machine.com}Project/{https://www.design2machine.com}Parts/*")
+        assert len(parts) == shard["part_count"]
+
+
+def test_write_archive_gzip(t_butt_model, tmp_path):
+    btlx = BTLx(t_butt_model)
+    path = str(tmp_path / "model.btlx.gz")
+
+    btlx.write_archive(path)
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        root = ET.fromstring(f.read())
+    assert len(root.findall(".//{https://www.design2machine.com}Part")) == 2
+
+
+def test_write_archive_zip_shards(t_butt_model, tmp_path):
+    main, cross = t_butt_model.beams
+    main.attributes["category"] = "main"
+    cross.attributes["category"] = "cross"
+    btlx = BTLx(t_butt_model)
+    path = str(tmp_path / "model.zip")
+
+    btlx.write_archive(path, key="category")
+
+    with zipfile.ZipFile(path) as archive:
+        assert sorted(archive.namelist()) == ["cross.btlx", "main.btlx", BTLx.MANIFEST_NAME]
+        manifest = json.loads(archive.read(BTLx.MANIFEST_NAME))
+        assert [shard["parts"] for shard in manifest["shards"]] == [[str(main.guid)], [str(cross.guid)]]
+        root = ET.fromstring(archive.read("main.btlx"))
+        assert len(root.findall(".//{https://www.design2machine.com}Part")) == 1
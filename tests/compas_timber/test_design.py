@@ -0,0 +1,53 @@
+from compas.geometry import Point
+
+from compas_timber.connections import JointTopology
+from compas_timber.connections import LButtJoint
+from compas_timber.connections import LMiterJoint
+from compas_timber.connections import TButtJoint
+from compas_timber.connections import XHalfLapJoint
+from compas_timber.design import CategoryRule
+from compas_timber.design import DirectRule
+from compas_timber.design import JointRuleSolver
+from compas_timber.design import TopologyRule
+from compas_timber.design import find_topologies
+from compas_timber.elements import Beam
+
+
+def _beams():
+    # a rectangle of four beams with a stud in the middle
+    points = [Point(0, 0, 0), Point(2, 0, 0), Point(2, 2, 0), Point(0, 2, 0)]
+    beams = [Beam.from_endpoints(points[i], points[(i + 1) % 4], width=0.1, height=0.1) for i in range(4)]
+    stud = Beam.from_endpoints(Point(1, 0, 0), Point(1, 2, 0), width=0.1, height=0.1)
+    for beam in beams:
+        beam.attributes["category"] = "frame"
+    stud.attributes["category"] = "stud"
+    return beams + [stud]
+
+
+def test_find_topologies():
+    topologies = find_topologies(_beams(), max_distance=0.01)
+
+    kinds = sorted(topo["detected_topo"] for topo in topologies)
+    assert kinds == [JointTopology.TOPO_L] * 4 + [JointTopology.TOPO_T] * 2
+
+
+def test_resolve_rules_precedence():
+    beams = _beams()
+    stud = beams[4]
+    rules = [
+        TopologyRule(JointTopology.TOPO_L, LMiterJoint),
+        TopologyRule(JointTopology.TOPO_T, TButtJoint),
+        CategoryRule(TButtJoint, "stud", "frame"),
+        DirectRule(LButtJoint, [beams[0], beams[1]]),
+        CategoryRule(XHalfLapJoint, "frame", "frame"),
+    ]
+
+    joints, conflicts = JointRuleSolver(rules).resolve(find_topologies(beams, max_distance=0.01))
+
+    assert len(joints) == 6
+    by_pair = {frozenset(id(b) for b in joint.beams): joint for joint in joints}
+    assert by_pair[frozenset([id(beams[0]), id(beams[1])])].joint_type is LButtJoint
+    assert by_pair[frozenset([id(beams[1]), id(beams[2])])].joint_type is LMiterJoint
+    stud_joints = [joint for joint in joints if stud in joint.beams]
+    assert all(joint.joint_type is TButtJoint and joint.beams[0] is stud for joint in stud_joints)
+    assert len(conflicts) == 3  # frame-frame X-lap rule does not fit the remaining L corners
@@ -8,12 +8,15 @@ from compas.geometry import Line
 from compas.geometry import Point
 from compas.geometry import Vector
 
+from compas_timber.connections import ConnectionSolver
 from compas_timber.connections import LButtJoint
 from compas_timber.connections import LHalfLapJoint
+from compas_timber.connections import LapJoint
 from compas_timber.connections import TButtJoint
 from compas_timber.connections import THalfLapJoint
 from compas_timber.connections import XHalfLapJoint
 from compas_timber.connections import find_neighboring_beams
+from compas_timber.design import JointDefinition
 from compas_timber.elements import Beam
 from compas_timber.model import TimberModel
 
@@ -226,3 +229,74 @@ if not compas.IPY:
         assert len(expected_result) == len(result)
         for pair in key_sets:
             assert pair in expected_result
+
+
+def test_find_nodes():
+    # a post with two beams ending on it and a separate L-corner
+    post = Beam.from_endpoints(Point(0, 0, -1), Point(0, 0, 1), width=0.1, height=0.1)
+    beam_x = Beam.from_endpoints(Point(0, 0, 0), Point(1, 0, 0), width=0.1, height=0.1)
+    beam_y = Beam.from_endpoints(Point(0, 1, 0), Point(0, 0, 0), width=0.1, height=0.1)
+    corner_a = Beam.from_endpoints(Point(5, 0, 0), Point(6, 0, 0), width=0.1, height=0.1)
+    corner_b = Beam.from_endpoints(Point(5, 0, 0), Point(5, 1, 0), width=0.1, height=0.1)
+    beams = [post, beam_x, beam_y, corner_a, corner_b]
+
+    nodes = ConnectionSolver().find_nodes(beams, max_distance=0.01)
+
+    assert len(nodes) == 1
+    node = nodes[0]
+    assert node.beams == [post, beam_x, beam_y]
+    assert node.point.distance_to_point(Point(0, 0, 0)) < 1e-6
+    assert node.roles[str(post.guid)] == "through"
+    assert node.roles[str(beam_x.guid)] == "start"
+    assert node.roles[str(beam_y.guid)] == "end"
+    assert node.through_beams == [post]
+
+    assert len(ConnectionSolver().find_nodes(beams, max_distance=0.01, min_beams=2)) == 2
+
+
+def test_precompute_lap_negative_volumes_matches_scalar(example_model):
+    beams = example_model.beams
+    joints = []
+    for index, (beam_a, beam_b) in enumerate(zip(beams, beams[1:] + beams[:1])):
+        joint = XHalfLapJoint(beam_a, beam_b, flip_lap_side=bool(index % 2), cut_plane_bias=0.3 + 0.1 * index)
+        if beam_a.centerline.vector.cross(beam_b.centerline.vector).length > 1e-6:
+            joints.append(joint)
+
+    XHalfLapJoint.precompute_negative_volumes(joints)
+    batched = [joint._create_negative_volumes() for joint in joints]
+    scalar = [joint._create_negative_volumes() for joint in joints]  # the precomputed volumes are used only once
+
+    assert len(joints) > 3
+    for batched_volumes, scalar_volumes in zip(batched, scalar):
+        for batched_volume, scalar_volume in zip(batched_volumes, scalar_volumes):
+            assert batched_volume is not scalar_volume
+            assert batched_volume.faces == scalar_volume.faces
+            for batched_point, scalar_point in zip(batched_volume.vertices, scalar_volume.vertices):
+                assert Point(*batched_point).distance_to_point(scalar_point) < 1e-9
+
+
+def test_precomputed_lap_negative_volumes_ignored_after_beam_change(x_topo_beams):
+    beam_a, beam_b = x_topo_beams
+    joint = XHalfLapJoint(beam_a, beam_b)
+    XHalfLapJoint.precompute_negative_volumes([joint])
+    beam_a.width *= 2.0
+
+    expected = XHalfLapJoint(beam_a, beam_b)._create_negative_volumes()
+    volumes = joint._create_negative_volumes()
+
+    for volume, expected_volume in zip(volumes, expected):
+        for point, expected_point in zip(volume.vertices, expected_volume.vertices):
+            assert Point(*point).distance_to_point(expected_point) < 1e-9
+
+
+def test_add_joints_precomputes_lap_volumes(mocker, x_topo_beams):
+    beam_a, beam_b = x_topo_beams
+    model = TimberModel()
+    model.add_beam(beam_a)
+    model.add_beam(beam_b)
+    spy = mocker.spy(LapJoint, "precompute_negative_volumes")
+
+    model.add_joints([JointDefinition(XHalfLapJoint, [beam_a, beam_b])])
+
+    assert spy.call_count == 1
+    assert len(beam_a.features) == 1 and len(beam_b.features) == 1
@@ -1,13 +1,33 @@
+import os
+from types import SimpleNamespace
+
+import pytest
 from compas.data import json_dumps
 from compas.data import json_loads
 from compas.geometry import Frame
+from compas.geometry import Line
 from compas.geometry import Point
+from compas.geometry import Translation
 from compas.geometry import Vector
 
+from compas_timber.connections import BeamJoinningError
+from compas_timber.connections import Joint
 from compas_timber.connections import LButtJoint
+from compas_timber.connections import LapJoint
+from compas_timber.connections import LMiterJoint
+from compas_timber.connections import NullJoint
 from compas_timber.connections import TButtJoint
+from compas_timber.connections import XHalfLapJoint
 from compas_timber.elements import Beam
+from compas_timber.elements import DrillFeature
+from compas_timber.elements import MillVolume
+from compas_timber.elements import Wall
+from compas_timber.fabrication import BTLx
+from compas_timber.design import JointDefinition
+from compas_timber.model import ChangeJournal
+from compas_timber.model import ModelStore
 from compas_timber.model import TimberModel
+from compas_timber.model.packing import frame_from_values
 
 
 def test_create():
@@ -72,6 +92,181 @@ def test_deepcopy(mocker):
     assert A_copy.beams[0] is not A.beams[0]
 
 
+def test_clone_shares_until_modified():
+    model = _l_and_x_model()
+    b1, b2, b3 = model.beams
+
+    clone = model.clone()
+    c1, c2, c3 = clone.beams
+
+    assert [beam.guid for beam in clone.beams] == [beam.guid for beam in model.beams]
+    assert c1 is not b1 and c1._features is b1._features and c1.frame is b1.frame
+    assert c1._blank_extensions is b1._blank_extensions
+    assert [set(id(beam) for beam in joint.beams) for joint in clone.joints] == [{id(c1), id(c2)}, {id(c1), id(c3)}]
+    assert clone.joint_between(c1, c3) is not model.joint_between(b1, b3)
+    features = [list(beam.features) for beam in model.beams]
+
+    c1.add_features(DrillFeature(Line(Point(0.2, 0, -1), Point(0.2, 0, 1)), 0.02, 1.0))
+    c3.length += 0.2
+    clone.update_beam(c3)
+
+    assert len(c1.features) == len(b1.features) + 1
+    assert c1._features is not b1._features
+    assert c3.length == b3.length + 0.2
+    assert [beam.features for beam in model.beams] == features
+    assert model.joint_between(b1, b3).beams == [b1, b3]
+    assert model.diff(clone).modified_beams[0]["guid"] == str(b3.guid)
+
+
+def test_clone_features_modified_in_place():
+    model = _l_and_x_model()
+    clone = model.clone()
+    drill = DrillFeature(Line(Point(0, 0.5, -1), Point(0, 0.5, 1)), 0.02, 1.0)
+    count = len(model.beams[1].features)
+
+    clone.beams[1].features.append(drill)
+
+    assert len(model.beams[1].features) == count
+    assert drill in clone.beams[1].features
+
+
+def test_clone_keeps_deferred_features():
+    model = _l_and_x_model(lazy_features=True)
+    b1, _, _ = model.beams
+
+    clone = model.clone()
+
+    assert [len(beam._pending_joints) for beam in clone.beams] == [2, 1, 1]
+    assert len(clone.beams[0].features) == 2
+    assert b1._pending_joints and not b1._features
+
+
+def test_partition_by_key_and_stitch():
+    model = _l_and_x_model()
+    b1, b2, b3 = model.beams
+    lap = model.joint_between(b1, b3)
+
+    partition = model.partition(key=lambda beam: "b" if beam is b3 else "a")
+
+    assert list(partition.models) == ["a", "b"]
+    assert partition.boundary_joints == [lap]
+    sub_a, sub_b = partition.models.values()
+    assert [beam.guid for beam in sub_a.beams] == [b1.guid, b2.guid]
+    assert len(sub_a.joints) == 1 and not sub_b.joints
+    assert not any(f in lap.features for f in sub_a.beams[0].features)
+    assert lap.features[0] in b1.features  # the original is not affected
+    assert not sub_b.beams[0].features
+
+    stitched, errors = partition.stitch()
+
+    assert not errors
+    assert [beam.guid for beam in stitched.beams] == [b1.guid, b2.guid, b3.guid]
+    assert [type(joint) for joint in stitched.joints] == [LButtJoint, XHalfLapJoint]
+    assert [len(beam.features) for beam in stitched.beams] == [len(beam.features) for beam in model.beams]
+
+
+def test_partition_by_walls():
+    model = TimberModel()
+    wall = Wall(3.0, 0.2, 2.0, frame=Frame.worldXY())
+    inside = Beam.from_endpoints(Point(1.0, 0.1, 0.0), Point(1.0, 0.1, 2.0), width=0.1, height=0.1)
+    outside = Beam.from_endpoints(Point(5.0, 0.1, 0.0), Point(5.0, 0.1, 2.0), width=0.1, height=0.1)
+    model.add_wall(wall)
+    model.add_beam(inside)
+    model.add_beam(outside)
+
+    partition = model.partition()
+
+    assert list(partition.models) == [str(wall.guid), None]
+    assert [w.guid for w in partition.models[str(wall.guid)].walls] == [wall.guid]
+    assert [beam.guid for beam in partition.models[None].beams] == [outside.guid]
+
+    stitched, _ = partition.stitch()
+    assert [w.guid for w in stitched.walls] == [wall.guid]
+    assert len(stitched.beams) == 2
+
+
+def test_stitch_processed_sub_models():
+    model = _l_and_x_model()
+    b1, _, b3 = model.beams
+    partition = model.partition(key=lambda beam: "b" if beam is b3 else "a")
+
+    processed = {key: TimberModel.from_bytes(sub_model.to_bytes()) for key, sub_model in partition.models.items()}
+    stitched, _ = partition.stitch(processed)
+    assert stitched.joint_between(stitched.beam_by_guid(str(b1.guid)), stitched.beam_by_guid(str(b3.guid)))
+
+    processed["b"].remove_beam(processed["b"].beams[0])
+    stitched, _ = partition.stitch(processed)
+    assert len(stitched.beams) == 2
+    assert [type(joint) for joint in stitched.joints] == [LButtJoint]
+
+
+def test_jsonl_round_trip(tmp_path):
+    model = _l_and_x_model()
+    b1, b2, b3 = model.beams
+    b3.attributes["category"] = "stud"
+    b2.add_features(DrillFeature(Line(Point(0, 0.5, -1), Point(0, 0.5, 1)), 0.02, 1.0))
+    filepath = str(tmp_path / "model.jsonl")
+
+    model.to_jsonl(filepath)
+    with open(filepath) as f:
+        types = [json_loads(line)["type"] for line in f]
+    loaded = TimberModel.from_jsonl(filepath)
+
+    assert types == ["model", "beam", "beam", "beam", "feature", "joint", "joint"]
+    assert [beam.guid for beam in loaded.beams] == [beam.guid for beam in model.beams]
+    assert loaded.beams[2].attributes == {"category": "stud"}
+    assert [type(joint) for joint in loaded.joints] == [LButtJoint, XHalfLapJoint]
+    assert [len(beam.features) for beam in loaded.beams] == [len(beam.features) for beam in model.beams]
+    assert model.diff(loaded).is_empty
+
+
+def test_jsonl_failed_write_keeps_previous_file(tmp_path, mocker):
+    filepath = str(tmp_path / "model.jsonl")
+    _l_and_x_model().to_jsonl(filepath)
+    with open(filepath) as f:
+        previous = f.read()
+
+    def lines(model):
+        yield "{}\n"
+        raise ValueError("Unsupported element type")
+
+    mocker.patch.object(TimberModel, "jsonl_lines", lines)
+    with pytest.raises(ValueError):
+        TimberModel().to_jsonl(filepath)
+
+    with open(filepath) as f:
+        assert f.read() == previous
+    assert os.listdir(str(tmp_path)) == ["model.jsonl"]
+
+
+def test_jsonl_filter_while_streaming():
+    model = _l_and_x_model()
+    b1, b2, b3 = model.beams
+    b1.attributes["category"] = b3.attributes["category"] = "plate"
+    lines = list(model.jsonl_lines())
+
+    records = list(TimberModel.iter_jsonl(lines, lambda r: r["attributes"].get("category") == "plate"))
+    loaded = TimberModel.from_jsonl(lines, lambda r: r["attributes"].get("category") == "plate")
+
+    assert [r["type"] for r in records] == ["model", "beam", "beam", "joint"]
+    assert [beam.guid for beam in loaded.beams] == [b1.guid, b3.guid]
+    assert [type(joint) for joint in loaded.joints] == [XHalfLapJoint]
+
+
+def test_jsonl_persisted_joinery(mocker):
+    model = _l_and_x_model(persist_joinery=True)
+    lines = list(model.jsonl_lines())
+    spy = mocker.spy(XHalfLapJoint, "add_features")
+
+    loaded = TimberModel.from_jsonl(lines)
+
+    assert loaded.persist_joinery
+    assert [len(beam.features) for beam in loaded.beams] == [len(beam.features) for beam in model.beams]
+    assert [beam.blank_length for beam in loaded.beams] == [beam.blank_length for beam in model.beams]
+    assert spy.call_count == 0
+    assert all(joint.features for joint in loaded.joints)
+
+
 def test_beams_have_keys_after_serialization():
     A = TimberModel()
     B1 = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.1)
@@ -87,6 +282,19 @@ def test_beams_have_keys_after_serialization():
     assert keys == [beam.guid for beam in A.beams]
 
 
+def test_serialization_keeps_beam_attributes():
+    model = TimberModel()
+    beam = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.1)
+    beam.attributes["category"] = "stud"
+    model.add_beam(beam)
+    model.add_beam(Beam(Frame.worldYZ(), length=1.0, width=0.1, height=0.1))
+
+    model = json_loads(json_dumps(model))
+
+    assert [b.attributes for b in model.beams] == [{"category": "stud"}, {}]
+    assert model.beams_by_attribute("category", "stud") == [model.beams[0]]
+
+
 def test_serialization_with_l_butt_joints(mocker):
     mocker.patch("compas_timber.connections.LButtJoint.add_features")
     F1 = Frame(Point(0, 0, 0), Vector(1, 0, 0), Vector(0, 1, 0))
@@ -114,3 +322,646 @@ def test_serialization_with_t_butt_joints(mocker):
 
     assert len(a.joints) == 1
     assert type(a.joints[0]) is TButtJoint
+
+
+def test_wall_of_beam():
+    model = TimberModel()
+    wall = Wall(3.0, 0.2, 2.0, frame=Frame.worldXY())
+    inside = Beam.from_endpoints(Point(1.0, 0.1, 0.0), Point(1.0, 0.1, 2.0), width=0.1, height=0.1)
+    outside = Beam.from_endpoints(Point(5.0, 0.1, 0.0), Point(5.0, 0.1, 2.0), width=0.1, height=0.1)
+    model.add_wall(wall)
+    model.add_beam(inside)
+    model.add_beam(outside)
+
+    assert model.wall_of_beam(inside) is wall
+    assert model.wall_of_beam(outside) is None
+
+
+def test_add_joints_last_definition_wins():
+    model = TimberModel()
+    b1 = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.1)
+    b2 = Beam(Frame.worldYZ(), length=1.0, width=0.1, height=0.1)
+    b3 = Beam(Frame(Point(0.5, 0, 0), Vector(0, 1, 0), Vector(0, 0, 1)), length=1.0, width=0.1, height=0.1)
+    for beam in (b1, b2, b3):
+        model.add_beam(beam)
+    definitions = [
+        JointDefinition(LButtJoint, [b1, b2]),
+        JointDefinition(TButtJoint, [b3, b1]),
+        JointDefinition(TButtJoint, [b2, b1]),
+    ]
+
+    joints, errors = model.add_joints(definitions)
+
+    assert not errors
+    assert len(joints) == 2
+    assert model.joints == joints
+    assert [type(joint) for joint in joints] == [TButtJoint, TButtJoint]
+    assert joints[1].main_beam is b2
+    assert len(list(model.graph.edges())) == 2
+
+
+def test_add_joints_falls_back_to_earlier_definition(mocker):
+    model = TimberModel()
+    b1 = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.1)
+    b2 = Beam(Frame.worldYZ(), length=1.0, width=0.1, height=0.1)
+    model.add_beam(b1)
+    model.add_beam(b2)
+
+    def fail(joint):
+        raise BeamJoinningError(joint.beams, joint)
+
+    mocker.patch.object(TButtJoint, "add_features", fail)
+    joints, errors = model.add_joints([JointDefinition(LButtJoint, [b1, b2]), JointDefinition(TButtJoint, [b2, b1])])
+
+    assert len(errors) == 1 and isinstance(errors[0].joint, TButtJoint)
+    assert [type(joint) for joint in joints] == [LButtJoint]
+    assert model.joints == joints
+    assert len(list(model.graph.edges())) == 1
+    assert b1.features and b2.features
+
+
+def test_add_joints_checks_beams():
+    model = TimberModel()
+    beam = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.1)
+    model.add_beam(beam)
+
+    definition = SimpleNamespace(joint_type=LButtJoint, beams=[beam], kwargs={})  # not a JointDefinition
+
+    with pytest.raises(ValueError):
+        model.add_joints([definition])
+
+
+def _frame_model(lazy_features):
+    model = TimberModel(lazy_features=lazy_features)
+    b1 = Beam.from_endpoints(Point(0, 0, 0), Point(1, 0, 0), width=0.1, height=0.12)
+    b2 = Beam.from_endpoints(Point(0, 0, 0), Point(0, 1, 0), width=0.1, height=0.12)
+    b3 = Beam.from_endpoints(Point(0.5, 0, 0), Point(0.5, 1, 0), width=0.1, height=0.12)
+    for beam in (b1, b2, b3):
+        model.add_beam(beam)
+    LButtJoint.create(model, b1, b2)
+    TButtJoint.create(model, b3, b1)
+    return model
+
+
+def test_lazy_features_are_deferred():
+    eager = _frame_model(lazy_features=False)
+    lazy = _frame_model(lazy_features=True)
+
+    assert all(beam._pending_joints for beam in lazy.beams)
+    assert lazy.beams[1].blank_length == eager.beams[1].blank_length
+    assert not lazy.beams[1]._pending_joints
+    assert lazy.beams[2]._pending_joints  # the T-Butt has not been needed yet
+
+    for lazy_beam, eager_beam in zip(lazy.beams, eager.beams):
+        assert [type(f) for f in lazy_beam.features] == [type(f) for f in eager_beam.features]
+        assert lazy_beam.blank_length == eager_beam.blank_length
+        assert not lazy_beam._pending_joints
+
+
+def test_remove_all_features_of_lazy_beam():
+    model = _frame_model(lazy_features=True)
+    b1, b2, _ = model.beams
+
+    b2.remove_features()
+    assert b1.features  # adds the features of the remaining deferred joints
+
+    assert not b2.features
+    assert not b2._pending_joints
+
+
+def test_options_are_keyword_arguments():
+    model = TimberModel(True, persist_joinery=True)
+
+    assert not model.lazy_features
+    assert model.persist_joinery
+
+
+def test_resolve_joint_ends_skips_resolved_joints(mocker):
+    model = _frame_model(lazy_features=False)
+    b1, b2, b3 = model.beams
+    l_butt, t_butt = model.joints
+    model.resolve_joint_ends()
+    spy = mocker.spy(Joint, "resolve_ends")
+
+    model.resolve_joint_ends()
+    BTLx(model)
+    assert spy.call_count == 0
+
+    b2.frame.point.y = -0.01  # modified in place
+    model.resolve_joint_ends()
+    assert [call.args[0] for call in spy.call_args_list] == [l_butt]
+
+    model.resolve_joint_ends(force=True)
+    assert spy.call_count == 3
+
+
+def test_from_data_defers_features():
+    model = json_loads(json_dumps(_frame_model(lazy_features=False)))
+
+    assert all(beam._pending_joints for beam in model.beams)
+
+    model.add_deferred_features()
+
+    assert not any(beam._pending_joints for beam in model.beams)
+    assert all(beam.features for beam in model.beams)
+
+
+def _chain_model(count, offset=0.0, model=None):
+    model = model or TimberModel()
+    points = [Point((i + 1) // 2, i // 2 + offset, 0) for i in range(count + 1)]
+    beams = [Beam.from_endpoints(a, b, width=0.1, height=0.1) for a, b in zip(points, points[1:])]
+    for beam in beams:
+        model.add_beam(beam)
+    for beam_a, beam_b in zip(beams, beams[1:]):
+        LMiterJoint.create(model, beam_a, beam_b)
+    return model
+
+
+def test_deferred_features_of_long_chain():
+    model = TimberModel(lazy_features=True)
+    _chain_model(3, offset=-10.0, model=model)
+    _chain_model(1200, model=model)
+    other_chain = model.beams[:3]
+
+    assert model.beams[-1].features
+    assert not any(beam._pending_joints for beam in model.beams[3:])
+    assert all(beam._pending_joints for beam in other_chain)  # not connected, still deferred
+
+
+def test_from_data_defers_features_of_long_chain():
+    model = json_loads(json_dumps(_chain_model(1200)))
+
+    assert model.beams[-1].blank_length == pytest.approx(1.05)
+    assert not any(beam._pending_joints for beam in model.beams)
+
+
+def test_update_beam_only_touches_affected_joints():
+    model = _frame_model(lazy_features=False)
+    b1, b2, b3 = model.beams
+    b4 = Beam.from_endpoints(Point(5, 0, 0), Point(6, 0, 0), width=0.1, height=0.12)
+    b5 = Beam.from_endpoints(Point(5, 0, 0), Point(5, 1, 0), width=0.1, height=0.12)
+    model.add_beam(b4)
+    model.add_beam(b5)
+    LButtJoint.create(model, b4, b5)
+    untouched = list(b4.features)
+    previous = list(b1.features)
+    feature_count = [len(beam.features) for beam in model.beams]
+
+    b3.frame = Frame(Point(0.6, 0, 0), Vector(0, 1, 0), Vector(-1, 0, 0))
+    errors = model.update_beam(b3)
+
+    assert not errors
+    assert [len(beam.features) for beam in model.beams] == feature_count
+    assert b4.features == untouched
+    assert not any(feature in previous for feature in b1.features)
+    assert set(model.joints_of_beam(b1)) == set(model.joints[:2])
+
+
+@pytest.mark.parametrize("joint_type", [TButtJoint, LButtJoint])
+def test_mill_depth_lap_is_removed_with_joint(joint_type):
+    main = Beam.from_endpoints(Point(0, 0.5, 0), Point(1, 0.5, 0), z_vector=Vector(0, 0, 1), width=0.1, height=0.1)
+    cross = Beam.from_endpoints(Point(0, 0, 0), Point(0, 1, 0), z_vector=Vector(0, 0, 1), width=0.1, height=0.1)
+    model = TimberModel()
+    model.add_beam(main)
+    model.add_beam(cross)
+    joint = joint_type.create(model, main, cross, mill_depth=0.01)
+    counts = [len(main.features), len(cross.features)]
+
+    model.update_beam(main)
+    model.update_beam(main)
+
+    assert [len(main.features), len(cross.features)] == counts
+    assert all(feature in joint.features for feature in cross.features)
+
+    model.remove_joint(joint)
+
+    assert not main.features and not cross.features
+
+
+def test_remove_joint_removes_features():
+    model = _frame_model(lazy_features=False)
+    b1, b2, b3 = model.beams
+    t_butt = model.joints[1]
+
+    model.remove_joint(t_butt)
+
+    assert not b3.features
+    assert t_butt.guid not in b3._blank_extensions
+    assert len(b1.features) == 1  # the one of the L-Butt
+
+
+def test_serialization_with_lap_and_miter_joints():
+    model = TimberModel()
+    b1 = Beam.from_endpoints(Point(0, 0, 0), Point(1, 0, 0), width=0.1, height=0.12)
+    b2 = Beam.from_endpoints(Point(0, 0, 0), Point(0, 1, 0), width=0.1, height=0.12)
+    b3 = Beam.from_endpoints(Point(0.5, -0.5, 0), Point(0.5, 0.5, 0), width=0.1, height=0.12)
+    for beam in (b1, b2, b3):
+        model.add_beam(beam)
+    LMiterJoint.create(model, b1, b2)
+    XHalfLapJoint.create(model, b1, b3)
+
+    model = json_loads(json_dumps(model))
+
+    assert [type(joint) for joint in model.joints] == [LMiterJoint, XHalfLapJoint]
+    assert all(beam in model.beams for joint in model.joints for beam in joint.beams)
+
+
+def test_binary_round_trip(tmp_path):
+    model = TimberModel()
+    b1 = Beam.from_endpoints(Point(0, 0, 0), Point(1, 0, 0), width=0.1, height=0.12)
+    b2 = Beam.from_endpoints(Point(0, 0, 0), Point(0, 1, 0), width=0.1, height=0.12)
+    b3 = Beam.from_endpoints(Point(0.5, -0.5, 0), Point(0.5, 0.5, 0), width=0.1, height=0.12)
+    wall = Wall(2.0, 0.2, 2.5, frame=Frame(Point(0, 0, 0), Vector(1, 0, 0), Vector(0, 0, 1)))
+    model.add_beam(b1)
+    model.add_wall(wall)
+    model.add_beam(b2)
+    model.add_beam(b3)
+    b3.attributes["category"] = "stud"
+    b3.add_features(DrillFeature(Line(Point(0.5, 0, -1), Point(0.5, 0, 1)), 0.02, 2.0))
+    LMiterJoint.create(model, b1, b2)
+    XHalfLapJoint.create(model, b1, b3)
+
+    path = str(tmp_path / "model.ctm")
+    model.to_binary(path)
+    loaded = TimberModel.from_binary(path)
+
+    assert [type(element) for element in loaded.elements()] == [Beam, Wall, Beam, Beam]
+    assert [beam.guid for beam in loaded.beams] == [beam.guid for beam in model.beams]
+    for beam, original in zip(loaded.beams, model.beams):
+        assert beam.frame == original.frame
+        assert (beam.length, beam.width, beam.height) == (original.length, original.width, original.height)
+    assert loaded.walls[0].frame == wall.frame
+    assert loaded.beams[2].attributes["category"] == "stud"
+    assert [(type(joint), joint.guid) for joint in loaded.joints] == [
+        (type(joint), joint.guid) for joint in model.joints
+    ]
+    assert all(beam in loaded.beams for joint in loaded.joints for beam in joint.beams)
+    assert [type(f) for f in loaded.beams[2].features] == [type(f) for f in b3.features]
+    assert len(loaded.beams[0].features) == len(b1.features)
+    assert loaded.beams[0].blank_length == b1.blank_length
+
+
+def test_binary_stores_blank_extensions():
+    model = _l_and_x_model()
+    b1, b2, _ = model.beams
+    b2.add_blank_extension(0.1, 0.2)
+    blank_lengths = [beam.blank_length for beam in model.beams]
+
+    loaded = TimberModel.from_bytes(model.to_bytes())
+
+    assert loaded.beams[1]._blank_extensions[None] == (0.1, 0.2)
+    assert [beam.blank_length for beam in loaded.beams] == blank_lengths
+    assert len(loaded.beams[0]._blank_extensions) == len(b1._blank_extensions)  # not added twice
+
+
+def test_frame_from_values():
+    frame = Frame(Point(1, 2, 3), Vector(0, 1, 0), Vector(-1, 0, 0))
+
+    assert frame_from_values(list(frame.point) + list(frame.xaxis) + list(frame.yaxis)) == frame
+
+    frame = Frame(Point(1, 2, 3), Vector(0.3, 1, 0.2), Vector(-1, 0.1, 0.5))
+    restored = frame_from_values(list(frame.point) + list(frame.xaxis) + list(frame.yaxis))
+
+    assert list(restored.xaxis) == list(frame.xaxis)  # used as they are
+    assert list(restored.yaxis) == list(frame.yaxis)
+    assert restored.zaxis == frame.zaxis
+
+
+def test_binary_is_smaller_than_json():
+    model = TimberModel()
+    for i in range(20):
+        model.add_beam(Beam.from_endpoints(Point(i, 0, 0), Point(i, 1, 0), width=0.1, height=0.12))
+
+    assert len(model.to_bytes()) * 3 < len(json_dumps(model))
+
+
+def test_binary_rejects_other_data():
+    with pytest.raises(ValueError):
+        TimberModel.from_bytes(b"not a model")
+
+
+def _l_and_x_model(**kwargs):
+    model = TimberModel(**kwargs)
+    b1 = Beam.from_endpoints(Point(0, 0, 0), Point(1, 0, 0), width=0.1, height=0.12)
+    b2 = Beam.from_endpoints(Point(0, 0, 0), Point(0, 1, 0), width=0.1, height=0.12)
+    b3 = Beam.from_endpoints(Point(0.5, -0.5, 0), Point(0.5, 0.5, 0), width=0.1, height=0.12)
+    for beam in (b1, b2, b3):
+        model.add_beam(beam)
+    LButtJoint.create(model, b1, b2)
+    XHalfLapJoint.create(model, b1, b3)
+    return model
+
+
+def test_persisted_joinery_is_restored_without_recalculation(mocker):
+    model = _l_and_x_model(persist_joinery=True)
+    data = json_dumps(model)
+    spy_l = mocker.spy(LButtJoint, "add_features")
+    spy_x = mocker.spy(XHalfLapJoint, "add_features")
+
+    loaded = json_loads(data)
+
+    assert loaded.persist_joinery
+    assert [len(beam.features) for beam in loaded.beams] == [len(beam.features) for beam in model.beams]
+    assert [beam.blank_length for beam in loaded.beams] == [beam.blank_length for beam in model.beams]
+    assert spy_l.call_count == 0 and spy_x.call_count == 0
+    for joint in loaded.joints:
+        assert joint.features
+        assert all(any(f is g for beam in joint.beams for g in beam.features) for f in joint.features)
+
+
+def test_persisted_joinery_can_be_recomputed_and_removed():
+    loaded = json_loads(json_dumps(_l_and_x_model(persist_joinery=True)))
+    b1, b2, b3 = loaded.beams
+    l_butt, x_lap = loaded.joints
+    blank_length = b1.blank_length
+
+    errors = loaded.recompute_joinery([x_lap])
+    assert not errors
+    assert len(b3.features) == 1
+    assert b1.blank_length == blank_length
+
+    loaded.remove_joint(l_butt)
+    assert not b2.features
+    assert not b2._blank_extensions
+    assert b1.blank_length < blank_length
+
+
+def test_joinery_is_not_persisted_by_default():
+    model = _l_and_x_model()
+    assert "joinery" not in model.__data__
+    assert "joinery" in _l_and_x_model(persist_joinery=True).__data__
+
+
+def test_binary_persisted_joinery(mocker):
+    model = _l_and_x_model(persist_joinery=True)
+    data = model.to_bytes()
+    spy = mocker.spy(XHalfLapJoint, "add_features")
+
+    loaded = TimberModel.from_bytes(data)
+
+    assert loaded.persist_joinery
+    assert [len(beam.features) for beam in loaded.beams] == [len(beam.features) for beam in model.beams]
+    assert spy.call_count == 0
+
+
+def test_model_store(tmp_path):
+    model = _l_and_x_model()
+    b1, b2, b3 = model.beams
+    b3.attributes["category"] = "stud"
+    path = str(tmp_path / "model.store")
+    ModelStore.write(model, path)
+
+    with ModelStore(path) as store:
+        assert len(store) == 3
+        assert store.categories == ["stud"]
+        assert store.joint_types == ["LButtJoint", "XHalfLapJoint"]
+        assert store.query(category="stud") == [2]
+        assert store.query(joint_type=LButtJoint) == [0, 1]
+        assert store.query(bbox=(0.9, -0.1, -0.1, 1.1, 0.1, 0.1)) == [0]
+        assert store.query(bbox=(0.4, 0.4, -0.1, 0.6, 0.6, 0.1), joint_type="XHalfLapJoint") == [2]
+        assert store.joints(XHalfLapJoint) == [(1, [0, 2])]
+
+        beam = store.beam(2)
+        assert beam.guid == b3.guid
+        assert beam.frame == b3.frame
+        assert beam.attributes["category"] == "stud"
+        assert len(beam.features) == len(b3.features)
+        assert store.beam(0).blank_length == b1.blank_length
+
+        partial = store.to_model([0, 2])
+    assert [beam.guid for beam in partial.beams] == [b1.guid, b3.guid]
+    assert [type(joint) for joint in partial.joints] == [XHalfLapJoint]
+    partial.remove_joint(partial.joints[0])
+    assert not partial.beams[1].features
+
+
+def test_model_store_walls_and_transformation(tmp_path):
+    model = _l_and_x_model()
+    wall = Wall(2.0, 0.2, 2.5, frame=Frame(Point(0, 0, 0), Vector(1, 0, 0), Vector(0, 0, 1)))
+    model.add_wall(wall)
+    model.transform(Translation.from_vector([0, 0, 1]))
+    path = str(tmp_path / "model.store")
+    ModelStore.write(model, path)
+
+    with ModelStore(path) as store:
+        assert store.beam(0).transformation == model.beams[0].transformation
+        loaded = store.to_model()
+    assert [w.guid for w in loaded.walls] == [wall.guid]
+    assert [beam.transformation for beam in loaded.beams] == [beam.transformation for beam in model.beams]
+
+
+def test_model_store_write_replaces_store(tmp_path):
+    path = str(tmp_path / "model.store")
+    ModelStore.write(_l_and_x_model(), path)
+    with ModelStore(path) as old:
+        ModelStore.write(TimberModel(), path)
+        assert len(old) == 3 and old.beam(2).frame  # still reads the previous files
+    with ModelStore(path) as new:
+        assert len(new) == 0
+    assert os.listdir(str(tmp_path)) == ["model.store"]
+
+    (tmp_path / "other").mkdir()
+    with pytest.raises(ValueError):
+        ModelStore.write(TimberModel(), str(tmp_path / "other"))
+
+
+def test_diff_and_apply_patch():
+    old = _l_and_x_model()
+    new = json_loads(json_dumps(old))
+    b1, b2, b3 = new.beams
+    b4 = Beam.from_endpoints(Point(1, 0, 0), Point(1, 1, 0), width=0.1, height=0.12)
+    new.add_beam(b4)
+    new.remove_joint(new.joints[1])  # the X-lap of b1 and b3
+    TButtJoint.create(new, b3, b1)
+    LButtJoint.create(new, b4, b1)
+    b2.height = 0.2
+    b2.add_features(DrillFeature(Line(Point(0, 0.5, -1), Point(0, 0.5, 1)), 0.02, 2.0))
+
+    delta = old.diff(new)
+
+    assert [state["guid"] for state in delta.added_beams] == [str(b4.guid)]
+    assert [state["guid"] for state in delta.modified_beams] == [str(b2.guid)]
+    assert not delta.removed_beams
+    assert [type(state["joint"]) for state in delta.added_joints] == [TButtJoint, LButtJoint]
+    assert delta.added_joints[0]["beams"] == [str(b3.guid), str(b1.guid)]
+    assert not delta.modified_joints
+    assert delta.removed_joints == [
+        {"beams": sorted([str(b1.guid), str(b3.guid)]), "type": "XHalfLapJoint", "index": 0}
+    ]
+    assert list(delta.added_features) == [str(b2.guid)]
+
+    delta = json_loads(json_dumps(delta))
+    errors = old.apply_patch(delta)
+
+    assert not errors
+    assert old.diff(new).is_empty
+    assert old.beam_by_guid(str(b2.guid)).height == 0.2
+    assert sorted(type(joint).__name__ for joint in old.joints) == ["LButtJoint", "LButtJoint", "TButtJoint"]
+    assert len(old.beam_by_guid(str(b2.guid)).features) == len(b2.features)
+    assert len(old.beam_by_guid(str(b3.guid)).features) == len(b3.features)
+
+
+def test_apply_patch_removes_beams():
+    old = _l_and_x_model()
+    new = json_loads(json_dumps(old))
+    new.remove_beam(new.beams[2])
+
+    delta = old.diff(new)
+    assert delta.removed_beams == [str(old.beams[2].guid)]
+    assert [ref["beams"] for ref in delta.removed_joints] == [sorted(str(b.guid) for b in old.joints[1].beams)]
+
+    old.apply_patch(delta)
+    assert len(old.beams) == 2
+    assert [type(joint) for joint in old.joints] == [LButtJoint]
+    assert not any(feature for feature in old.beams[0].features if isinstance(feature, MillVolume))
+
+
+def test_diff_several_joints_between_two_beams():
+    old = _l_and_x_model()
+    b1, b2, _ = old.beams
+    NullJoint.create(old, b1, b2)
+    NullJoint.create(old, b1, b2)
+    new = old.clone()
+    new.remove_joint(new.joints_between(new.beams[0], new.beams[1])[2])
+
+    delta = old.diff(new)
+
+    assert not delta.added_joints and not delta.modified_joints
+    assert delta.removed_joints == [{"beams": sorted([str(b1.guid), str(b2.guid)]), "type": "NullJoint", "index": 1}]
+
+    old.apply_patch(delta)
+
+    assert [type(joint) for joint in old.joints_between(b1, b2)] == [LButtJoint, NullJoint]
+    assert old.diff(new).is_empty
+
+
+def test_apply_patch_recalculates_neighbors(mocker):
+    old = _l_and_x_model()
+    new = json_loads(json_dumps(old))
+    new.beams[1].height = 0.2  # only joined to b1 by the L-Butt, b1 is also joined to b3 by the X-lap
+    spy = mocker.spy(TimberModel, "_recalculate_joints")
+
+    old.apply_patch(old.diff(new))
+
+    assert [type(joint) for joint in spy.call_args_list[0].args[1]] == [LButtJoint, XHalfLapJoint]
+
+
+def test_beams_by_attribute_index():
+    model = TimberModel()
+    beams = [Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.1) for _ in range(4)]
+    for index, beam in enumerate(beams):
+        beam.attributes["category"] = "stud" if index % 2 else "plate"
+        beam.attributes["rhino_guid"] = "guid-{}".format(index)
+        beam.attributes["tags"] = ["unhashable"]
+        model.add_beam(beam)
+
+    assert model.beams_by_attribute("category", "stud") == [beams[1], beams[3]]
+    assert model.beams_by_attribute("rhino_guid", "guid-2") == [beams[2]]
+    assert model.beams_by_attribute("category", "header") == []
+    assert model.beams_by_attribute("tags", ["unhashable"]) == []
+
+    beams[1].attributes["category"] = "header"
+    model.reindex_beam(beams[1])
+    assert model.beams_by_attribute("category", "stud") == [beams[3]]
+    assert model.beams_by_attribute("category", "header") == [beams[1]]
+
+    model.remove_beam(beams[3])
+    assert model.beams_by_attribute("category", "stud") == []
+
+
+def test_joint_indices():
+    model = _l_and_x_model()
+    b1, b2, b3 = model.beams
+    l_butt, x_lap = model.joints
+
+    assert model.joints_by_type(LButtJoint) == [l_butt]
+    assert model.joints_by_type(TButtJoint) == []
+    assert model.joints_by_type(LapJoint, include_subclasses=True) == [x_lap]
+    assert model.joint_between(b3, b1) is x_lap
+    assert model.joint_between(b2, b3) is None
+
+    model.remove_joint(x_lap)
+    assert model.joints == [l_butt]
+    assert model.joints_by_type(XHalfLapJoint) == []
+    assert model.joint_between(b1, b3) is None
+
+
+def test_several_joints_between_two_beams():
+    model = _l_and_x_model()
+    b1, b2, _ = model.beams
+    l_butt = model.joint_between(b1, b2)
+    null_joint = NullJoint(b1, b2)
+    model.add_joint(null_joint, (b1, b2))
+
+    assert model.joint_between(b1, b2) is l_butt
+    assert model.joints_between(b2, b1) == [l_butt, null_joint]
+
+    model.remove_joint(l_butt)
+    assert model.joint_between(b1, b2) is null_joint
+    assert len(list(model.graph.edges())) == 2  # the null joint keeps the two beams connected
+
+
+def test_indices_after_deserialization():
+    model = _l_and_x_model()
+    model.beams[2].attributes["category"] = "stud"
+    loaded = json_loads(json_dumps(model))
+
+    assert [type(joint) for joint in loaded.joints_by_type(LButtJoint)] == [LButtJoint]
+    assert loaded.joint_between(loaded.beams[0], loaded.beams[2]) is loaded.joints[1]
+
+
+def test_change_journal():
+    model = TimberModel()
+    b1 = Beam.from_endpoints(Point(0, 0, 0), Point(1, 0, 0), width=0.1, height=0.12)
+    b2 = Beam.from_endpoints(Point(0, 0, 0), Point(0, 1, 0), width=0.1, height=0.12)
+    b1.length = 2.0  # not part of a model yet, not recorded
+    received = []
+    callback = model.subscribe(received.append)
+
+    model.add_beam(b1)
+    model.add_beam(b2)
+    revision = model.revision
+    joint = LButtJoint.create(model, b1, b2)
+
+    changes = model.changes_since(revision)
+    assert changes[0].action == "add_joint"
+    assert changes[0].details["beams"] == [str(b1.guid), str(b2.guid)]
+    assert {"add_features", "add_blank_extension"} <= set(change.action for change in changes)
+    assert [change.revision for change in changes] == list(range(revision + 1, model.revision + 1))
+
+    revision = model.revision
+    b2.width = 0.2
+    model.remove_joint(joint)
+    actions = [(change.action, change.guid) for change in model.changes_since(revision)]
+    assert actions[0] == ("beam_geometry", str(b2.guid))
+    assert ("remove_blank_extension", str(b1.guid)) in actions
+    assert actions[-1] == ("remove_joint", str(joint.guid))
+
+    model.unsubscribe(callback)
+    model.remove_beam(b2)
+    b2.length = 3.0  # no longer part of the model, not recorded
+    assert [change.revision for change in received] == list(range(1, model.revision))
+    assert model.changes_since(model.revision - 1)[0].action == "remove_beam"
+    assert model.changes_since(model.revision) == []
+
+
+def test_change_journal_maxlen():
+    journal = ChangeJournal(maxlen=2)
+    for index in range(5):
+        journal.record("add_beam", str(index))
+
+    assert journal.revision == 5
+    assert [change.guid for change in journal.since(3)] == ["3", "4"]
+    with pytest.raises(ValueError):
+        journal.since(1)
+
+
+def test_change_journal_is_bounded_by_default():
+    model = TimberModel()
+    beam = Beam(Frame.worldXY(), length=1.0, width=0.1, height=0.1)
+    model.add_beam(beam)
+    for index in range(ChangeJournal.DEFAULT_MAXLEN + 10):
+        beam.length = 1.0 + index
+
+    assert len(model.journal.records) == ChangeJournal.DEFAULT_MAXLEN
+    assert len(ChangeJournal(maxlen=None).records) == 0
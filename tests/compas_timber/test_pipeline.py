@@ -0,0 +1,63 @@
+import os
+
+from compas_timber.connections import TButtJoint
+from compas_timber.pipeline import Pipeline
+
+LINES = os.path.abspath(r"data/lines.json")
+
+
+def _rules(mill_depth=0.0):
+    return {
+        "rules": [
+            {"type": "topology", "topology": "TOPO_L", "joint": "LMiterJoint"},
+            {"type": "topology", "topology": "TOPO_T", "joint": "TButtJoint", "kwargs": {"mill_depth": mill_depth}},
+        ],
+        "max_distance": 0.01,
+    }
+
+
+def test_run_creates_model_and_btlx():
+    result = Pipeline().run(LINES, _rules())
+
+    model = result.model
+    assert result.computed == ["beams", "topologies", "joints", "model", "btlx"]
+    assert len(model.beams) == 7
+    assert len(model.joints) == 6
+    assert all(isinstance(joint, TButtJoint) for joint in model.joints)
+    assert result.btlx.count("<Part ") == 7
+    assert not result.errors
+
+
+def test_changed_rule_recomputes_dependent_stages_only():
+    pipeline = Pipeline()
+    pipeline.run(LINES, _rules())
+
+    result = pipeline.run(LINES, _rules(mill_depth=0.01))
+
+    assert result.computed == ["joints", "model", "btlx"]
+    assert all(joint.mill_depth == 0.01 for joint in result.model.joints)
+
+
+def test_cache_dir_is_shared_between_pipelines(tmp_path):
+    Pipeline(cache_dir=str(tmp_path)).run(LINES, _rules())
+
+    result = Pipeline(cache_dir=str(tmp_path)).run(LINES, _rules())
+
+    assert result.computed == []
+    assert result.btlx.count("<Part ") == 7
+
+
+def test_category_rule_joins_categorized_beams():
+    rules = {
+        "rules": [{"type": "category", "category_a": "stud", "category_b": "plate", "joint": "TButtJoint"}],
+        "categories": ["sill", "plate", "sill", "plate", "stud", "sill", "sill"],
+        "max_distance": 0.01,
+    }
+
+    model = Pipeline().run(LINES, rules).model
+
+    assert [beam.attributes["category"] for beam in model.beams] == rules["categories"]
+    assert len(model.joints) == 2
+    for joint in model.joints:
+        assert joint.main_beam.attributes["category"] == "stud"
+        assert joint.cross_beam.attributes["category"] == "plate"
@@ -1,6 +1,8 @@
+from compas.geometry import Frame
 from compas.geometry import Point
 from compas.geometry import Vector
 
+from compas_timber.connections import Joint
 from compas_timber.connections import TButtJoint
 from compas_timber.elements import Beam
 from compas_timber.model import TimberModel
@@ -18,3 +20,71 @@ def test_create():
     assert isinstance(instance, TButtJoint)
     assert instance.main_beam == B1
     assert instance.cross_beam == B2
+
+
+def test_side_incidence_is_cached(mocker):
+    B1 = Beam.from_endpoints(Point(0, 0.5, 0), Point(1, 0.5, 0), z_vector=Vector(0, 0, 1), width=0.100, height=0.200)
+    B2 = Beam.from_endpoints(Point(0, 0.0, 0), Point(0, 1.0, 0), z_vector=Vector(0, 0, 1), width=0.100, height=0.200)
+    A = TimberModel()
+    A.add_beam(B1)
+    A.add_beam(B2)
+    instance = TButtJoint.create(A, B1, B2)
+    spy = mocker.spy(Joint, "_beam_side_incidence")
+
+    for _ in range(2):
+        instance.get_main_cutting_plane()
+        instance.side_surfaces_cross()
+        instance.front_back_surface_main()
+        instance.calc_params_birdsmouth()
+
+    assert spy.call_count == 1  # main to cross was already calculated by add_features, only cross to main is new
+
+    B2.width = 0.12
+    instance.side_surfaces_cross()
+    instance.get_main_cutting_plane()
+
+    assert spy.call_count == 2
+
+
+def test_side_incidence_follows_frame_modified_in_place(mocker):
+    B1 = Beam.from_endpoints(Point(0, 0.5, 0), Point(1, 0.5, 0), z_vector=Vector(0, 0, 1), width=0.100, height=0.200)
+    B2 = Beam.from_endpoints(Point(0, 0.0, 0), Point(0, 1.0, 0), z_vector=Vector(0, 0, 1), width=0.100, height=0.200)
+    A = TimberModel()
+    A.add_beam(B1)
+    A.add_beam(B2)
+    instance = TButtJoint.create(A, B1, B2)
+    spy = mocker.spy(Joint, "_beam_side_incidence")
+
+    B2.frame.point.x = -0.05
+    instance.side_surfaces_cross()
+
+    assert spy.call_count == 1
+
+
+def test_get_face_most_towards_beam_is_static():
+    B1 = Beam.from_endpoints(Point(0, 0.5, 0), Point(1, 0.5, 0), z_vector=Vector(0, 0, 1), width=0.100, height=0.200)
+    B2 = Beam.from_endpoints(Point(0, 0.0, 0), Point(0, 1.0, 0), z_vector=Vector(0, 0, 1), width=0.100, height=0.200)
+    instance = TButtJoint(B1, B2)
+
+    assert Joint.get_face_most_towards_beam(B1, B2)[0] == instance.face_most_towards_beam(B1, B2)[0]
+    assert Joint.get_face_most_ortho_to_beam(B1, B2)[0] == instance.face_most_ortho_to_beam(B1, B2)[0]
+
+
+def test_ends_are_cached(mocker):
+    B1 = Beam.from_endpoints(Point(0, 0.5, 0), Point(1, 0.5, 0), z_vector=Vector(0, 0, 1), width=0.100, height=0.200)
+    B2 = Beam.from_endpoints(Point(0, 0.0, 0), Point(0, 1.0, 0), z_vector=Vector(0, 0, 1), width=0.100, height=0.200)
+    A = TimberModel()
+    A.add_beam(B1)
+    A.add_beam(B2)
+    instance = TButtJoint.create(A, B1, B2)
+    A.resolve_joint_ends()
+    spy = mocker.spy(instance, "resolve_ends")
+
+    assert instance.ends[str(B1.guid)] == "start"
+    assert instance.ends is instance.ends
+    assert spy.call_count == 0
+
+    B1.frame = Frame(Point(1, 0.5, 0), Vector(-1, 0, 0), Vector(0, -1, 0))
+
+    assert instance.ends[str(B1.guid)] == "end"
+    assert spy.call_count == 1